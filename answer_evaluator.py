@@ -29,6 +29,9 @@ import json
 import re
 from groq import Groq
 from dotenv import load_dotenv
+
+import llm_cache
+
 load_dotenv()
 
 
@@ -160,7 +163,8 @@ IMPORTANT:
 """
 
         try:
-            response = self.client.chat.completions.create(
+            raw = llm_cache.complete(
+                self.client, "answer.evaluate",
                 model=self.model,
                 messages=[
                     {
@@ -174,9 +178,9 @@ IMPORTANT:
                 ],
                 temperature=0.2,   # low — consistent, fair ratings
                 max_tokens=600,
+                accept=llm_cache.parses(lambda t: json.loads(self._clean_json(t))),
             )
-            raw    = self._clean_json(response.choices[0].message.content)
-            result = json.loads(raw)
+            result = json.loads(self._clean_json(raw))
 
             likert      = int(result.get("likert", 3))
             likert      = max(1, min(5, likert))      # clamp 1-5
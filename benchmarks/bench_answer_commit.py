@@ -0,0 +1,98 @@
+"""
+bench_answer_commit.py
+Per-answer DB cost: save_response() + update_question_b() vs record_answer_atomic().
+
+The old path opens two transactions (BEGIN / INSERT / COMMIT, then
+BEGIN / UPDATE / COMMIT); the atomic path is a single autocommit CTE.
+Both run through the shared pool, so the difference is round trips and
+commits, not connection setup.
+
+Needs a reachable PostgreSQL with db_schema.sql applied and mcq_questions
+loaded (POSTGRES_* env vars). Benchmark responses are deleted afterwards and
+the touched question's b_param / counters restored.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_answer_commit --answers 500
+"""
+
+import os
+import sys
+import time
+import uuid
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcq_irt"))
+
+import db_pool
+import mcq_database as db
+
+
+def _answer_kwargs(session_id: str, q: dict, i: int) -> dict:
+    return dict(
+        session_id=session_id, question_id=q["question_id"], skill=q["skill"],
+        selected_option="a", is_correct=bool(i % 2), b_used=q["b_param"],
+        theta_before=0.0, theta_after=0.1, p_correct_irt=0.5, surprise=0.5,
+        proficiency_before=50.0, proficiency_after=52.5,
+    )
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--answers", type=int, default=500)
+    args = parser.parse_args()
+
+    ok, msg = db.test_connection()
+    skills  = db.get_skills() if ok else []
+    if not skills:
+        print(f"PostgreSQL not reachable or mcq_questions empty ({msg}).")
+        sys.exit(1)
+    q = db.get_questions_for_skill(skills[0])[0]
+
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        cur.execute("SELECT b_param, response_count, correct_count FROM mcq_questions "
+                    "WHERE question_id = %s", (q["question_id"],))
+        saved_state = cur.fetchone()
+    conn.close()
+
+    sid = str(uuid.uuid4())
+    two_call, atomic = [], []
+    try:
+        for i in range(args.answers):
+            kw = _answer_kwargs(sid, q, i)
+            t0 = time.perf_counter()
+            db.save_response(**kw)
+            db.update_question_b(q["question_id"], kw["theta_before"], kw["is_correct"])
+            two_call.append((time.perf_counter() - t0) * 1000.0)
+
+            t0 = time.perf_counter()
+            out = db.record_answer_atomic(**kw)
+            atomic.append((time.perf_counter() - t0) * 1000.0)
+            assert not out["error"], out["error"]
+    finally:
+        conn = db_pool.getconn()
+        with conn, conn.cursor() as cur:
+            cur.execute("DELETE FROM mcq_responses WHERE session_id = %s::uuid", (sid,))
+            cur.execute("UPDATE mcq_questions SET b_param = %s, response_count = %s, "
+                        "correct_count = %s WHERE question_id = %s",
+                        (*saved_state, q["question_id"]))
+        conn.close()
+
+    print(f"{'path':<38}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, xs in (("save_response + update_question_b", two_call),
+                     ("record_answer_atomic", atomic)):
+        print(f"{name:<38}{statistics.mean(xs):>10.3f}"
+              f"{_percentile(xs, 50):>10.3f}{_percentile(xs, 95):>10.3f}")
+    saved = statistics.mean(two_call) - statistics.mean(atomic)
+    print(f"\nsaved per answer: {saved:.3f} ms "
+          f"({saved / statistics.mean(two_call):.0%} of the old write path)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+bench_bulk_insert.py
+Row-by-row vs bulk (execute_values) question inserts.
+
+Compares, at 100 / 1k / 10k questions:
+  oe_session_questions — old per-question INSERT ... RETURNING loop
+                         vs open_ended_database.store_oe_questions()
+  mcq_questions        — old per-question INSERT ... ON CONFLICT loop
+                         vs mcq_database.load_questions_from_json()
+
+Needs a reachable PostgreSQL with db_schema.sql applied (POSTGRES_* env vars).
+Rows written by the benchmark are deleted again afterwards.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_bulk_insert
+  python -m benchmarks.bench_bulk_insert --sizes 100 1000
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcq_irt"))
+
+import db_pool
+import open_ended_database as oe_db
+import mcq_database as mcq_db
+
+
+def _oe_questions(n: int) -> list[dict]:
+    return [{
+        "question_id":  f"q_{i}_pyt_m",
+        "skill":        "Python",
+        "category":     "Programming Languages",
+        "question":     f"Benchmark question {i}: what is a generator?",
+        "difficulty":   "medium",
+        "b_param":      0.0,
+        "type":         "conceptual",
+        "model_answer": "A generator lazily yields values one at a time.",
+        "hints":        ["yield", "lazy"],
+    } for i in range(n)]
+
+
+def _oe_row_by_row(session_id: str, questions: list[dict]) -> list[dict]:
+    """The pre-bulk store_oe_questions(): one INSERT ... RETURNING per question."""
+    conn = db_pool.getconn()
+    try:
+        stored = []
+        with conn:
+            with conn.cursor() as cur:
+                for q in questions:
+                    cur.execute("""
+                        INSERT INTO oe_session_questions
+                            (session_id, skill, category, question_text,
+                             difficulty, b_param, type, model_answer, hints, source)
+                        VALUES (%s::uuid, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        RETURNING session_question_id
+                    """, (session_id, q["skill"], q["category"], q["question"],
+                          q["difficulty"], q["b_param"], q["type"],
+                          q["model_answer"], q["hints"], "llm"))
+                    stored.append({"session_question_id": str(cur.fetchone()[0]),
+                                   "question_id": q["question_id"]})
+        return stored
+    finally:
+        conn.close()
+
+
+def _mcq_payload(n: int, prefix: str) -> dict:
+    return {"skills": [{"skill": f"{prefix}skill", "category": "Benchmark", "questions": [{
+        "question_id":    f"{prefix}{i}",
+        "question_text":  f"Benchmark MCQ {i}",
+        "option_a": "a", "option_b": "b", "option_c": "c", "option_d": "d",
+        "correct_option": "a",
+        "explanation":    "",
+        "b_param":        round(-2.0 + 4.0 * i / max(n - 1, 1), 4),
+    } for i in range(n)]}]}
+
+
+def _mcq_row_by_row(payload: dict) -> int:
+    """The pre-bulk load_questions_from_json(): one INSERT per question."""
+    conn = db_pool.getconn()
+    try:
+        inserted = 0
+        with conn:
+            with conn.cursor() as cur:
+                for block in payload["skills"]:
+                    for q in block["questions"]:
+                        cur.execute("""
+                            INSERT INTO mcq_questions
+                                (question_id, skill, category, question_text,
+                                 option_a, option_b, option_c, option_d,
+                                 correct_option, explanation, b_param)
+                            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+                            ON CONFLICT (question_id) DO NOTHING
+                        """, (q["question_id"], block["skill"], block["category"],
+                              q["question_text"], q["option_a"], q["option_b"],
+                              q["option_c"], q["option_d"], q["correct_option"],
+                              q["explanation"], q["b_param"]))
+                        inserted += cur.rowcount
+        return inserted
+    finally:
+        conn.close()
+
+
+def _execute(sql: str, params: tuple):
+    conn = db_pool.getconn()
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+    finally:
+        conn.close()
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1000.0
+
+
+def bench_oe(n: int) -> tuple[float, float]:
+    qs = _oe_questions(n)
+    sid_row, sid_bulk = str(uuid.uuid4()), str(uuid.uuid4())
+    try:
+        stored_row,  row_ms  = _timed(_oe_row_by_row, sid_row, qs)
+        stored_bulk, bulk_ms = _timed(oe_db.store_oe_questions, sid_bulk, qs)
+        assert len(stored_row) == len(stored_bulk) == n
+        # Same question_id order as the input — what oe_question_map relies on
+        assert [s["question_id"] for s in stored_bulk] == [q["question_id"] for q in qs]
+        return row_ms, bulk_ms
+    finally:
+        _execute("DELETE FROM oe_session_questions WHERE session_id IN (%s::uuid, %s::uuid)",
+                 (sid_row, sid_bulk))
+
+
+def bench_mcq(n: int) -> tuple[float, float]:
+    row_prefix, bulk_prefix = f"bench_r{n}_", f"bench_b{n}_"
+    try:
+        inserted_row, row_ms = _timed(_mcq_row_by_row, _mcq_payload(n, row_prefix))
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump(_mcq_payload(n, bulk_prefix), f)
+        try:
+            (inserted_bulk, err), bulk_ms = _timed(mcq_db.load_questions_from_json, f.name)
+        finally:
+            os.unlink(f.name)
+        assert not err, err
+        assert inserted_row == inserted_bulk == n
+        return row_ms, bulk_ms
+    finally:
+        _execute("DELETE FROM mcq_questions WHERE question_id LIKE %s OR question_id LIKE %s",
+                 (row_prefix + "%", bulk_prefix + "%"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    args = parser.parse_args()
+
+    ok, msg = oe_db.test_connection()
+    if not ok:
+        print(f"PostgreSQL not reachable ({msg}) — set POSTGRES_* and retry.")
+        sys.exit(1)
+
+    print(f"{'table':<22}{'n':>8}{'row-by-row ms':>16}{'bulk ms':>12}{'speed-up':>10}")
+    for table, bench in (("oe_session_questions", bench_oe), ("mcq_questions", bench_mcq)):
+        for n in args.sizes:
+            row_ms, bulk_ms = bench(n)
+            print(f"{table:<22}{n:>8}{row_ms:>16.1f}{bulk_ms:>12.1f}{row_ms / bulk_ms:>9.1f}x")
+    print("\npool:", db_pool.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+bench_estimators.py
+Items needed to reach a target SE(θ): step update vs MLE vs EAP.
+
+Each simulated examinee (true θ ~ N(0, 1), clipped to the θ range) answers
+up to --max-items questions from a synthetic bank. For every estimator we
+report how many items it took until its own SE first dropped to the
+target, and the bias / RMSE of θ at that point (examinees that never reach
+the target are scored at --max-items).
+
+Usage (from the repo root):
+  python -m benchmarks.bench_estimators --examinees 2000 --target-se 0.5
+"""
+
+import os
+import sys
+import math
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcq_irt"))
+
+import rasch_engine as irt
+from item_bank import ItemPool
+from simulator import simulate_session, synthetic_bank
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--examinees", type=int,   default=2000)
+    parser.add_argument("--target-se", type=float, default=0.5)
+    parser.add_argument("--max-items", type=int,   default=40)
+    parser.add_argument("--bank",      type=int,   default=1000)
+    args = parser.parse_args()
+
+    pool   = ItemPool(synthetic_bank(args.bank)["Synthetic"])
+    thetas = [max(irt.THETA_MIN, min(irt.THETA_MAX, random.Random(i).gauss(0, 1)))
+              for i in range(args.examinees)]
+
+    print(f"{args.examinees} examinees · bank {args.bank} · target SE {args.target_se}\n")
+    print(f"{'estimator':<10} | {'items mean':>10} | {'median':>6} | {'reached':>7} | "
+          f"{'bias':>7} | {'RMSE':>6}")
+    print("-" * 62)
+    for name in irt.ESTIMATORS:
+        lengths, errors, reached = [], [], 0
+        for i, true_theta in enumerate(thetas):
+            res = simulate_session(true_theta, pool, args.max_items, name, random.Random(i))
+            k = next((j for j, se in enumerate(res["se_trace"]) if se <= args.target_se), None)
+            if k is not None:
+                reached += 1
+            else:
+                k = len(res["se_trace"]) - 1
+            lengths.append(k + 1)
+            errors.append(res["theta_trace"][k] - true_theta)
+        rmse = math.sqrt(statistics.mean(e * e for e in errors))
+        print(f"{name:<10} | {statistics.mean(lengths):>10.2f} | {statistics.median(lengths):>6.0f} | "
+              f"{reached / len(thetas):>7.1%} | {statistics.mean(errors):>+7.3f} | {rmse:>6.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+bench_item_bank.py
+Per-question selection cost: select_question() list scan vs ItemPool.
+
+Simulates one 15-question quiz per run on synthetic pools (b ~ U[-2, 2],
+no DB needed) and times next-question selection, plus the vectorized
+P(correct) / Fisher information over the whole pool.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_item_bank
+  python -m benchmarks.bench_item_bank --sizes 10000 100000 1000000 --runs 20
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcq_irt"))
+
+import rasch_engine as irt
+from item_bank import ItemPool
+
+QUIZ_LENGTH = 15
+
+
+def _pool(n: int, seed: int = 7) -> list[dict]:
+    rnd = random.Random(seed)
+    return [{"question_id": f"q{i}", "b_param": round(rnd.uniform(-2, 2), 4),
+             "difficulty_tier": "medium"} for i in range(n)]
+
+
+def _quiz(select) -> list[float]:
+    """Run one quiz with a random answer pattern; return per-question ms."""
+    rnd, theta, last, times = random.Random(1), 0.0, None, []
+    for _ in range(QUIZ_LENGTH):
+        t0 = time.perf_counter()
+        q  = select(theta, last)
+        times.append((time.perf_counter() - t0) * 1000.0)
+        last  = rnd.random() < irt.p_correct(0.8, q["b_param"])
+        theta = irt.update_theta(theta, q["b_param"], last)
+    return times
+
+
+def bench_scan(questions: list[dict], runs: int) -> list[float]:
+    times = []
+    for _ in range(runs):
+        asked = set()
+
+        def select(theta, last):
+            q = irt.select_question(questions, theta, asked, last)
+            asked.add(q["question_id"])
+            return q
+        times += _quiz(select)
+    return times
+
+
+def bench_item_pool(pool: ItemPool, runs: int) -> list[float]:
+    times = []
+    for _ in range(runs):
+        mask = pool.new_mask()
+
+        def select(theta, last):
+            q = pool.select(theta, mask, last)
+            pool.mark_asked(mask, q["question_id"])
+            return q
+        times += _quiz(select)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--runs",  type=int, default=10)
+    parser.add_argument("--scan-max", type=int, default=100_000,
+                        help="skip the Python scan above this pool size")
+    args = parser.parse_args()
+
+    print(f"{'items':>10} | {'scan ms/q':>10} | {'pool ms/q':>10} | {'pool p99':>9} | "
+          f"{'P+I all ms':>10} | {'build s':>8}")
+    print("-" * 72)
+    for n in args.sizes:
+        questions = _pool(n)
+        t0   = time.perf_counter()
+        pool = ItemPool(questions)
+        build_s = time.perf_counter() - t0
+
+        scan = (statistics.mean(bench_scan(questions, max(1, args.runs // 5)))
+                if n <= args.scan_max else float("nan"))
+        fast = bench_item_pool(pool, args.runs)
+
+        t0 = time.perf_counter()
+        pool.p_correct(0.3)
+        pool.fisher_info(0.3)
+        vec_ms = (time.perf_counter() - t0) * 1000.0
+
+        p99 = sorted(fast)[int(0.99 * (len(fast) - 1))]
+        print(f"{n:>10,} | {scan:>10.3f} | {statistics.mean(fast):>10.4f} | {p99:>9.4f} | "
+              f"{vec_ms:>10.2f} | {build_s:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
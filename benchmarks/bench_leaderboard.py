@@ -0,0 +1,147 @@
+"""
+bench_leaderboard.py
+Leaderboard page cost at N completed sessions: RANK() OVER the whole table
+(the old getters) vs the leaderboard.py summary tables.
+
+Fills a scratch table (old path) and a scratch board (new path) with the
+same N synthetic sessions — θ ~ N(0, 1) rounded to 0.01 for the MCQ board,
+0-10 correct for the test board — then times:
+  old    full RANK() OVER query, fetching every row (what a page view did)
+  top    first page (25 rows), and a page deep in the middle
+  rank   "my rank" for a session in the middle of the pack
+  sum    count / avg / max / min
+  record incremental upkeep of one more completed session
+
+Needs a reachable PostgreSQL (POSTGRES_* env vars). Scratch rows are
+deleted afterwards.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_leaderboard --sessions 1000000
+"""
+
+import sys
+import time
+import argparse
+import statistics
+
+import db_pool
+import leaderboard as lb
+
+BENCH = "__bench__"
+
+
+def _timed(fn, repeat: int = 5) -> float:
+    """Median wall-clock ms of fn()."""
+    xs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        xs.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(xs)
+
+
+def _fill(cur, family: str, n: int, score_sql: str):
+    """Scratch source table + scratch board with the same n sessions."""
+    board = f"{family}:{BENCH}"
+    cfg   = lb.BOARDS[family]
+    cur.execute("DROP TABLE IF EXISTS bench_lb_source")
+    cur.execute(f"""
+        CREATE TABLE bench_lb_source AS
+        SELECT md5(g::text) AS session_id, 'Student ' || g AS student_name,
+               {score_sql} AS score, g AS arrival
+        FROM generate_series(1, %s) g
+    """, (n,))
+    cur.execute("CREATE INDEX ON bench_lb_source(score DESC, arrival ASC)")
+    cur.execute("""
+        INSERT INTO lb_entries (board, entry_id, score, bucket, seq, payload)
+        SELECT %(board)s, session_id, score,
+               FLOOR(score / %(q)s)::bigint * %(span)s
+                   - CASE WHEN %(block)s > 0 THEN arrival / %(block)s ELSE 0 END,
+               CASE WHEN %(block)s > 0 THEN arrival ELSE 0 END,
+               jsonb_build_object('session_id', session_id, 'student_name', student_name)
+        FROM bench_lb_source
+    """, {"board": board, "q": cfg["quantum"], "span": lb.BUCKET_SPAN, "block": cfg["block"]})
+    cur.execute("""
+        INSERT INTO lb_buckets (board, bucket, n, score_sum)
+        SELECT board, bucket, COUNT(*), SUM(score) FROM lb_entries
+        WHERE board = %s GROUP BY board, bucket
+    """, (board,))
+    cur.execute("ANALYZE bench_lb_source")
+    cur.execute("ANALYZE lb_entries")
+    cur.execute("ANALYZE lb_buckets")
+    return board
+
+
+def _cleanup():
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        cur.execute("DROP TABLE IF EXISTS bench_lb_source")
+        cur.execute("DELETE FROM lb_entries WHERE board LIKE %s", (f"%:{BENCH}",))
+        cur.execute("DELETE FROM lb_buckets WHERE board LIKE %s", (f"%:{BENCH}",))
+    conn.close()
+
+
+def _old_page(order_by: str):
+    conn = db_pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT session_id, student_name, score,
+                       RANK() OVER (ORDER BY {order_by}) AS rank
+                FROM bench_lb_source ORDER BY {order_by}
+            """)
+            cur.fetchall()
+    finally:
+        conn.close()
+
+
+def _record_one(board: str, score: float):
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        lb.record(cur, board, "bench-extra", score, {"student_name": "extra"})
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--repeat",   type=int, default=5)
+    args = parser.parse_args()
+
+    if not lb.init_db():
+        print("PostgreSQL not reachable.")
+        sys.exit(1)
+
+    boards = (
+        ("mcq_overall", "round((sqrt(-2 * ln(1 - random())) * cos(2 * pi() * random()))::numeric, 2)"
+                        "::float8", "score DESC", 0.37),
+        ("test",        "floor(random() * 11)::float8", "score DESC, arrival ASC", 7.0),
+    )
+    print(f"{args.sessions:,} completed sessions per board · median of {args.repeat} runs (ms)\n")
+    print(f"{'board':<12} | {'old RANK()':>10} | {'top p1':>7} | {'top mid':>7} | "
+          f"{'my rank':>7} | {'summary':>7} | {'record':>7}")
+    print("-" * 78)
+    try:
+        for family, score_sql, order_by, extra_score in boards:
+            conn = db_pool.getconn()
+            with conn, conn.cursor() as cur:
+                board = _fill(cur, family, args.sessions, score_sql)
+                cur.execute("SELECT session_id FROM bench_lb_source WHERE arrival = %s",
+                            (args.sessions // 2,))
+                mid_id = cur.fetchone()[0]
+            conn.close()
+
+            old  = _timed(lambda: _old_page(order_by), max(1, args.repeat // 2))
+            p1   = _timed(lambda: lb.top(board, 25), args.repeat)
+            mid  = _timed(lambda: lb.top(board, 25, args.sessions // 2), args.repeat)
+            rank = _timed(lambda: lb.rank_of(board, mid_id), args.repeat)
+            summ = _timed(lambda: lb.summary(board), args.repeat)
+            rec  = _timed(lambda: _record_one(board, extra_score), args.repeat)
+            print(f"{family:<12} | {old:>10.1f} | {p1:>7.2f} | {mid:>7.2f} | "
+                  f"{rank:>7.2f} | {summ:>7.2f} | {rec:>7.2f}")
+    finally:
+        _cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+bench_llm_cache.py
+Cold vs warm cost of re-running the same answer evaluations and resume
+extraction through llm_cache.py, against the local stub LLM
+(benchmarks/stub_llm.py) with injected latency.
+
+Pass 1 fills a scratch cache file, pass 2 repeats the identical calls
+(e.g. re-scoring a session, re-uploading the same resume). Reported per
+pass: LLM calls, wall-clock and the cache hit rate.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_llm_cache --answers 30 --latency 0.5
+"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import llm_cache
+from benchmarks.stub_llm import StubLLM
+
+RESUME = """Jane Doe — B.Tech CSE
+Skills: Python, SQL, React, Docker
+Projects: Chat App (Python, Redis, websockets); Price Tracker (Python, PostgreSQL, cron)"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--answers", type=int,   default=30)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_llm_cache.sqlite3")
+    llm_cache._cache = llm_cache.LLMCache(path)
+
+    with StubLLM(args.latency) as stub:
+        from answer_evaluator import AnswerEvaluator          # after GROQ_BASE_URL is set
+        from question_generator import QuestionGenerator
+        ev, gen = AnswerEvaluator(), QuestionGenerator()
+        answers = [(f"What is concept {i}?", f"Concept {i} is " + "detail " * (i % 40),
+                    f"Concept {i} is a core idea.", "Python") for i in range(args.answers)]
+
+        print(f"{args.answers} evaluations + 1 project extraction · "
+              f"stub latency {args.latency:.2f}s\n")
+        print(f"{'pass':>5} | {'LLM calls':>9} | {'wall s':>7} | {'hit rate':>8}")
+        print("-" * 40)
+        for n in (1, 2):
+            stub.reset()
+            before = llm_cache.stats()
+            t0 = time.perf_counter()
+            for a in answers:
+                ev.evaluate_answer(*a)
+            gen._extract_projects(RESUME)
+            wall  = time.perf_counter() - t0
+            after = llm_cache.stats()
+            hits  = after["hits"] - before["hits"]
+            looks = hits + after["misses"] - before["misses"]
+            print(f"{n:>5} | {stub.stats()['requests']:>9} | {wall:>7.2f} | "
+                  f"{hits / looks:>8.0%}")
+        s = llm_cache.stats()
+        print(f"\n{s['entries']} entries · {s['bytes'] / 1024:.1f} KB in {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+bench_multi_band.py
+Per-band generation (one CoT call per skill × difficulty) vs multi-band
+generation (one call per skill for all three bands) in QuestionGenerator,
+against the local stub LLM (benchmarks/stub_llm.py).
+
+The stub charges --latency seconds per call plus --per-token seconds per
+completion token, so wall-clock reflects both round trips and output
+length. Token counts are the stub's ≈ chars / 4 estimates of what the
+prompts and replies would cost. Both modes must produce the same
+question_ids.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_multi_band --skills 12 --per-band 5
+  python -m benchmarks.bench_multi_band --workers 1 6
+"""
+
+import time
+import argparse
+
+import llm_cache
+from benchmarks.stub_llm import StubLLM
+from benchmarks.bench_question_gen import skills_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--skills",    type=int,   default=12)
+    parser.add_argument("--per-band",  type=int,   default=5, help="questions per difficulty")
+    parser.add_argument("--latency",   type=float, default=0.3, help="stub seconds per call")
+    parser.add_argument("--per-token", type=float, default=0.004,
+                        help="stub seconds per completion token")
+    parser.add_argument("--workers",   type=int,   nargs="+", default=[1, 6])
+    args = parser.parse_args()
+    llm_cache.LLM_CACHE_ENABLED = False      # stub replies must not reach the real cache
+
+    with StubLLM(args.latency, per_token=args.per_token) as stub:
+        from question_generator import QuestionGenerator       # after GROQ_BASE_URL is set
+        gen  = QuestionGenerator()
+        data = skills_data(args.skills)
+
+        print(f"{args.skills} skills × 3 bands × {args.per_band} · stub {args.latency:.2f}s/call "
+              f"+ {args.per_token * 1000:.1f}ms/token\n")
+        print(f"{'workers':>7} | {'mode':>10} | {'calls':>5} | {'prompt tok':>10} | "
+              f"{'output tok':>10} | {'total tok':>9} | {'wall s':>6}")
+        print("-" * 75)
+        for w in args.workers:
+            ids = None
+            for mode, multi in (("per-band", False), ("multi-band", True)):
+                stub.reset()
+                t0   = time.perf_counter()
+                qs   = gen.generate_questions(data, args.per_band, max_workers=w, multi_band=multi)
+                wall = time.perf_counter() - t0
+                got  = [q["question_id"] for q in qs]
+                assert ids is None or got == ids, "question_ids differ between modes"
+                ids  = got
+                s = stub.stats()
+                print(f"{w:>7} | {mode:>10} | {s['requests']:>5} | {s['prompt_tokens']:>10,} | "
+                      f"{s['completion_tokens']:>10,} | {s['total_tokens']:>9,} | {wall:>6.2f}")
+        print(f"\n{len(ids)} questions, ids identical in both modes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+bench_my_rank.py
+Test leaderboard page latency as completed sessions grow: loading every
+row to find "me" (the old page) vs summary + top 10 + my rank + the rows
+around me (leaderboard.py).
+
+For each size the scratch board is refilled (same synthetic data as
+bench_leaderboard.py: 0-10 correct, arrival order breaks ties) and the
+"current student" is the one halfway down the board — the worst case for
+the within-bucket count.
+
+Needs a reachable PostgreSQL (POSTGRES_* env vars). Scratch rows are
+deleted afterwards.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_my_rank --sizes 10000 100000 1000000
+"""
+
+import sys
+import argparse
+
+import db_pool
+import leaderboard as lb
+from benchmarks.bench_leaderboard import _fill, _cleanup, _timed, _old_page
+
+TOP, AROUND = 10, 2
+
+
+def _new_page(board: str, me: str):
+    lb.summary(board)
+    lb.top(board, TOP)
+    lb.rank_of(board, me)
+    lb.neighbours(board, me, AROUND)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--sizes",  type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not lb.init_db():
+        print("PostgreSQL not reachable.")
+        sys.exit(1)
+
+    print(f"test board · median of {args.repeat} runs (ms)\n")
+    print(f"{'sessions':>10} | {'old: all rows':>13} | {'new: page':>9} | {'neighbours':>10}")
+    print("-" * 52)
+    try:
+        for n in args.sizes:
+            conn = db_pool.getconn()
+            with conn, conn.cursor() as cur:
+                board = _fill(cur, "test", n, "floor(random() * 11)::float8")
+                cur.execute("SELECT session_id FROM bench_lb_source WHERE arrival = %s",
+                            (n // 2,))
+                me = cur.fetchone()[0]
+            conn.close()
+
+            old  = _timed(lambda: _old_page("score DESC, arrival ASC"), max(1, args.repeat // 2))
+            page = _timed(lambda: _new_page(board, me), args.repeat)
+            near = _timed(lambda: lb.neighbours(board, me, AROUND), args.repeat)
+            print(f"{n:>10,} | {old:>13.1f} | {page:>9.2f} | {near:>10.2f}")
+            _cleanup()
+    finally:
+        _cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+bench_question_bank.py
+LLM calls per interview with and without the cross-session question bank
+(question_bank.py), against the local stub LLM (benchmarks/stub_llm.py).
+
+--sessions interviews are generated one after another. Each candidate
+(one of --candidates emails, so some come back) has --skills skills drawn
+from a catalogue of --catalogue skills, 3 bands × --per-band questions
+each. Without the bank every cell costs one generation call; with it the
+LLM is only called for cells the bank cannot fill for that candidate.
+
+The stub answers a cell with the same text every time, so the bank holds
+at most --per-band questions per cell here and a returning candidate who
+has seen them falls back to the LLM; real generations keep growing it.
+
+Reported per block of sessions: LLM calls made vs the no-bank baseline,
+question hit ratio, and generation wall-clock.
+
+Needs a reachable PostgreSQL (POSTGRES_* env vars) and the groq SDK.
+Bank rows for the synthetic skills are deleted afterwards.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_question_bank --sessions 200 --catalogue 40
+"""
+
+import sys
+import time
+import random
+import argparse
+
+import db_pool
+import llm_cache
+import question_bank as qb
+from benchmarks.stub_llm import StubLLM
+
+PREFIX = "__bench_qb_"
+
+
+def _cleanup():
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        cur.execute("""
+            DELETE FROM oe_bank_exposure WHERE question_hash IN
+                (SELECT question_hash FROM oe_question_bank WHERE skill_key LIKE %s)
+        """, (PREFIX + "%",))
+        cur.execute("DELETE FROM oe_question_bank WHERE skill_key LIKE %s", (PREFIX + "%",))
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--sessions",   type=int,   default=200)
+    parser.add_argument("--candidates", type=int,   default=120, help="distinct emails")
+    parser.add_argument("--catalogue",  type=int,   default=40,  help="distinct skills")
+    parser.add_argument("--skills",     type=int,   default=6,   help="skills per resume")
+    parser.add_argument("--per-band",   type=int,   default=2)
+    parser.add_argument("--block",      type=int,   default=40,  help="sessions per report row")
+    parser.add_argument("--latency",    type=float, default=0.05)
+    args = parser.parse_args()
+    llm_cache.LLM_CACHE_ENABLED = False      # stub replies must not reach the real cache
+
+    if not qb.init_db():
+        print("PostgreSQL not reachable.")
+        sys.exit(1)
+
+    rnd     = random.Random(7)
+    catalog = [f"{PREFIX}{i:03d}" for i in range(args.catalogue)]
+    _cleanup()
+    try:
+        with StubLLM(args.latency) as stub:
+            from question_generator import QuestionGenerator      # after GROQ_BASE_URL is set
+            bank = qb.QuestionBank()
+            gen  = QuestionGenerator(bank)
+
+            print(f"{args.sessions} sessions · {args.candidates} candidates · "
+                  f"{args.skills} of {args.catalogue} skills × 3 bands × {args.per_band} · "
+                  f"exposure limit {bank.max_exposure}\n")
+            print(f"{'sessions':>9} | {'LLM calls':>9} | {'no bank':>7} | {'saved':>6} | "
+                  f"{'hit ratio':>9} | {'s/session':>9}")
+            print("-" * 63)
+            calls = baseline = served = requested = 0
+            wall  = 0.0
+            for n in range(1, args.sessions + 1):
+                email  = f"cand{rnd.randrange(args.candidates)}@bench.local"
+                skills = rnd.sample(catalog, args.skills)
+                data   = {"categories": {"Programming Languages": [{"name": s} for s in skills]}}
+                before = bank.stats()
+                stub.reset()
+                t0 = time.perf_counter()
+                gen.generate_questions(data, args.per_band, candidate=email)
+                wall += time.perf_counter() - t0
+                after = bank.stats()
+
+                calls     += stub.stats()["requests"]
+                baseline  += len(skills) * 3
+                served    += after["served"] - before["served"]
+                requested += after["requested"] - before["requested"]
+                if n % args.block == 0 or n == args.sessions:
+                    print(f"{n:>9} | {calls:>9} | {baseline:>7} | "
+                          f"{1 - calls / baseline:>5.0%} | {served / requested:>9.2f} | "
+                          f"{wall / args.block:>9.2f}")
+                    calls = baseline = served = requested = 0
+                    wall  = 0.0
+            s = bank.stats()
+            print(f"\ntotal: hit ratio {s['hit_ratio']:.2f} · cells fully served "
+                  f"{s['cells_full']}/{s['cells']} · LLM calls saved {s['llm_calls_saved']}")
+    finally:
+        _cleanup()
+
+
+if __name__ == "__main__":
+    main()
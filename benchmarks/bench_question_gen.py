@@ -0,0 +1,73 @@
+"""
+bench_question_gen.py
+Wall-clock of QuestionGenerator.generate_questions(): the serial loop
+(max_workers=1) vs the thread pool at several concurrency limits, against
+the local stub LLM (benchmarks/stub_llm.py) with injected latency.
+
+A resume with --skills skills × 3 difficulty levels (+ project extraction
+and --projects project questions) is generated at each concurrency level;
+question_ids must come out identical to the serial run.
+
+Without sentence-transformers installed the validator round trip is
+skipped (as in the app), so only generation calls are timed.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_question_gen --skills 12 --latency 0.8
+  python -m benchmarks.bench_question_gen --workers 1 4 8 16
+"""
+
+import time
+import argparse
+
+import llm_cache
+from benchmarks.stub_llm import StubLLM
+
+CATEGORIES = ["Programming Languages", "Databases", "Backend Development",
+              "Frontend Development", "Cloud & DevOps", "DSA & CS Fundamentals"]
+
+
+def skills_data(n: int) -> dict:
+    cats: dict[str, list] = {}
+    for i in range(n):
+        cats.setdefault(CATEGORIES[i % len(CATEGORIES)], []).append({"name": f"Skill{i:02d}"})
+    return {"categories": cats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--skills",   type=int,   default=12)
+    parser.add_argument("--per-band", type=int,   default=1, help="questions per difficulty")
+    parser.add_argument("--latency",  type=float, default=0.8, help="stub seconds per call")
+    parser.add_argument("--jitter",   type=float, default=0.2)
+    parser.add_argument("--workers",  type=int,   nargs="+", default=[1, 4, 6, 12])
+    args = parser.parse_args()
+    llm_cache.LLM_CACHE_ENABLED = False      # stub replies must not reach the real cache
+
+    with StubLLM(args.latency, args.jitter) as stub:
+        from question_generator import QuestionGenerator       # after GROQ_BASE_URL is set
+        gen    = QuestionGenerator()
+        data   = skills_data(args.skills)
+        resume = "Projects: Chat App (Python, Redis); Price Tracker (Python, PostgreSQL)"
+
+        print(f"{args.skills} skills × 3 bands × {args.per_band} + projects · "
+              f"stub latency {args.latency:.2f}s ± {args.jitter:.2f}s\n")
+        print(f"{'workers':>7} | {'calls':>5} | {'in flight':>9} | {'wall s':>7} | {'speed-up':>8}")
+        print("-" * 50)
+        serial_s, serial_ids = None, None
+        for w in args.workers:
+            stub.reset()
+            t0  = time.perf_counter()
+            qs  = gen.generate_questions(data, args.per_band, resume, max_workers=w)
+            wall = time.perf_counter() - t0
+            ids = [q["question_id"] for q in qs]
+            if serial_ids is None:
+                serial_s, serial_ids = wall, ids
+            assert ids == serial_ids, "question_id order differs from the first run"
+            s = stub.stats()
+            print(f"{w:>7} | {s['requests']:>5} | {s['max_inflight']:>9} | {wall:>7.2f} | "
+                  f"{serial_s / wall:>7.1f}×")
+        print(f"\n{len(serial_ids)} questions, ids identical across runs")
+
+
+if __name__ == "__main__":
+    main()
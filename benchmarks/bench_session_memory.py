@@ -0,0 +1,87 @@
+"""
+bench_session_memory.py
+Per-session memory of SkillSession's answer history: list of dicts vs ResponseLog.
+
+Replays full quizzes against the real question bank (mcq_irt/mcq_data.json,
+no DB needed) and measures, with tracemalloc, how many bytes the
+SkillSession objects allocate. The question pool is built BEFORE tracing
+starts, because it is shared by every session on a server.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_session_memory --sessions 500
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import tracemalloc
+
+MCQ_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcq_irt")
+sys.path.insert(0, MCQ_DIR)
+
+import rasch_engine as irt
+
+
+class DictLog(list):
+    """The previous representation: one ~25-key dict per answer."""
+
+    def append(self, question, record):
+        super().append(record)
+
+    @property
+    def n_correct(self):
+        return sum(1 for r in self if r["is_correct"])
+
+
+def _load_pool() -> dict[str, list[dict]]:
+    with open(os.path.join(MCQ_DIR, "mcq_data.json")) as f:
+        data = json.load(f)
+    return {s["skill"]: [dict(q, skill=s["skill"]) for q in s["questions"]]
+            for s in data["skills"]}
+
+
+def _run_sessions(pools: dict, n_sessions: int, compact: bool) -> tuple[int, list]:
+    rnd = random.Random(0)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    sessions = []
+    for _ in range(n_sessions):
+        for skill, pool in pools.items():
+            sess = irt.SkillSession(skill, quiz_length=min(15, len(pool)))
+            if not compact:
+                sess.responses = DictLog()
+            while not sess.done:
+                q = sess.next_question(pool)
+                sess.record_answer(q, q["correct_option"] if rnd.random() < 0.6 else "x")
+            sess._pool_src = sess._pool_view = None     # pool index is per-pool, not per-answer
+            sessions.append(sess)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(st.size_diff for st in after.compare_to(before, "filename"))
+    return total, sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--sessions", type=int, default=500)
+    args = parser.parse_args()
+
+    pools    = _load_pool()
+    n_skills = len(pools)
+    print(f"{args.sessions} students x {n_skills} skills x up to 15 answers\n")
+    results = {}
+    for label, compact in (("list of dicts", False), ("ResponseLog", True)):
+        total, sessions = _run_sessions(pools, args.sessions, compact)
+        results[label] = total / args.sessions
+        n_ans = sum(len(s.responses) for s in sessions) / args.sessions
+        print(f"{label:<14} {results[label]:>10,.0f} bytes / student "
+              f"({results[label] / n_ans:,.0f} bytes / answer)")
+        del sessions
+    old, new = results["list of dicts"], results["ResponseLog"]
+    print(f"\nreduction: {old / new:.1f}x  ({(1 - new / old):.0%} less)")
+
+
+if __name__ == "__main__":
+    main()
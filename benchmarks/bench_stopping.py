@@ -0,0 +1,96 @@
+"""
+bench_stopping.py
+What variable-length stopping saves: fixed length vs StoppingRule.
+
+Open-ended interview: each category has the 15-question pool main_app
+generates (5 easy / 5 medium / 5 hard, b inside question_generator's
+IRT_BANDS) and a fixed cap of --answers-per-skill. Every answer costs one
+LLM evaluation, so items saved = evaluation calls saved.
+MCQ: 15-question SkillSessions against mcq_irt/mcq_data.json.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_stopping --examinees 2000
+"""
+
+import os
+import sys
+import math
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcq_irt"))
+
+import rasch_engine as irt
+from simulator import load_bank, simulate_category, simulate_session
+
+BANDS = {"easy": (-1.8, -0.5), "medium": (-0.5, 0.5), "hard": (0.5, 1.8)}
+
+
+def _oe_pool(seed: int) -> list[dict]:
+    rnd = random.Random(seed)
+    return [{"question_id": f"{lvl[0]}{i}", "b_param": round(rnd.uniform(*BANDS[lvl]), 3)}
+            for lvl in BANDS for i in range(5)]
+
+
+def _rules(se_target: float) -> dict:
+    return {
+        "fixed":          None,
+        f"SE<={se_target}": irt.StoppingRule(se_target=se_target, min_items=4),
+        "plateau":        irt.StoppingRule(min_items=4, plateau_delta=0.05),
+        "SE + plateau":   irt.StoppingRule(se_target=se_target, min_items=4,
+                                           plateau_delta=0.05),
+    }
+
+
+def _report(title: str, runs: dict, baseline: float):
+    print(f"\n{title}")
+    print(f"{'rule':<14} | {'items':>6} | {'saved':>6} | {'RMSE':>6} | stop reasons")
+    print("-" * 72)
+    for name, results in runs.items():
+        n    = statistics.mean(r["n_items"] for r in results)
+        rmse = math.sqrt(statistics.mean((r["theta"] - r["true_theta"]) ** 2 for r in results))
+        reasons = {}
+        for r in results:
+            reasons[r["stop_reason"]] = reasons.get(r["stop_reason"], 0) + 1
+        why = ", ".join(f"{k} {v / len(results):.0%}" for k, v in sorted(reasons.items()))
+        print(f"{name:<14} | {n:>6.2f} | {1 - n / baseline:>6.1%} | {rmse:>6.3f} | {why}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--examinees",         type=int,   default=2000)
+    parser.add_argument("--answers-per-skill", type=int,   default=9)
+    parser.add_argument("--se-target",         type=float, default=0.6)
+    parser.add_argument("--estimator",         default="step", choices=sorted(irt.ESTIMATORS))
+    args = parser.parse_args()
+
+    thetas = [max(irt.THETA_MIN, min(irt.THETA_MAX, random.Random(i).gauss(0, 1)))
+              for i in range(args.examinees)]
+
+    oe_runs = {
+        name: [simulate_category(t, _oe_pool(i), args.answers_per_skill, args.estimator,
+                                 random.Random(i), rule)
+               for i, t in enumerate(thetas)]
+        for name, rule in _rules(args.se_target).items()
+    }
+    _report(f"Open-ended ({args.estimator}, cap {args.answers_per_skill}/category) — "
+            f"items = LLM evaluations per category", oe_runs, args.answers_per_skill)
+    saved = (args.answers_per_skill
+             - statistics.mean(r["n_items"] for r in oe_runs["SE + plateau"]))
+    print(f"→ SE + plateau saves {saved:.2f} LLM evaluations per category "
+          f"({saved * 5:.1f} for a 5-category interview)")
+
+    bank     = load_bank()
+    skill    = max(bank, key=lambda sk: len(bank[sk]))
+    pool     = bank[skill]
+    mcq_runs = {
+        name: [simulate_session(t, pool, 15, args.estimator, random.Random(i), rule)
+               for i, t in enumerate(thetas)]
+        for name, rule in _rules(args.se_target).items()
+    }
+    _report(f"MCQ ({args.estimator}, {skill}, 15 questions)", mcq_runs, 15)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+bench_validation.py
+Embedding cost of answer validation on CPU.
+
+Part 1 — raw throughput: one encode() per (model answer, validator
+answer) pair vs one batched encode() over all pairs with similarities as
+a matrix, at several batch sizes.
+
+Part 2 — generation run: QuestionGenerator against the local stub LLM
+(benchmarks/stub_llm.py) with the real encoder. Cells share encode()
+calls through QuestionGenerator.encode_stage. Run with linger 0 (the
+default: each cell encodes as soon as the encoder is free) and with a
+--linger-ms window, reporting encode calls, texts per call and encode time.
+
+--model takes a model name or a local SentenceTransformer directory.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_validation --pairs 512 --batch-sizes 8 16 32 64 128
+  python -m benchmarks.bench_validation --model /path/to/all-MiniLM-L6-v2 --skills 12
+"""
+
+import sys
+import time
+import argparse
+
+try:
+    import torch
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    sys.exit("sentence-transformers is not installed (pip install -r requirements_enhanced.txt)")
+
+import embeddings
+import llm_cache
+from benchmarks.stub_llm import StubLLM
+from benchmarks.bench_question_gen import skills_data
+
+
+def pairs(n: int) -> list[tuple[str, str]]:
+    """Model / validator answers of typical length (3-5 sentences)."""
+    return [(f"Concept {i} is a core idea of the skill because it decides how data flows "
+             f"through the program. It matters since a wrong choice makes the code slower "
+             f"and harder to test. For example, picking structure {i % 7} keeps lookups "
+             f"constant time. Interviewers expect the trade-off to be named explicitly.",
+             f"Concept {i} is central to program design: it controls the data flow. Choosing "
+             f"badly costs speed and testability. " + "An example makes this concrete. " * (1 + i % 3))
+            for i in range(n)]
+
+
+def raw_throughput(model, n_pairs: int, batch_sizes: list[int]):
+    from question_generator import _pair_similarities
+    data  = pairs(n_pairs)
+    texts = [a for a, _ in data] + [b for _, b in data]
+    model.encode(texts[:64], batch_size=32)                        # warm-up
+
+    print(f"Part 1 — {n_pairs} pairs · {torch.get_num_threads()} torch threads\n")
+    print(f"{'mode':>12} | {'encode calls':>12} | {'wall s':>7} | {'pairs/s':>8} | {'speed-up':>8}")
+    print("-" * 62)
+    t0   = time.perf_counter()
+    ref  = [_pair_similarities(model.encode([a, b], normalize_embeddings=True), 1)[0]
+            for a, b in data]
+    base = time.perf_counter() - t0
+    print(f"{'per pair':>12} | {n_pairs:>12} | {base:>7.2f} | {n_pairs / base:>8.1f} | {1:>7.1f}x")
+    for bs in batch_sizes:
+        t0   = time.perf_counter()
+        emb  = model.encode(texts, batch_size=bs, normalize_embeddings=True)
+        sims = _pair_similarities(emb, n_pairs)
+        wall = time.perf_counter() - t0
+        assert max(abs(s - r) for s, r in zip(sims, ref)) < 1e-3, "similarities differ"
+        print(f"{f'batch {bs}':>12} | {1:>12} | {wall:>7.2f} | {n_pairs / wall:>8.1f} | "
+              f"{base / wall:>7.1f}x")
+
+
+def generation_run(n_skills: int, per_band: int, latency: float, workers: int, linger: float):
+    from question_generator import QuestionGenerator, EncodeStage
+    embeddings.EMBED_CACHE_SIZE = 0                 # measure encoding, not the LRU
+    encode, spent = embeddings.encode, [0.0]
+
+    def timed(texts, batch_size=64):
+        t0 = time.perf_counter()
+        try:
+            return encode(texts, batch_size)
+        finally:
+            spent[0] += time.perf_counter() - t0
+
+    embeddings.encode = timed
+    print(f"\nPart 2 — {n_skills} skills × 3 bands × {per_band} · {workers} workers · "
+          f"stub {latency:.2f}s/call\n")
+    print(f"{'linger ms':>9} | {'cells':>5} | {'encode calls':>12} | {'texts/call':>10} | "
+          f"{'encode s':>8} | {'wall s':>6}")
+    print("-" * 66)
+    with StubLLM(latency, jitter=latency / 2) as stub:
+        gen = QuestionGenerator()
+        for ms in (0, linger * 1000):
+            gen.encode_stage = EncodeStage(QuestionGenerator.ENCODE_BATCH_SIZE, ms / 1000)
+            spent[0] = 0.0
+            t0 = time.perf_counter()
+            gen.generate_questions(skills_data(n_skills), per_band, max_workers=workers)
+            wall = time.perf_counter() - t0
+            s = gen.encode_stage.stats()
+            print(f"{ms:>9.0f} | {n_skills * 3:>5} | {s['calls']:>12} | {s['texts_per_call']:>10} | "
+                  f"{spent[0]:>8.2f} | {wall:>6.2f}")
+    embeddings.encode = encode
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--model",       default=embeddings.EMBED_MODEL)
+    parser.add_argument("--pairs",       type=int,   default=512)
+    parser.add_argument("--batch-sizes", type=int,   nargs="+", default=[8, 16, 32, 64, 128])
+    parser.add_argument("--skills",      type=int,   default=12)
+    parser.add_argument("--per-band",    type=int,   default=5)
+    parser.add_argument("--latency",     type=float, default=0.3, help="stub seconds per call")
+    parser.add_argument("--workers",     type=int,   default=6)
+    parser.add_argument("--linger-ms",   type=float, default=200, help="window compared with 0")
+    args = parser.parse_args()
+    llm_cache.LLM_CACHE_ENABLED = False      # stub replies must not reach the real cache
+
+    model = SentenceTransformer(args.model, device="cpu")
+    embeddings._model = model                # shared by the generator in part 2
+    raw_throughput(model, args.pairs, args.batch_sizes)
+    if args.skills:
+        generation_run(args.skills, args.per_band, args.latency, args.workers,
+                       args.linger_ms / 1000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+stub_llm.py
+A local stand-in for the Groq chat-completions API, with injected latency.
+
+The groq SDK reads GROQ_BASE_URL, so pointing it at this server makes
+QuestionGenerator / AnswerEvaluator / the skill extractor talk to the
+stub instead of the network — no code changes, no API key, no cost.
+
+Replies are deterministic and shaped like what the prompts ask for:
+  question generation ("Generate exactly N interview question(s)")
+                          → <reasoning> block + JSON array of N questions
+  multi-band generation ("EVERY difficulty band", "EASY — N question(s)" …)
+                          → one JSON array with every band's questions
+  skill extraction        → JSON skills by category + the same two projects
+  project extraction      → JSON array of two projects
+  project question        → JSON array of one question
+  answer evaluation       → JSON Likert rating (longer answer → higher rating)
+  anything else           → a short plain-text answer
+
+Each request sleeps --latency seconds (± --jitter) plus --per-token
+seconds per completion token (output decoding) before answering, and
+the server counts requests, concurrent requests in flight and token usage
+(≈ chars / 4) so benchmarks can report calls and tokens.
+
+Usage:
+  python -m benchmarks.stub_llm --port 8765 --latency 0.8
+  GROQ_BASE_URL=http://127.0.0.1:8765 GROQ_API_KEY=gsk_stub streamlit run main_app.py
+
+From code:
+  with StubLLM(latency=0.5) as stub:   # sets GROQ_BASE_URL / GROQ_API_KEY
+      ...
+      print(stub.stats())
+"""
+
+import os
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BANDS = {"easy": -1.0, "medium": 0.0, "hard": 1.0}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CANNED REPLIES
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _question(skill: str, category: str, difficulty: str, i: int) -> dict:
+    return {
+        "skill": skill, "category": category, "difficulty": difficulty,
+        "question": f"What is {skill} concept {i + 1} at {difficulty} level?",
+        "type": "conceptual",
+        "hints": ["Think about the definition", "Give an example"],
+        "model_answer": f"{skill} concept {i + 1} is a core idea. It matters because "
+                        f"it shapes how {skill} programs are written. An example shows it.",
+        "b_param": BANDS.get(difficulty, 0.0),
+        "b_reasoning": "stub",
+    }
+
+
+def reply_for(prompt: str, malformed: tuple = ()) -> str:
+    """
+    Deterministic completion text for one user prompt. Bands listed in
+    `malformed` come back without model answers in multi-band replies.
+    """
+    bands = re.findall(r"^\s*(EASY|MEDIUM|HARD)\s*— (\d+) question", prompt, flags=re.M)
+    if bands and "EVERY difficulty band" in prompt:
+        skill    = re.search(r"Skill:\s*(.+)", prompt).group(1).strip()
+        category = re.search(r"Category:\s*(.+)", prompt).group(1).strip()
+        qs = []
+        for band, n in bands:
+            for i in range(int(n)):
+                q = _question(skill, category, band.lower(), i)
+                if band.lower() in malformed:
+                    q["model_answer"] = ""
+                qs.append(q)
+        return "<reasoning>stub reasoning</reasoning>\n" + json.dumps(qs)
+    m = re.search(r"Generate exactly (\d+) interview question", prompt)
+    if m:
+        count      = int(m.group(1))
+        skill      = re.search(r"Skill:\s*(.+)", prompt).group(1).strip()
+        category   = re.search(r"Category:\s*(.+)", prompt).group(1).strip()
+        difficulty = re.search(r"Difficulty:\s*(\w+)", prompt).group(1).strip().lower()
+        qs = [_question(skill, category, difficulty, i) for i in range(count)]
+        return "<reasoning>stub reasoning</reasoning>\n" + json.dumps(qs)
+    if "PART 1 — SKILLS" in prompt:
+        return json.dumps({
+            "skills": {"Programming Languages": ["Python"], "Databases": ["PostgreSQL", "Redis"],
+                       "Backend Development": ["REST API"]},
+            "projects": [
+                {"title": "Chat App", "description": "Realtime chat",
+                 "technologies": ["Python", "Redis"], "highlights": ["websockets"],
+                 "skill_context": {"Redis": "Pub/sub fan-out of messages"}},
+                {"title": "Price Tracker", "description": "Scrapes prices",
+                 "technologies": ["Python", "PostgreSQL"], "highlights": ["cron jobs"],
+                 "skill_context": {"PostgreSQL": "Price history tables"}},
+            ],
+        })
+    if "Extract all projects" in prompt:
+        return json.dumps([
+            {"title": "Chat App", "description": "Realtime chat",
+             "technologies": ["Python", "Redis"], "highlights": ["websockets"]},
+            {"title": "Price Tracker", "description": "Scrapes prices",
+             "technologies": ["Python", "PostgreSQL"], "highlights": ["cron jobs"]},
+        ])
+    m = re.search(r"PROJECT:\s*(.+)", prompt)
+    if m and "specific question about this project" in prompt:
+        title = m.group(1).strip()
+        return json.dumps([{
+            "skill": title, "category": "Project", "difficulty": "medium",
+            "question": f"What was the hardest design decision in {title}?",
+            "type": "project", "hints": ["Trade-offs"],
+            "model_answer": f"In {title} the hardest decision was the data model.",
+            "b_param": 0.0, "b_reasoning": "Project question — default medium difficulty",
+        }])
+    if "CANDIDATE'S ANSWER:" in prompt and '"likert"' in prompt:
+        answer = prompt.split("CANDIDATE'S ANSWER:", 1)[1].split("═", 1)[0].strip()
+        likert = 1 + min(4, len(answer.split()) // 10)
+        return json.dumps({
+            "likert": likert, "score": likert * 20,
+            "strengths": ["Relevant terminology"], "improvements": ["Add an example"],
+            "detailed_feedback": "Stub evaluation based on answer length.",
+            "correct_answer_summary": "The core idea with an example.",
+        })
+    return "It is a core concept. It matters because it shapes the design. An example shows it."
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SERVER
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):          # keep benchmark output clean
+        pass
+
+    def do_POST(self):
+        stub   = self.server.stub
+        length = int(self.headers.get("Content-Length", 0))
+        body   = json.loads(self.rfile.read(length) or b"{}")
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        stub._enter()
+        text = ""
+        try:
+            text = reply_for(body.get("messages", [{}])[-1].get("content", ""), stub.malformed)
+            time.sleep(max(0.0, stub.latency + random.uniform(-stub.jitter, stub.jitter))
+                       + stub.per_token * (len(text) // 4))
+        finally:
+            stub._leave(len(prompt) // 4, len(text) // 4)
+        payload = json.dumps({
+            "id": f"stub-{time.time_ns()}", "object": "chat.completion",
+            "created": int(time.time()), "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": text}}],
+            "usage": {"prompt_tokens": len(prompt) // 4,
+                      "completion_tokens": len(text) // 4,
+                      "total_tokens": (len(prompt) + len(text)) // 4},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class StubLLM:
+    """Threaded stub server. As a context manager it also points the groq SDK at itself."""
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0,
+                 per_token: float = 0.0, malformed: tuple = ()):
+        self.latency, self.jitter = latency, jitter
+        self.per_token = per_token          # seconds per completion token
+        self.malformed = tuple(malformed)   # bands to break in multi-band replies
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._lock = threading.Lock()
+        self._env: dict = {}
+        self.reset()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _enter(self):
+        with self._lock:
+            self._inflight += 1
+            self._max_inflight = max(self._max_inflight, self._inflight)
+
+    def _leave(self, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            self._inflight          -= 1
+            self._requests          += 1
+            self._prompt_tokens     += prompt_tokens
+            self._completion_tokens += completion_tokens
+
+    def reset(self):
+        with self._lock:
+            self._requests = self._inflight = self._max_inflight = 0
+            self._prompt_tokens = self._completion_tokens = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self._requests, "max_inflight": self._max_inflight,
+                    "prompt_tokens": self._prompt_tokens,
+                    "completion_tokens": self._completion_tokens,
+                    "total_tokens": self._prompt_tokens + self._completion_tokens}
+
+    def start(self) -> "StubLLM":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        self.start()
+        for key, value in (("GROQ_BASE_URL", self.base_url), ("GROQ_API_KEY", "gsk_stub")):
+            self._env[key] = os.environ.get(key)
+            os.environ[key] = value
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        for key, value in self._env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--host",    default="127.0.0.1")
+    parser.add_argument("--port",    type=int,   default=8765)
+    parser.add_argument("--latency", type=float, default=0.8, help="seconds per request")
+    parser.add_argument("--jitter",  type=float, default=0.0, help="± seconds of noise")
+    parser.add_argument("--per-token", type=float, default=0.0,
+                        help="extra seconds per completion token")
+    args = parser.parse_args()
+
+    stub = StubLLM(args.latency, args.jitter, args.host, args.port, args.per_token)
+    print(f"Stub LLM on {stub.base_url} · {args.latency:.2f}s ± {args.jitter:.2f}s per call")
+    print(f"  export GROQ_BASE_URL={stub.base_url} GROQ_API_KEY=gsk_stub")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        print(stub.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+db_pool.py
+Shared, thread-safe PostgreSQL connection pool for every database module.
+
+Before this module each of mcq_database.py, open_ended_database.py,
+final_database.py and test_database.py opened a brand-new psycopg2
+connection per query and closed it again. They now all borrow from ONE
+process-wide pool:
+
+    conn = db_pool.getconn()          # pooled connection (same API as psycopg2)
+    with conn:                        # commit / rollback as before
+        with conn.cursor() as cur:
+            ...
+    conn.close()                      # returns it to the pool, does NOT disconnect
+
+POOL BEHAVIOUR:
+  ✅ min / max size      — never more than MAX open, idle reaping stops at MIN
+  ✅ waiting             — when all MAX connections are busy, callers block
+                           up to TIMEOUT seconds for one to be returned
+  ✅ health checks       — a connection idle longer than CHECK_SECONDS is
+                           pinged with SELECT 1 before reuse; dead ones replaced
+  ✅ idle recycling      — connections idle longer than IDLE_SECONDS are closed
+                           (down to MIN)
+  ✅ counters            — hits, misses, waits, timeouts, checkout latency
+
+CONFIG (environment, read once when the pool is first used):
+  POSTGRES_POOL_MIN            1
+  POSTGRES_POOL_MAX            10
+  POSTGRES_POOL_TIMEOUT        10    seconds to wait for a free connection
+  POSTGRES_POOL_IDLE_SECONDS   300   close idle connections above MIN after this
+  POSTGRES_POOL_CHECK_SECONDS  30    ping connections idle longer than this
+"""
+
+import os
+import time
+import threading
+from collections import deque
+
+import psycopg2
+import psycopg2.extensions
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection became free within the pool timeout."""
+
+
+def _connect_kwargs() -> dict:
+    """Connection settings — Streamlit secrets first, then environment."""
+    cfg = None
+    try:
+        import streamlit as st
+        cfg = st.secrets.get("postgres", {})
+    except Exception:
+        pass
+
+    if cfg:
+        return dict(
+            host=cfg.get("host", "localhost"),
+            port=cfg.get("port", 5432),
+            dbname=cfg.get("dbname", "interview_coach"),
+            user=cfg.get("user", "postgres"),
+            password=cfg.get("password", ""),
+        )
+    return dict(
+        host=os.environ.get("POSTGRES_HOST", "localhost"),
+        port=int(os.environ.get("POSTGRES_PORT", 5432)),
+        dbname=os.environ.get("POSTGRES_DB", "interview_coach"),
+        user=os.environ.get("POSTGRES_USER", "postgres"),
+        password=os.environ.get("POSTGRES_PASSWORD", ""),
+    )
+
+
+def _default_connect():
+    return psycopg2.connect(**_connect_kwargs())
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# POOLED CONNECTION WRAPPER
+# ─────────────────────────────────────────────────────────────────────────────
+
+class PooledConnection:
+    """
+    Thin proxy around a psycopg2 connection.
+    Everything is delegated to the real connection except close(),
+    which hands the connection back to the pool instead of disconnecting.
+    """
+
+    __slots__ = ("_pool", "_raw")
+
+    def __init__(self, pool: "ConnectionPool", raw):
+        self._pool = pool
+        self._raw  = raw
+
+    def __getattr__(self, name):
+        if name in PooledConnection.__slots__:
+            raise AttributeError(name)
+        raw = self._raw
+        if raw is None:
+            raise psycopg2.InterfaceError("connection already returned to pool")
+        return getattr(raw, name)
+
+    def __setattr__(self, name, value):
+        # e.g. conn.autocommit = True must reach the real connection
+        if name in PooledConnection.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._raw, name, value)
+
+    def __enter__(self):
+        self._raw.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._raw.__exit__(exc_type, exc, tb)
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def close(self):
+        """Return the connection to the pool. Safe to call twice."""
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.putconn(raw)
+
+    def discard(self):
+        """Close the underlying connection for good (e.g. after a fatal error)."""
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool.putconn(raw, discard=True)
+
+    def __del__(self):
+        # Safety net for code paths that forget to close()
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONNECTION POOL
+# ─────────────────────────────────────────────────────────────────────────────
+
+class ConnectionPool:
+    """
+    Blocking, thread-safe connection pool.
+
+    Idle connections are reused LIFO (the most recently returned one is the
+    warmest), and reaped FIFO (the longest-idle one is closed first).
+    """
+
+    def __init__(self, connect=None, minconn: int = 1, maxconn: int = 10,
+                 timeout: float = 10.0, max_idle: float = 300.0,
+                 check_after: float = 30.0):
+        if maxconn < 1 or minconn < 0 or minconn > maxconn:
+            raise ValueError(f"invalid pool size min={minconn} max={maxconn}")
+        self._connect    = connect or _default_connect
+        self.minconn     = minconn
+        self.maxconn     = maxconn
+        self.timeout     = timeout
+        self.max_idle    = max_idle
+        self.check_after = check_after
+
+        self._idle   = deque()          # (raw_conn, last_used) — oldest on the left
+        self._size   = 0                # open connections (idle + in use)
+        self._cond   = threading.Condition()
+        self._closed = False
+        self.reset_stats()
+
+    # ── Public API ───────────────────────────────────────────────────────
+
+    def getconn(self, timeout: float | None = None) -> PooledConnection:
+        """Borrow a connection, waiting up to `timeout` seconds if the pool is full."""
+        t0       = time.perf_counter()
+        deadline = t0 + (self.timeout if timeout is None else timeout)
+        waited   = False
+        raw, last_used = None, None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise psycopg2.InterfaceError("connection pool is closed")
+                self._reap_idle_locked(time.monotonic())
+                if self._idle:
+                    raw, last_used = self._idle.pop()
+                    self._stats["hits"] += 1
+                    break
+                if self._size < self.maxconn:
+                    self._size += 1
+                    self._stats["misses"] += 1
+                    break
+                if not waited:
+                    waited = True
+                    self._stats["waits"] += 1
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"no free connection after {self.timeout:.1f}s "
+                        f"(max={self.maxconn})"
+                    )
+                self._cond.wait(remaining)
+
+        # Connect / health-check outside the lock so other threads are not blocked
+        try:
+            if raw is None:
+                raw = self._connect()
+            elif raw.closed or (time.monotonic() - last_used > self.check_after
+                                and not self._is_healthy(raw)):
+                self._close_quietly(raw)
+                with self._cond:
+                    self._stats["health_failures"] += 1
+                raw = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        with self._cond:
+            s = self._stats
+            s["checkouts"]       += 1
+            s["checkout_ms_sum"] += elapsed_ms
+            s["checkout_ms_max"]  = max(s["checkout_ms_max"], elapsed_ms)
+            if waited:
+                s["wait_ms_sum"] += elapsed_ms
+        return PooledConnection(self, raw)
+
+    def putconn(self, raw, discard: bool = False):
+        """Return a raw connection. Open transactions are rolled back first."""
+        if not discard and not raw.closed:
+            try:
+                if raw.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    raw.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if discard or raw.closed or self._closed:
+                self._size -= 1
+                self._stats["discarded"] += 1
+                self._close_quietly(raw)
+            else:
+                self._idle.append((raw, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        """Close every idle connection and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                raw, _ = self._idle.popleft()
+                self._size -= 1
+                self._close_quietly(raw)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """Snapshot of pool counters (latencies in milliseconds)."""
+        with self._cond:
+            s = dict(self._stats)
+            s["size"]   = self._size
+            s["idle"]   = len(self._idle)
+            s["in_use"] = self._size - len(self._idle)
+        n, w = s["checkouts"], s["waits"]
+        checkout_sum, wait_sum = s.pop("checkout_ms_sum"), s.pop("wait_ms_sum")
+        s["checkout_ms_avg"] = round(checkout_sum / n, 3) if n else 0.0
+        s["wait_ms_avg"]     = round(wait_sum / w, 3) if w else 0.0
+        s["checkout_ms_max"] = round(s["checkout_ms_max"], 3)
+        s["hit_rate"]        = round(s["hits"] / n, 4) if n else 0.0
+        return s
+
+    def reset_stats(self):
+        self._stats = {
+            "checkouts":       0,
+            "hits":            0,     # served from an idle connection
+            "misses":          0,     # had to open a new connection
+            "waits":           0,     # pool was exhausted, caller blocked
+            "timeouts":        0,
+            "health_failures": 0,
+            "recycled":        0,     # closed for being idle too long
+            "discarded":       0,     # broken / explicitly discarded
+            "checkout_ms_sum": 0.0,
+            "checkout_ms_max": 0.0,
+            "wait_ms_sum":     0.0,
+        }
+
+    # ── Internals ────────────────────────────────────────────────────────
+
+    def _reap_idle_locked(self, now: float):
+        while (self._idle and self._size > self.minconn
+               and now - self._idle[0][1] > self.max_idle):
+            raw, _ = self._idle.popleft()
+            self._size -= 1
+            self._stats["recycled"] += 1
+            self._close_quietly(raw)
+
+    @staticmethod
+    def _is_healthy(raw) -> bool:
+        try:
+            with raw.cursor() as cur:
+                cur.execute("SELECT 1")
+            raw.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PROCESS-WIDE POOL
+# ─────────────────────────────────────────────────────────────────────────────
+
+_pool      = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the shared pool, creating it from the environment on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    minconn=int(os.environ.get("POSTGRES_POOL_MIN", 1)),
+                    maxconn=int(os.environ.get("POSTGRES_POOL_MAX", 10)),
+                    timeout=float(os.environ.get("POSTGRES_POOL_TIMEOUT", 10)),
+                    max_idle=float(os.environ.get("POSTGRES_POOL_IDLE_SECONDS", 300)),
+                    check_after=float(os.environ.get("POSTGRES_POOL_CHECK_SECONDS", 30)),
+                )
+    return _pool
+
+
+def getconn(timeout: float | None = None) -> PooledConnection:
+    """Borrow a connection from the shared pool. Call .close() to return it."""
+    return get_pool().getconn(timeout)
+
+
+def stats() -> dict:
+    """Counters of the shared pool (hits, waits, checkout latency, ...)."""
+    return get_pool().stats()
+
+
+def closeall():
+    """Close the shared pool (tests / shutdown). A new one is built on next use."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
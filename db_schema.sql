@@ -24,7 +24,19 @@ CREATE TABLE IF NOT EXISTS oe_sessions (
     overall_label VARCHAR(50),
     status VARCHAR(20) DEFAULT 'active' CHECK (status IN ('active','completed','abandoned')),
     started_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-    completed_at TIMESTAMP WITH TIME ZONE
+    completed_at TIMESTAMP WITH TIME ZONE,
+    resume_hash CHAR(64)
+);
+
+-- extract_all_skills() result per normalized resume hash (open_ended_database.py)
+CREATE TABLE IF NOT EXISTS resume_extractions (
+    resume_hash CHAR(64) NOT NULL,
+    extractor VARCHAR(100) NOT NULL,
+    skills_data JSONB NOT NULL,
+    hits INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_used_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (resume_hash, extractor)
 );
 
 CREATE TABLE IF NOT EXISTS oe_session_questions (
@@ -99,6 +111,9 @@ CREATE TABLE IF NOT EXISTS mcq_questions (
     ) STORED,
     response_count INT DEFAULT 0,
     correct_count INT DEFAULT 0,
+    -- set by the offline JMLE job (calibrate.py); live answers then only
+    -- take the online b step instead of the pass-rate log-odds
+    b_calibrated_at TIMESTAMP WITH TIME ZONE,
     is_active BOOLEAN DEFAULT TRUE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -106,6 +121,14 @@ CREATE TABLE IF NOT EXISTS mcq_questions (
 CREATE INDEX IF NOT EXISTS idx_mcq_questions_skill ON mcq_questions(skill);
 CREATE INDEX IF NOT EXISTS idx_mcq_questions_b_param ON mcq_questions(b_param);
 
+-- Bumped whenever a skill's pool is reloaded or recalibrated in bulk;
+-- app servers poll it to invalidate their cached question pools
+CREATE TABLE IF NOT EXISTS mcq_pool_versions (
+    skill VARCHAR(100) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 CREATE TABLE IF NOT EXISTS mcq_responses (
     response_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     session_id UUID NOT NULL,
@@ -143,6 +166,7 @@ CREATE TABLE IF NOT EXISTS mcq_skill_profiles (
 );
 
 CREATE INDEX IF NOT EXISTS idx_mcq_skill_profiles_skill ON mcq_skill_profiles(skill);
+CREATE INDEX IF NOT EXISTS idx_mcq_skill_profiles_skill_theta ON mcq_skill_profiles(skill, theta_final DESC);
 CREATE INDEX IF NOT EXISTS idx_mcq_skill_profiles_theta ON mcq_skill_profiles(theta_final DESC);
 
 -- Final / summary tables
@@ -204,3 +228,58 @@ CREATE INDEX IF NOT EXISTS idx_test_responses_session ON test_responses(session_
 
 CREATE INDEX IF NOT EXISTS idx_final_sessions_oe_session ON final_sessions(oe_session_id);
 CREATE INDEX IF NOT EXISTS idx_final_sessions_mcq_session ON final_sessions(mcq_session_id);
+
+-- Leaderboard summary tables (leaderboard.py) — kept up to date by
+-- complete_session / save_skill_profile / complete_test_session
+CREATE SEQUENCE IF NOT EXISTS lb_arrival_seq;
+
+CREATE TABLE IF NOT EXISTS lb_entries (
+    board VARCHAR(120) NOT NULL,
+    entry_id VARCHAR(120) NOT NULL,
+    score FLOAT NOT NULL,
+    bucket BIGINT NOT NULL,
+    seq BIGINT NOT NULL DEFAULT 0,
+    payload JSONB NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (board, entry_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_lb_entries_order ON lb_entries(board, bucket DESC, score DESC, seq ASC, entry_id ASC);
+
+CREATE TABLE IF NOT EXISTS lb_buckets (
+    board VARCHAR(120) NOT NULL,
+    bucket BIGINT NOT NULL,
+    n BIGINT NOT NULL DEFAULT 0,
+    score_sum FLOAT NOT NULL DEFAULT 0,
+    PRIMARY KEY (board, bucket)
+);
+
+-- Cross-session question bank (question_bank.py) — one row per distinct
+-- generated question, plus per-candidate servings for the exposure limit
+CREATE TABLE IF NOT EXISTS oe_question_bank (
+    question_hash CHAR(32) PRIMARY KEY,
+    skill VARCHAR(100) NOT NULL,
+    skill_key VARCHAR(100) NOT NULL,
+    category VARCHAR(100),
+    difficulty VARCHAR(20) NOT NULL,
+    confidence VARCHAR(20) NOT NULL DEFAULT 'medium',
+    similarity FLOAT,
+    question_text TEXT NOT NULL,
+    model_answer TEXT,
+    hints TEXT[],
+    type VARCHAR(50),
+    b_param FLOAT,
+    times_served INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_served_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_oe_question_bank_cell ON oe_question_bank(skill_key, difficulty, confidence, times_served);
+
+CREATE TABLE IF NOT EXISTS oe_bank_exposure (
+    student_email VARCHAR(200) NOT NULL,
+    question_hash CHAR(32) NOT NULL,
+    n INT NOT NULL DEFAULT 1,
+    last_served_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (student_email, question_hash)
+);
@@ -0,0 +1,235 @@
+"""
+embeddings.py
+Lazy, process-wide sentence embeddings for answer validation.
+
+    emb = embeddings.encode(texts, batch_size=16)   # (n × d), normalized
+
+The model is imported and loaded on the first encode(), once per process.
+Vectors are cached by sha256(text) in an in-memory LRU and, optionally,
+an SQLite store that survives restarts; only texts missing from both are
+encoded, in one batch. Without sentence-transformers (or if the model
+fails to load) encode() returns None and validation is skipped.
+
+CONFIG (environment):
+  EMBED_MODEL        all-MiniLM-L6-v2
+  EMBED_CACHE_SIZE   4096                embeddings kept in memory (0 = off)
+  EMBED_STORE_PATH   ""                  e.g. .embeddings.sqlite3 ("" = no disk store)
+
+Usage:
+  python embeddings.py            # model, cache and store counters
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import importlib.util
+from collections import OrderedDict
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+EMBED_MODEL      = os.environ.get("EMBED_MODEL", "all-MiniLM-L6-v2")
+EMBED_CACHE_SIZE = int(os.environ.get("EMBED_CACHE_SIZE", 4096))
+EMBED_STORE_PATH = os.environ.get("EMBED_STORE_PATH", "")
+
+_ST_INSTALLED = importlib.util.find_spec("sentence_transformers") is not None
+if not _ST_INSTALLED:
+    print("WARNING: sentence-transformers not installed. Confidence validation disabled.")
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """SQLite (WAL) table of float32 vectors keyed by (model, text hash)."""
+
+    def __init__(self, path: str, model: str = EMBED_MODEL):
+        self.path  = path
+        self.model = model
+        self._lock = threading.Lock()
+        self._db   = sqlite3.connect(path, timeout=10, check_same_thread=False,
+                                     isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model      TEXT NOT NULL,
+                key        TEXT NOT NULL,
+                dim        INTEGER NOT NULL,
+                vec        BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (model, key)
+            )
+        """)
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        out = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):                 # SQLite variable limit
+                chunk = keys[i:i + 500]
+                rows  = self._db.execute(
+                    f"SELECT key, vec FROM embeddings WHERE model = ? "
+                    f"AND key IN ({','.join('?' * len(chunk))})", [self.model, *chunk])
+                for key, vec in rows:
+                    out[key] = np.frombuffer(vec, dtype=np.float32)
+        return out
+
+    def put_many(self, items: dict[str, np.ndarray]):
+        now  = time.time()
+        rows = [(self.model, k, int(v.shape[0]), np.asarray(v, dtype=np.float32).tobytes(), now)
+                for k, v in items.items()]
+        with self._lock, self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR IGNORE INTO embeddings "
+                                 "(model, key, dim, vec, created_at) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM embeddings WHERE model = ?",
+                                    (self.model,)).fetchone()[0]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SHARED MODEL + CACHES
+# ─────────────────────────────────────────────────────────────────────────────
+
+_model       = None
+_load_failed = False
+_model_lock  = threading.Lock()
+
+_lru: OrderedDict[str, np.ndarray] = OrderedDict()
+_lru_lock = threading.Lock()
+_store: EmbeddingStore | None = None
+_store_opened = False
+_counts = {"lru_hits": 0, "store_hits": 0, "encoded": 0, "encode_calls": 0}
+
+
+def available() -> bool:
+    """
+    Cheap check: False if sentence-transformers is missing or the model has
+    already failed to load. True does not mean the model will load — call
+    get_model() before spending anything on its results.
+    """
+    return _model is not None or (_ST_INSTALLED and not _load_failed)
+
+
+def get_model():
+    """The process-wide SentenceTransformer, loaded on first use; None if unusable."""
+    global _model, _load_failed
+    if _model is not None or not available():
+        return _model
+    with _model_lock:
+        if _model is None and not _load_failed:
+            try:
+                from sentence_transformers import SentenceTransformer
+                t0     = time.perf_counter()
+                _model = SentenceTransformer(EMBED_MODEL)
+                print(f"[Embeddings] loaded {EMBED_MODEL} in {time.perf_counter() - t0:.1f}s")
+            except Exception as e:
+                print(f"[Embeddings] load error ({EMBED_MODEL}): {e} — validation disabled")
+                _load_failed = True
+    return _model
+
+
+def get_store() -> EmbeddingStore | None:
+    """The on-disk store (opened on first use); None unless EMBED_STORE_PATH is set."""
+    global _store, _store_opened
+    with _model_lock:
+        if not _store_opened:
+            _store_opened = True
+            if EMBED_STORE_PATH:
+                try:
+                    _store = EmbeddingStore(EMBED_STORE_PATH)
+                except Exception as e:
+                    print(f"[Embeddings] store open error ({EMBED_STORE_PATH}): {e}")
+        return _store
+
+
+def encode(texts: list[str], batch_size: int = 64) -> np.ndarray | None:
+    """
+    Normalized embeddings of `texts` (one row each, in order), or None when
+    no encoder is available. Cached rows are reused; the rest are encoded
+    in one batched call and cached.
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    model = get_model()
+    if model is None:
+        return None
+
+    keys  = [text_key(t) for t in texts]
+    found = {}
+    with _lru_lock:
+        for k in keys:
+            if k in _lru:
+                _lru.move_to_end(k)
+                found[k] = _lru[k]
+        _counts["lru_hits"] += sum(k in found for k in keys)
+
+    store   = get_store()
+    missing = [k for k in dict.fromkeys(keys) if k not in found]
+    if missing and store is not None:
+        try:
+            stored = store.get_many(missing)
+        except Exception as e:
+            print(f"[Embeddings] store get error: {e}")
+            stored = {}
+        found.update(stored)
+        _remember(stored)
+        _counts["store_hits"] += sum(k in stored for k in keys)
+        missing = [k for k in missing if k not in stored]
+
+    if missing:
+        text_of = dict(zip(keys, texts))
+        vecs    = model.encode([text_of[k] for k in missing], batch_size=batch_size,
+                               convert_to_numpy=True, normalize_embeddings=True)
+        fresh   = {k: np.asarray(v, dtype=np.float32) for k, v in zip(missing, vecs)}
+        found.update(fresh)
+        _remember(fresh)
+        _counts["encoded"]      += len(missing)
+        _counts["encode_calls"] += 1
+        if store is not None:
+            try:
+                store.put_many(fresh)
+            except Exception as e:
+                print(f"[Embeddings] store put error: {e}")
+
+    return np.stack([found[k] for k in keys])
+
+
+def _remember(items: dict[str, np.ndarray]):
+    if EMBED_CACHE_SIZE <= 0 or not items:
+        return
+    with _lru_lock:
+        for k, v in items.items():
+            _lru[k] = v
+            _lru.move_to_end(k)
+        while len(_lru) > EMBED_CACHE_SIZE:
+            _lru.popitem(last=False)
+
+
+def clear_cache():
+    """Drop the in-memory embeddings (the disk store is kept)."""
+    with _lru_lock:
+        _lru.clear()
+
+
+def stats() -> dict:
+    with _lru_lock:
+        cached = len(_lru)
+    store = _store
+    return {"model": EMBED_MODEL, "loaded": _model is not None, "cached": cached,
+            "stored": store.count() if store is not None else 0, **_counts}
+
+
+if __name__ == "__main__":
+    s = stats()
+    print(f"{s['model']}: {'installed' if _ST_INSTALLED else 'sentence-transformers missing'}")
+    store = get_store()
+    print(f"store: {store.path} · {store.count():,} embeddings" if store is not None
+          else "store: off (set EMBED_STORE_PATH)")
@@ -505,8 +505,9 @@ elif st.session_state.stage == "configure":
                 st.warning("No skills found. Upload a more detailed resume.")
             else:
                 with st.spinner("AI is generating and validating questions…"):
+                    projects = skills_data.get("projects") if include_projects else []
                     resume_text_for_projects = (
-                        st.session_state.resume_text if include_projects else ""
+                        st.session_state.resume_text if projects is None else ""
                     )
                     questions      = []
                     gen_error      = None
@@ -515,6 +516,7 @@ elif st.session_state.stage == "configure":
                             skills_data,
                             questions_per_skill=q_per_level,
                             resume_text=resume_text_for_projects,
+                            projects=projects,
                         )
                     except RuntimeError as e:
                         gen_error = str(e)
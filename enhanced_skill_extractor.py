@@ -38,15 +38,38 @@ OUTPUT:
 
 skill_context is the KEY addition — maps each skill to HOW it was used
 in the project, so question_generator can ask targeted questions.
+
+CACHING:
+  Results are stored in Postgres (resume_extractions) under resume_hash()
+  of the parsed text — case, bullets and whitespace do not matter — plus
+  the model / PROMPT_VERSION. A re-uploaded resume is answered from there
+  without an LLM call; "resume_hash" is added to the result so the
+  session can record which extraction it was built from. The "projects"
+  list is handed straight to QuestionGenerator, so the resume is not sent
+  to the LLM a second time to find projects.
 """
 
 import os
 import re
 import json
+import hashlib
 from groq import Groq
 from dotenv import load_dotenv
+
+import llm_cache
+import open_ended_database as oe_db
+
 load_dotenv()
 
+PROMPT_VERSION = 1     # bump when the extraction prompt / parsing changes
+
+
+def resume_hash(resume_text: str) -> str:
+    """sha256 of the resume text with case, bullet symbols and whitespace normalized."""
+    text = re.sub(r"[•●■►▪→]", " ", resume_text.lower())
+    text = " ".join(text.split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # SKILL TAXONOMY
@@ -180,9 +203,11 @@ class EnhancedSkillExtractor:
     #  PUBLIC: extract_all_skills                                          #
     # ─────────────────────────────────────────────────────────────────── #
 
-    def extract_all_skills(self, resume_text: str) -> dict:
+    def extract_all_skills(self, resume_text: str, use_cache: bool = True) -> dict:
         """
         Extracts skills AND projects from resume using LLaMA.
+        A resume seen before (same resume_hash) is served from
+        resume_extractions; use_cache=False forces a fresh extraction.
 
         Returns:
         {
@@ -200,17 +225,27 @@ class EnhancedSkillExtractor:
                 skill_name: "how this skill was used in this project"
               }
             }
-          ]
+          ],                       # None when extraction fell back to keywords
+          "resume_hash": str
         }
         """
+        key       = resume_hash(resume_text)
+        extractor = f"{self.model}:v{PROMPT_VERSION}"
+        if use_cache:
+            cached = oe_db.get_resume_extraction(key, extractor)
+            if cached:
+                print(f"[SkillExtractor] Cached extraction for resume {key[:12]}.")
+                return {**cached, "resume_hash": key}
         try:
-            raw = self._call_llama(resume_text)
-            return self._parse_response(raw)
+            raw    = self._call_llama(resume_text)
+            result = self._parse_response(raw)
         except Exception as e:
             print(f"[SkillExtractor] LLaMA failed: {e}. Using fallback.")
             result = self._keyword_fallback(resume_text)
-            result["projects"] = []
-            return result
+            result["projects"] = None      # not extracted → callers fall back to _extract_projects
+            return {**result, "resume_hash": key}      # fallback results are not cached
+        oe_db.save_resume_extraction(key, extractor, result)
+        return {**result, "resume_hash": key}
 
     # ─────────────────────────────────────────────────────────────────── #
     #  PRIVATE: LLaMA API call                                             #
@@ -288,7 +323,8 @@ OUTPUT — valid JSON only, no markdown:
   ]
 }}
 """
-        response = self.client.chat.completions.create(
+        return llm_cache.complete(
+            self.client, "skills.extract",
             model=self.model,
             messages=[
                 {
@@ -303,8 +339,8 @@ OUTPUT — valid JSON only, no markdown:
             ],
             temperature=0.1,
             max_tokens=2000,
-        )
-        return response.choices[0].message.content.strip()
+            accept=llm_cache.parses(self._parse_response),
+        ).strip()
 
     # ─────────────────────────────────────────────────────────────────── #
     #  PRIVATE: parse response                                             #
@@ -6,39 +6,18 @@ Tables:
   final_sessions — one row per MCQ or open-ended session summary.
 """
 
-import os
 import psycopg2
 import psycopg2.extras
+import db_pool
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
 def _get_conn():
-    """Get PostgreSQL connection to interview_coach database."""
+    """Borrow a connection from the shared pool (db_pool.py). conn.close() returns it."""
     try:
-        cfg = None
-        try:
-            import streamlit as st
-            cfg = st.secrets.get("postgres", {})
-        except Exception:
-            pass
-
-        if cfg:
-            return psycopg2.connect(
-                host=cfg.get("host", "localhost"),
-                port=cfg.get("port", 5432),
-                dbname=cfg.get("dbname", "interview_coach"),
-                user=cfg.get("user", "postgres"),
-                password=cfg.get("password", ""),
-            )
-        return psycopg2.connect(
-            host=os.environ.get("POSTGRES_HOST", "localhost"),
-            port=int(os.environ.get("POSTGRES_PORT", 5432)),
-            dbname=os.environ.get("POSTGRES_DB", "interview_coach"),
-            user=os.environ.get("POSTGRES_USER", "postgres"),
-            password=os.environ.get("POSTGRES_PASSWORD", ""),
-        )
+        return db_pool.getconn()
     except Exception as e:
         print(f"[FINAL DB] Connection error: {e}")
         return None
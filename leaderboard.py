@@ -0,0 +1,428 @@
+"""
+leaderboard.py
+Incrementally maintained leaderboards for the MCQ and fixed-test modes.
+
+Each board is kept in two summary tables, updated in the SAME
+transaction that completes a session:
+
+  lb_entries  — one row per ranked entry: score, bucket, arrival seq and
+                the display columns (payload JSONB), indexed in rank order
+  lb_buckets  — entry count + score sum per (board, bucket)
+
+A bucket is a slice of the score range (and, for boards that break ties by
+arrival, a block of arrivals), numbered so that a HIGHER bucket always
+ranks ahead. So:
+
+  ✅ my rank   — 1 + Σ counts of the buckets above mine (a few hundred
+                 rows at most) + an index count inside my own bucket
+  ✅ top-K     — index scan in rank order; page N jumps straight to the
+                 right bucket via the bucket counts instead of OFFSET-ing
+                 through every row before it
+  ✅ neighbours— my position, then the same bucket jump as top-K
+  ✅ summary   — count / avg from lb_buckets, max / min from the index ends
+  ✅ upkeep    — record() moves an entry between buckets in O(1) rows
+
+BOARDS (board name = family, or family:suffix for a separate board):
+  mcq_overall  mcq_sessions.theta_overall       equal θ share a rank (RANK())
+  test         test_sessions.total_correct      ties → earlier completion wins
+
+Per-skill rankings are read straight from mcq_skill_profiles
+(mcq_database.get_all_skills_leaderboard).
+
+Existing data is copied in by rebuild() (init_db() does it for boards that
+are still empty):  python leaderboard.py --rebuild
+"""
+
+import math
+import json
+import argparse
+from datetime import datetime
+
+import psycopg2
+import psycopg2.extras
+import db_pool
+
+# family → score quantum (bucket width) and arrival block (0 = ties share a rank)
+BOARDS = {
+    "mcq_overall": {"quantum": 0.01, "block": 0},
+    "test":        {"quantum": 1.0,  "block": 10_000},
+}
+BUCKET_SPAN = 10 ** 9        # arrival blocks per score bucket (bucket = score_b * SPAN - block)
+
+# Source rows for rebuild(): (board, entry_id, score, order_key, payload)
+_SOURCES = {
+    "mcq_overall": """
+        SELECT 'mcq_overall', session_id::text, theta_overall, completed_at,
+               jsonb_build_object(
+                   'session_id', session_id::text, 'student_name', student_name,
+                   'student_email', student_email, 'theta_overall', theta_overall,
+                   'proficiency_label', proficiency_label,
+                   'proficiency_score', proficiency_score,
+                   'total_answered', total_answered, 'total_correct', total_correct,
+                   'completed_at', completed_at)
+        FROM mcq_sessions
+        WHERE status = 'completed' AND theta_overall IS NOT NULL
+    """,
+    "test": """
+        SELECT 'test', session_id::text, total_correct, completed_at,
+               jsonb_build_object(
+                   'session_id', session_id::text, 'student_name', student_name,
+                   'total_correct', total_correct, 'total_score', total_score,
+                   'completed_at', completed_at)
+        FROM test_sessions
+        WHERE status = 'completed'
+    """,
+}
+
+
+def _get_conn():
+    """Borrow a connection from the shared pool (db_pool.py). conn.close() returns it."""
+    try:
+        return db_pool.getconn()
+    except Exception as e:
+        print(f"[Leaderboard] Connection error: {e}")
+        return None
+
+
+def _config(board: str) -> dict:
+    return BOARDS[board.split(":", 1)[0]]
+
+
+def bucket_of(board: str, score: float, seq: int = 0) -> int:
+    """Bucket number of an entry — higher bucket ranks ahead."""
+    cfg = _config(board)
+    b   = math.floor(score / cfg["quantum"]) * BUCKET_SPAN
+    return b - (seq // cfg["block"] if cfg["block"] else 0)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SCHEMA + BACKFILL
+# ─────────────────────────────────────────────────────────────────────────────
+
+def init_db() -> bool:
+    """Create the summary tables if missing and rebuild boards that are still empty."""
+    conn = _get_conn()
+    if not conn:
+        return False
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE SEQUENCE IF NOT EXISTS lb_arrival_seq;
+
+                    CREATE TABLE IF NOT EXISTS lb_entries (
+                        board      VARCHAR(120) NOT NULL,
+                        entry_id   VARCHAR(120) NOT NULL,
+                        score      FLOAT NOT NULL,
+                        bucket     BIGINT NOT NULL,
+                        seq        BIGINT NOT NULL DEFAULT 0,
+                        payload    JSONB NOT NULL DEFAULT '{}',
+                        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                        PRIMARY KEY (board, entry_id)
+                    );
+
+                    CREATE INDEX IF NOT EXISTS idx_lb_entries_order
+                        ON lb_entries(board, bucket DESC, score DESC, seq ASC, entry_id ASC);
+
+                    CREATE TABLE IF NOT EXISTS lb_buckets (
+                        board     VARCHAR(120) NOT NULL,
+                        bucket    BIGINT NOT NULL,
+                        n         BIGINT NOT NULL DEFAULT 0,
+                        score_sum FLOAT NOT NULL DEFAULT 0,
+                        PRIMARY KEY (board, bucket)
+                    );
+                """)
+                cur.execute("SELECT DISTINCT split_part(board, ':', 1) FROM lb_buckets")
+                filled = {r[0] for r in cur.fetchall()}
+        empty = [f for f in BOARDS if f not in filled]
+        if empty:
+            rebuild(empty)
+        return True
+    except Exception as e:
+        print(f"[Leaderboard] init_db error: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+def rebuild(families=None) -> dict[str, int]:
+    """
+    Recompute boards from their source tables (all families, or the given
+    ones) in one transaction. Returns {board: entries}.
+    """
+    families = list(families or BOARDS)
+    conn = _get_conn()
+    if not conn:
+        return {}
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                for fam in families:
+                    cfg = BOARDS[fam]
+                    cur.execute("DELETE FROM lb_entries WHERE split_part(board, ':', 1) = %s", (fam,))
+                    cur.execute("DELETE FROM lb_buckets WHERE split_part(board, ':', 1) = %s", (fam,))
+                    # arrival seq follows completion order, like live record() calls
+                    cur.execute(f"""
+                        INSERT INTO lb_entries (board, entry_id, score, bucket, seq, payload)
+                        SELECT board, entry_id, score,
+                               FLOOR(score / %(q)s)::bigint * %(span)s
+                                   - CASE WHEN %(block)s > 0 THEN seq / %(block)s ELSE 0 END,
+                               seq, payload
+                        FROM (
+                            SELECT src.*, CASE WHEN %(block)s > 0
+                                               THEN nextval('lb_arrival_seq') ELSE 0 END AS seq
+                            FROM (SELECT * FROM ({_SOURCES[fam]}) s0
+                                  ORDER BY 4 NULLS LAST) AS src(board, entry_id, score,
+                                                                order_key, payload)
+                        ) ranked
+                    """, {"q": cfg["quantum"], "span": BUCKET_SPAN, "block": cfg["block"]})
+                    cur.execute("""
+                        INSERT INTO lb_buckets (board, bucket, n, score_sum)
+                        SELECT board, bucket, COUNT(*), SUM(score)
+                        FROM lb_entries WHERE split_part(board, ':', 1) = %s
+                        GROUP BY board, bucket
+                    """, (fam,))
+                cur.execute("""
+                    SELECT board, SUM(n) FROM lb_buckets
+                    WHERE split_part(board, ':', 1) = ANY(%s) GROUP BY board
+                """, (families,))
+                return {board: int(n) for board, n in cur.fetchall()}
+    except Exception as e:
+        print(f"[Leaderboard] rebuild error: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# INCREMENTAL UPKEEP (runs inside the caller's transaction)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _json_default(o):
+    """Timestamps as ISO 8601 — the same text jsonb_build_object() gives rebuild()."""
+    return o.isoformat() if isinstance(o, datetime) else str(o)
+
+
+def record(cur, board: str, entry_id: str, score: float, payload: dict):
+    """
+    Insert or move one entry. Call with the cursor of the transaction that
+    completes the session, so the board commits (or rolls back) with it.
+    An entry keeps its arrival seq when its score changes.
+    """
+    cfg = _config(board)
+    cur.execute("""
+        SELECT bucket, score, seq FROM lb_entries
+        WHERE board = %s AND entry_id = %s FOR UPDATE
+    """, (board, entry_id))
+    old = cur.fetchone()
+    if old:
+        seq = old[2]
+    elif cfg["block"]:
+        cur.execute("SELECT nextval('lb_arrival_seq')")
+        seq = cur.fetchone()[0]
+    else:
+        seq = 0
+    bucket = bucket_of(board, score, seq)
+    cur.execute("""
+        INSERT INTO lb_entries (board, entry_id, score, bucket, seq, payload)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON CONFLICT (board, entry_id) DO UPDATE SET
+            score = EXCLUDED.score, bucket = EXCLUDED.bucket,
+            payload = EXCLUDED.payload, updated_at = NOW()
+    """, (board, entry_id, score, bucket, seq,
+          psycopg2.extras.Json(payload, dumps=lambda o: json.dumps(o, default=_json_default))))
+    if old:
+        cur.execute("""
+            UPDATE lb_buckets SET n = n - 1, score_sum = score_sum - %s
+            WHERE board = %s AND bucket = %s
+        """, (old[1], board, old[0]))
+    cur.execute("""
+        INSERT INTO lb_buckets (board, bucket, n, score_sum) VALUES (%s, %s, 1, %s)
+        ON CONFLICT (board, bucket) DO UPDATE SET
+            n         = lb_buckets.n + 1,
+            score_sum = lb_buckets.score_sum + EXCLUDED.score_sum
+    """, (board, bucket, score))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# READS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _rank(cur, board: str, bucket: int, score: float, seq: int,
+          entry_id: str | None = None) -> int:
+    """
+    1 + entries ranked strictly ahead of (score, seq). With entry_id, equal
+    (score, seq) entries with a smaller id count as ahead too — i.e. the
+    entry's 1-based position in top()'s order rather than its rank.
+    """
+    with cur.connection.cursor() as c:
+        c.execute("""
+            SELECT 1
+                 + (SELECT COALESCE(SUM(n), 0) FROM lb_buckets
+                    WHERE board = %(board)s AND bucket > %(bucket)s)
+                 + (SELECT COUNT(*) FROM lb_entries
+                    WHERE board = %(board)s AND bucket = %(bucket)s
+                      AND (score > %(score)s
+                           OR (score = %(score)s AND seq < %(seq)s)
+                           OR (score = %(score)s AND seq = %(seq)s
+                               AND entry_id < %(entry_id)s)))
+        """, {"board": board, "bucket": bucket, "score": score, "seq": seq,
+              "entry_id": entry_id})
+        return int(c.fetchone()[0])
+
+
+def _row(r: dict, rank: int) -> dict:
+    out = dict(r["payload"])
+    if isinstance(out.get("completed_at"), str):            # back to a datetime
+        try:
+            out["completed_at"] = datetime.fromisoformat(out["completed_at"])
+        except ValueError:
+            pass
+    out.update(rank=rank, score=r["score"])
+    return out
+
+
+def top(board: str, limit: int | None = 10, offset: int = 0) -> list[dict]:
+    """
+    Entries [offset, offset+limit) in rank order (limit None = to the end).
+    Each row is the payload plus "rank" and "score".
+    """
+    conn = _get_conn()
+    if not conn:
+        return []
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            start, skip = None, offset
+            if offset:
+                # first bucket whose running count passes offset (one row back)
+                cur.execute("""
+                    SELECT bucket, %(offset)s - (seen - n) AS skip FROM (
+                        SELECT bucket, n, SUM(n) OVER (ORDER BY bucket DESC) AS seen
+                        FROM lb_buckets WHERE board = %(board)s AND n > 0
+                    ) b
+                    WHERE seen > %(offset)s
+                    ORDER BY bucket DESC LIMIT 1
+                """, {"board": board, "offset": offset})
+                b = cur.fetchone()
+                if not b:
+                    return []
+                start, skip = b["bucket"], int(b["skip"])
+            cur.execute("""
+                SELECT score, bucket, seq, payload FROM lb_entries
+                WHERE board = %(board)s
+                  AND (%(start)s::bigint IS NULL OR bucket <= %(start)s)
+                ORDER BY bucket DESC, score DESC, seq ASC, entry_id ASC
+                OFFSET %(skip)s LIMIT %(limit)s
+            """, {"board": board, "start": start, "skip": skip, "limit": limit})
+            rows = cur.fetchall()
+            if not rows:
+                return []
+            shared = not _config(board)["block"]
+            rank   = (1 if not offset else
+                      _rank(cur, board, rows[0]["bucket"], rows[0]["score"], rows[0]["seq"]))
+            out = [_row(rows[0], rank)]
+            for i, r in enumerate(rows[1:], start=1):
+                if not (shared and r["score"] == rows[i - 1]["score"]):
+                    rank = offset + i + 1
+                out.append(_row(r, rank))
+            return out
+    except Exception as e:
+        print(f"[Leaderboard] top error: {e}")
+        return []
+    finally:
+        conn.close()
+
+
+def rank_of(board: str, entry_id: str) -> dict | None:
+    """One entry's payload plus "rank", "score" and "total" (board size), or None."""
+    conn = _get_conn()
+    if not conn:
+        return None
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("""
+                SELECT score, bucket, seq, payload FROM lb_entries
+                WHERE board = %s AND entry_id = %s
+            """, (board, str(entry_id)))
+            r = cur.fetchone()
+            if not r:
+                return None
+            row = _row(r, _rank(cur, board, r["bucket"], r["score"], r["seq"]))
+            cur.execute("SELECT COALESCE(SUM(n), 0) AS total FROM lb_buckets WHERE board = %s",
+                        (board,))
+            row["total"] = int(cur.fetchone()["total"])
+            return row
+    except Exception as e:
+        print(f"[Leaderboard] rank_of error: {e}")
+        return None
+    finally:
+        conn.close()
+
+
+def neighbours(board: str, entry_id: str, k: int = 2) -> list[dict]:
+    """
+    The entry plus up to k entries either side of it, in rank order (same
+    rows / ranks as the matching slice of top()). [] when not on the board.
+    """
+    conn = _get_conn()
+    if not conn:
+        return []
+    try:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("""
+                SELECT score, bucket, seq FROM lb_entries
+                WHERE board = %s AND entry_id = %s
+            """, (board, str(entry_id)))
+            r = cur.fetchone()
+            if not r:
+                return []
+            pos = _rank(cur, board, r["bucket"], r["score"], r["seq"], str(entry_id))
+    except Exception as e:
+        print(f"[Leaderboard] neighbours error: {e}")
+        return []
+    finally:
+        conn.close()
+    start = max(0, pos - 1 - k)
+    return top(board, pos + k - start, start)
+
+
+def summary(board: str) -> dict:
+    """{"count", "avg", "max", "min"} of a board's scores (None when empty)."""
+    result = {"count": 0, "avg": None, "max": None, "min": None}
+    conn = _get_conn()
+    if not conn:
+        return result
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT COALESCE(SUM(n), 0), SUM(score_sum) FROM lb_buckets WHERE board = %s
+            """, (board,))
+            n, total = cur.fetchone()
+            if not n:
+                return result
+            cur.execute("""
+                SELECT (SELECT score FROM lb_entries WHERE board = %(b)s
+                        ORDER BY bucket DESC, score DESC, seq ASC LIMIT 1),
+                       (SELECT score FROM lb_entries WHERE board = %(b)s
+                        ORDER BY bucket ASC, score ASC, seq DESC LIMIT 1)
+            """, {"b": board})
+            hi, lo = cur.fetchone()
+            result.update(count=int(n), avg=total / int(n), max=hi, min=lo)
+            return result
+    except Exception as e:
+        print(f"[Leaderboard] summary error: {e}")
+        return result
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Leaderboard summary tables.")
+    parser.add_argument("--rebuild", nargs="*", metavar="FAMILY",
+                        help=f"rebuild boards from source tables ({', '.join(BOARDS)}; default all)")
+    args = parser.parse_args()
+    if args.rebuild is not None:
+        for board, n in sorted(rebuild(args.rebuild or None).items()):
+            print(f"{board:<40} {n:>10,} entries")
+    else:
+        print("init:", "ok" if init_db() else "failed")
@@ -0,0 +1,275 @@
+"""
+llm_cache.py
+Content-addressed disk cache for Groq chat completions, shared by every
+LLM call site:
+
+    text = llm_cache.complete(client, "answer.evaluate",
+                              model=..., messages=[...],
+                              temperature=0.2, max_tokens=600)
+
+The key is sha256 of (model, messages, temperature, max_tokens). Calls at
+temperature <= MAX_TEMPERATURE are cached, hotter ones only for sites in
+LLM_CACHE_OPT_IN; accept(text) can keep an unusable reply out. One SQLite
+file (WAL) serves every thread and process, least-recently-used rows are
+evicted above MAX_ENTRIES / MAX_MB, and a cache error falls through to the
+network.
+
+Call sites:
+  qgen.cot              question_generator._call_llm_cot       (0.7, opt-in)
+  qgen.validate         question_generator._validator_answer
+  qgen.extract_projects question_generator._extract_projects
+  skills.extract        EnhancedSkillExtractor._call_llama
+  answer.evaluate       AnswerEvaluator.evaluate_answer
+  mcq_practice.generate mcq_practice_llm._generate_for_domain  (0.7, opt-in)
+
+CONFIG (environment):
+  LLM_CACHE_ENABLED          1                   0 = every call goes to the network
+  LLM_CACHE_PATH             .llm_cache.sqlite3
+  LLM_CACHE_MAX_ENTRIES      20000
+  LLM_CACHE_MAX_MB           200
+  LLM_CACHE_MAX_TEMPERATURE  0.3                 hotter calls need an opt-in
+  LLM_CACHE_OPT_IN           ""                  comma-separated site names
+
+Usage:
+  python llm_cache.py            # entries, size, hit counts per site
+  python llm_cache.py --clear
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LLM_CACHE_ENABLED         = os.environ.get("LLM_CACHE_ENABLED", "1") != "0"
+LLM_CACHE_PATH            = os.environ.get("LLM_CACHE_PATH", ".llm_cache.sqlite3")
+LLM_CACHE_MAX_ENTRIES     = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 20000))
+LLM_CACHE_MAX_MB          = float(os.environ.get("LLM_CACHE_MAX_MB", 200))
+LLM_CACHE_MAX_TEMPERATURE = float(os.environ.get("LLM_CACHE_MAX_TEMPERATURE", 0.3))
+LLM_CACHE_OPT_IN          = {s.strip() for s in os.environ.get("LLM_CACHE_OPT_IN", "").split(",")
+                             if s.strip()}
+
+
+def cache_key(model: str, messages: list[dict], temperature: float, max_tokens: int) -> str:
+    """sha256 over a canonical JSON of everything that shapes the completion."""
+    payload = json.dumps({"model": model, "messages": messages,
+                          "temperature": round(float(temperature), 4),
+                          "max_tokens": int(max_tokens)},
+                         sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed completion store with LRU eviction and per-site counters."""
+
+    def __init__(self, path: str = LLM_CACHE_PATH,
+                 max_entries: int = LLM_CACHE_MAX_ENTRIES,
+                 max_mb: float = LLM_CACHE_MAX_MB,
+                 max_temperature: float = LLM_CACHE_MAX_TEMPERATURE,
+                 opt_in: set | None = None):
+        self.path            = path
+        self.max_entries     = max_entries
+        self.max_bytes       = int(max_mb * 1024 * 1024)
+        self.max_temperature = max_temperature
+        self.opt_in          = set(LLM_CACHE_OPT_IN if opt_in is None else opt_in)
+        self._lock  = threading.Lock()
+        self._sites: dict[str, dict] = {}
+        self._db    = sqlite3.connect(path, timeout=10, check_same_thread=False,
+                                      isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS completions (
+                key        TEXT PRIMARY KEY,
+                site       TEXT NOT NULL,
+                model      TEXT NOT NULL,
+                text       TEXT NOT NULL,
+                size       INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                used_at    REAL NOT NULL,
+                hits       INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_completions_used ON completions(used_at)")
+        self._rows, self._bytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+
+    # ── policy ───────────────────────────────────────────────────────────
+    def cacheable(self, site: str, temperature: float) -> bool:
+        return temperature <= self.max_temperature or site in self.opt_in
+
+    # ── lookup / store ───────────────────────────────────────────────────
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._db.execute("SELECT text FROM completions WHERE key = ?",
+                                   (key,)).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE completions SET used_at = ?, hits = hits + 1 "
+                                 "WHERE key = ?", (time.time(), key))
+        return row[0] if row else None
+
+    def put(self, key: str, site: str, model: str, text: str):
+        size = len(text.encode("utf-8"))
+        now  = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM completions WHERE key = ?",
+                                   (key,)).fetchone()
+            self._db.execute("""
+                INSERT OR REPLACE INTO completions
+                    (key, site, model, text, size, created_at, used_at, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            """, (key, site, model, text, size, now, now))
+            self._rows  += 0 if old else 1
+            self._bytes += size - (old[0] if old else 0)
+            if self._rows > self.max_entries or self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least-recently-used rows down to 90% of both limits (lock held)."""
+        # counts can drift when several processes share the file — resync first
+        self._rows, self._bytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        keep_rows  = int(self.max_entries * 0.9)
+        keep_bytes = int(self.max_bytes * 0.9)
+        if self._rows <= keep_rows and self._bytes <= keep_bytes:
+            return
+        drop, rows, freed = [], self._rows, 0
+        for key, size in self._db.execute(
+                "SELECT key, size FROM completions ORDER BY used_at ASC"):
+            if rows <= keep_rows and self._bytes - freed <= keep_bytes:
+                break
+            drop.append((key,))
+            rows, freed = rows - 1, freed + size
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany("DELETE FROM completions WHERE key = ?", drop)
+        self._rows, self._bytes = rows, self._bytes - freed
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM completions")
+            self._rows = self._bytes = 0
+            self._sites.clear()
+
+    # ── stats ────────────────────────────────────────────────────────────
+    def count(self, site: str, outcome: str):
+        with self._lock:
+            s = self._sites.setdefault(site, {"hits": 0, "misses": 0, "bypassed": 0})
+            s[outcome] += 1
+
+    def stats(self) -> dict:
+        """Per-site counters since start, overall hit rate, rows / bytes on disk."""
+        with self._lock:
+            sites = {k: dict(v) for k, v in self._sites.items()}
+            rows, size = self._rows, self._bytes
+        hits   = sum(s["hits"] for s in sites.values())
+        misses = sum(s["misses"] for s in sites.values())
+        for s in sites.values():
+            n = s["hits"] + s["misses"]
+            s["hit_rate"] = round(s["hits"] / n, 4) if n else 0.0
+        return {"entries": rows, "bytes": size, "hits": hits, "misses": misses,
+                "bypassed": sum(s["bypassed"] for s in sites.values()),
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                "sites": sites}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SHARED CACHE + CALL WRAPPER
+# ─────────────────────────────────────────────────────────────────────────────
+
+_cache: LLMCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> LLMCache | None:
+    """The process-wide cache (opened on first use); None when disabled or unusable."""
+    global _cache, LLM_CACHE_ENABLED
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = LLMCache()
+            except Exception as e:
+                print(f"[LLMCache] open error ({LLM_CACHE_PATH}): {e} — caching disabled")
+                LLM_CACHE_ENABLED = False
+        return _cache
+
+
+def complete(client, site: str, *, model: str, messages: list[dict],
+             temperature: float, max_tokens: int, accept=None) -> str:
+    """
+    client.chat.completions.create(...) → message content, served from the
+    cache when this site / temperature is cacheable. `accept(text)` returning
+    False keeps an unusable reply out of the cache. API errors propagate
+    exactly as before.
+    """
+    cache = get_cache()
+    if cache is None or not cache.cacheable(site, temperature):
+        if cache is not None:
+            cache.count(site, "bypassed")
+        return _create(client, model, messages, temperature, max_tokens)
+
+    key = cache_key(model, messages, temperature, max_tokens)
+    try:
+        text = cache.get(key)
+    except Exception as e:
+        print(f"[LLMCache] get error: {e}")
+        text = None
+    if text is not None:
+        cache.count(site, "hits")
+        return text
+
+    cache.count(site, "misses")
+    text = _create(client, model, messages, temperature, max_tokens)
+    if accept is None or accept(text):
+        try:
+            cache.put(key, site, model, text)
+        except Exception as e:
+            print(f"[LLMCache] put error: {e}")
+    return text
+
+
+def parses(parse):
+    """accept= hook: cache the reply only if parse(text) does not raise."""
+    def accept(text: str) -> bool:
+        try:
+            parse(text)
+            return True
+        except Exception:
+            return False
+    return accept
+
+
+def _create(client, model, messages, temperature, max_tokens) -> str:
+    resp = client.chat.completions.create(model=model, messages=messages,
+                                          temperature=temperature, max_tokens=max_tokens)
+    return resp.choices[0].message.content or ""
+
+
+def stats() -> dict:
+    """Counters of the shared cache ({} when caching is off)."""
+    cache = get_cache()
+    return cache.stats() if cache is not None else {}
+
+
+if __name__ == "__main__":
+    cache = get_cache()
+    if cache is None:
+        print("LLM cache disabled (LLM_CACHE_ENABLED=0)")
+        sys.exit(1)
+    if "--clear" in sys.argv:
+        cache.clear()
+        print(f"cleared {cache.path}")
+        sys.exit(0)
+    print(f"{cache.path}: {cache._rows:,} entries · {cache._bytes / 1024 / 1024:.1f} MB")
+    for site, n, hits, size in cache._db.execute(
+            "SELECT site, COUNT(*), SUM(hits), SUM(size) FROM completions "
+            "GROUP BY site ORDER BY site"):
+        print(f"  {site:<24} {n:>7,} entries · {hits:>7,} hits · {size / 1024:>9.1f} KB")
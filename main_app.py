@@ -23,6 +23,9 @@ from question_generator import QuestionGenerator
 from answer_evaluator import AnswerEvaluator, LIKERT_SCALE
 import mcq_irt.rasch_engine as irt
 
+IRT_ESTIMATOR  = os.environ.get("IRT_ESTIMATOR", "step")   # step | mle | eap
+STOP_SE_TARGET = float(os.environ.get("STOP_SE_TARGET", 0.6))
+
 # ── LLM MCQ Practice import ───────────────────────────────────────────────────
 import mcq_practice_llm as pllm
 
@@ -32,6 +35,8 @@ import test_database as test_db
 # ── Database imports (unified interview_coach DB) ─────────────────────────────
 import open_ended_database as oe_db
 import final_database as final_db
+import write_behind
+import question_bank
 
 # ─────────────────────────────────────────────────────────────────────────────
 # PAGE CONFIG  (must be first Streamlit call)
@@ -49,6 +54,8 @@ st.set_page_config(
 # ─────────────────────────────────────────────────────────────────────────────
 
 TEST_DATA_PATH = "test_data.json"
+TEST_LB_TOP    = 10      # leaderboard rows shown above "your" window
+TEST_LB_AROUND = 2       # rows either side of the current student
 
 def _test_auto_setup():
     test_db.init_db()
@@ -243,7 +250,24 @@ section[data-testid="stSidebar"] .stButton button {
 
 @st.cache_resource
 def load_interview_tools():
-    return EnhancedSkillExtractor(), ResumeParser(), QuestionGenerator(), AnswerEvaluator()
+    oe_db.init_db()
+    bank = question_bank.QuestionBank() if question_bank.QBANK_ENABLED else None
+    return EnhancedSkillExtractor(), ResumeParser(), QuestionGenerator(bank), AnswerEvaluator()
+
+@st.cache_resource
+def get_answer_writer():
+    """One write-behind queue per server process (None → synchronous writes)."""
+    if not write_behind.WRITE_BEHIND_ENABLED:
+        return None
+    return write_behind.WriteBehindQueue({
+        "oe_response":   oe_db.save_oe_responses_batch,
+        "test_response": test_db.save_test_responses_batch,
+    }, name="main_answers")
+
+def flush_answers():
+    writer = get_answer_writer()
+    if writer is not None:
+        writer.flush()
 
 # ─────────────────────────────────────────────────────────────────────────────
 # SESSION STATE DEFAULTS
@@ -266,11 +290,19 @@ _interview_defaults = {
     "last_uploaded_file": None,
     "current_q_irt":      None,
     "current_cat_irt":    None,
+    "question_stream":    None,
 }
 for k, v in _interview_defaults.items():
     if k not in st.session_state:
         st.session_state[k] = v
 
+def reset_interview():
+    stream = st.session_state.get("question_stream")
+    if stream is not None:
+        stream.cancel()          # stop paying for questions nobody will see
+    for k, v in _interview_defaults.items():
+        st.session_state[k] = v
+
 # ── Shared profile defaults ───────────────────────────────────────────────────
 if "student_name"  not in st.session_state: st.session_state.student_name  = ""
 if "student_email" not in st.session_state: st.session_state.student_email = ""
@@ -347,6 +379,42 @@ def interview_progress_bar(current, total):
         <div class="progress-bar-fill" style="width:{pct}%"></div>
     </div>""", unsafe_allow_html=True)
 
+def add_interview_questions(new_qs: list[dict]):
+    """
+    Add generated questions to the live pool: the flat list, the per-category
+    pools (new categories get a tracker) and the open-ended session rows.
+    Called with the first batch and then with every later QuestionStream poll.
+    """
+    ss = st.session_state
+    for q in new_qs:
+        if not q.get("question_id"):
+            q["question_id"] = f"q_{q.get('id', abs(hash(q.get('question', ''))))}"
+        if "b_param" not in q:
+            q["b_param"] = 0.0
+        cat = q.get("category", "Other")
+        ss.questions.append(q)
+        ss.cat_pool.setdefault(cat, []).append(q)
+        if cat not in ss.category_trackers:
+            ss.category_trackers[cat] = irt.CategoryTracker(
+                cat, IRT_ESTIMATOR, stopping=ss.get("irt_stopping"),
+                max_items=ss.answers_per_skill)
+    if ss.get("oe_session_id") and new_qs:
+        try:
+            stored_questions = oe_db.store_oe_questions(ss.oe_session_id, new_qs)
+            ss.oe_question_map.update({
+                item["question_id"]: item["session_question_id"]
+                for item in stored_questions
+                if item.get("question_id")
+            })
+        except Exception as e:
+            print(f"[OE DB] store questions failed: {e}")
+
+def drain_question_stream():
+    """Pick up questions the background generator finished since the last rerun."""
+    stream = st.session_state.get("question_stream")
+    if stream is not None:
+        add_interview_questions(stream.poll())
+
 def require_profile() -> bool:
     if not st.session_state.student_name or not st.session_state.student_email:
         st.warning("Please enter your name and email in the sidebar before continuing.")
@@ -464,8 +532,7 @@ with st.sidebar:
             </div>""", unsafe_allow_html=True)
 
         if st.button("↺  Start Over", use_container_width=True):
-            for k, v in _interview_defaults.items():
-                st.session_state[k] = v
+            reset_interview()
             st.rerun()
 
     elif st.session_state.app_mode == "mcq":
@@ -610,6 +677,10 @@ if mode == "interview":
             help="IRT adaptively picks from a pool of 15 questions per skill.")
         include_projects = st.checkbox(
             "🗂️  Include project-based questions", value=True)
+        early_stop = st.checkbox(
+            "⏱️  Finish a skill early once its IRT estimate has settled", value=True,
+            help=f"Moves on when SE(θ) ≤ {STOP_SE_TARGET} or θ stops changing "
+                 "(at least 4 answers per skill). Saves answers and AI evaluations.")
 
         pool_size = total_skills * 15
         estimated = total_skills * answers_per_skill
@@ -619,7 +690,7 @@ if mode == "interview":
                     padding:12px 18px;margin:1rem 0;display:flex;align-items:center;gap:10px">
             <span style="font-size:1.2rem">📋</span>
             <span style="font-size:0.9rem;color:#3730a3">
-                <b>Pool: {pool_size} questions generated</b> · <b>Student answers: {estimated}</b> (IRT adaptive){proj_note}
+                <b>Pool: {pool_size} questions generated</b> · <b>Student answers: {"up to " if early_stop else ""}{estimated}</b> (IRT adaptive){proj_note}
             </span>
         </div>""", unsafe_allow_html=True)
 
@@ -632,36 +703,35 @@ if mode == "interview":
                 if total_skills == 0:
                     st.warning("No skills found. Upload a more detailed resume.")
                 else:
-                    with st.spinner("AI is generating and validating questions…"):
+                    with st.spinner("AI is preparing your first question…"):
+                        # Projects come from the skill extraction; the resume is only
+                        # sent again if that result has no project list at all
+                        projects = skills_data.get("projects") if include_projects else []
                         resume_text_for_projects = (
-                            st.session_state.resume_text if include_projects else "")
-                        questions  = []
+                            st.session_state.resume_text if projects is None else "")
+                        stream     = None
                         gen_error  = None
                         try:
-                            questions = question_gen.generate_questions(
+                            # The pool keeps filling in the background; start as soon
+                            # as the first category has its (medium) question
+                            stream = question_gen.stream_questions(
                                 skills_data, questions_per_skill=q_per_level,
-                                resume_text=resume_text_for_projects)
+                                resume_text=resume_text_for_projects,
+                                candidate=st.session_state.student_email,
+                                projects=projects)
+                            stream.wait(stream.categories[0] if stream.categories else None)
+                            if stream.error is not None:
+                                raise stream.error
                         except RuntimeError as e:
                             gen_error = str(e)
                         except Exception as e:
                             gen_error = f"Unexpected error: {e}"
+                        first_qs = stream.poll() if stream is not None and not gen_error else []
 
                     if gen_error:
                         st.error(f"❌ Question generation failed:\n\n{gen_error}")
-                    elif questions:
-                        for q in questions:
-                            if not q.get("question_id"):
-                                q["question_id"] = f"q_{q.get('id', abs(hash(q.get('question', ''))))}"
-                            if "b_param" not in q:
-                                q["b_param"] = 0.0
-
-                        cat_pool = {}
-                        for q in questions:
-                            cat = q.get("category", "Other")
-                            cat_pool.setdefault(cat, []).append(q)
-
-                        oe_session_id   = None
-                        oe_question_map = {}
+                    elif first_qs:
+                        oe_session_id = None
                         try:
                             skills_tested = [
                                 skill["name"]
@@ -672,31 +742,33 @@ if mode == "interview":
                                 st.session_state.student_name,
                                 st.session_state.student_email,
                                 skills_tested,
-                                mode="open_ended"
+                                mode="open_ended",
+                                resume_hash=skills_data.get("resume_hash"),
                             )
-                            if oe_session_id:
-                                stored_questions = oe_db.store_oe_questions(oe_session_id, questions)
-                                oe_question_map  = {
-                                    item["question_id"]: item["session_question_id"]
-                                    for item in stored_questions
-                                    if item.get("question_id")
-                                }
                         except Exception as e:
                             st.warning(f"⚠️ Open-ended session persistence failed: {e}")
 
-                        st.session_state.questions          = questions
+                        st.session_state.questions          = []
                         st.session_state.q_index            = 0
                         st.session_state.answers            = {}
                         st.session_state.evaluations        = {}
-                        st.session_state.cat_pool           = cat_pool
-                        st.session_state.category_thetas    = {cat: irt.THETA_INIT for cat in cat_pool}
-                        st.session_state.category_asked     = {cat: set() for cat in cat_pool}
-                        st.session_state.category_responses = {cat: [] for cat in cat_pool}
+                        st.session_state.cat_pool           = {cat: [] for cat in stream.categories}
+                        st.session_state.irt_stopping       = (
+                            irt.StoppingRule(se_target=STOP_SE_TARGET, min_items=4,
+                                             plateau_delta=0.05)
+                            if early_stop else None)
                         st.session_state.answers_per_skill  = answers_per_skill
-                        st.session_state.stage              = "interview"
+                        st.session_state.category_trackers  = {
+                            cat: irt.CategoryTracker(cat, IRT_ESTIMATOR,
+                                                     stopping=st.session_state.irt_stopping,
+                                                     max_items=answers_per_skill)
+                            for cat in stream.categories}
                         st.session_state.oe_session_id      = oe_session_id
-                        st.session_state.oe_question_map    = oe_question_map
+                        st.session_state.oe_question_map    = {}
                         st.session_state.oe_completed       = False
+                        st.session_state.question_stream    = stream
+                        add_interview_questions(first_qs)
+                        st.session_state.stage              = "interview"
                         st.rerun()
                     else:
                         st.error("❌ No questions were generated.")
@@ -704,12 +776,14 @@ if mode == "interview":
 
     # ── STAGE 3: INTERVIEW ────────────────────────────────────────────────────
     elif st.session_state.stage == "interview":
+        drain_question_stream()
+        stream            = st.session_state.get("question_stream")
+        generating        = stream is not None and not stream.done
         questions         = st.session_state.questions
         q_index           = st.session_state.q_index
         answers_per_skill = st.session_state.get("answers_per_skill", 9)
         cat_pool          = st.session_state.get("cat_pool", {})
-        cat_thetas        = st.session_state.get("category_thetas", {})
-        cat_asked         = st.session_state.get("category_asked", {})
+        cat_trackers      = st.session_state.get("category_trackers", {})
         total             = len(cat_pool) * answers_per_skill
 
         if not questions:
@@ -734,14 +808,17 @@ if mode == "interview":
             q           = stored_q
             current_cat = stored_cat
         else:
-            q = None
+            q, starved = None, False   # starved: a category is unfinished but out of questions
             for offset in range(n_cats):
                 try_cat = cats_list[(answered_count + offset) % n_cats]
+                tracker   = cat_trackers.get(try_cat)
                 if cat_answer_counts.get(try_cat, 0) >= answers_per_skill:
                     continue
+                if tracker is not None and tracker.done:
+                    continue        # SE target / plateau reached — no more evaluations
                 pool      = cat_pool.get(try_cat, [])
-                theta     = cat_thetas.get(try_cat, 0.0)
-                asked_ids = cat_asked.get(try_cat, set())
+                theta     = tracker.theta if tracker else 0.0
+                asked_ids = tracker.asked_ids if tracker else set()
                 selected  = irt.select_question(pool, theta, asked_ids, None)
                 if selected:
                     q           = selected
@@ -749,8 +826,16 @@ if mode == "interview":
                     st.session_state.current_q_irt   = q
                     st.session_state.current_cat_irt = current_cat
                     break
+                starved = True
 
         if q is None:
+            if generating and starved:
+                # Unfinished categories are waiting on questions still being generated
+                with st.spinner("Generating more questions…"):
+                    stream.wait(timeout=30)
+                st.rerun()
+            if stream is not None:
+                stream.cancel()          # nothing left to ask — stop generating
             st.session_state.stage = "results"; st.rerun()
 
         st.markdown("""
@@ -761,6 +846,9 @@ if mode == "interview":
 
         st.markdown('<div class="content-card">', unsafe_allow_html=True)
         interview_progress_bar(answered_count, total)
+        if generating:
+            st.caption(f"⏳ {len(questions)} questions ready · "
+                       f"the rest of the pool is still being generated")
 
         dc, dc_bg, dc_border = diff_badge(q.get("difficulty","medium"))
         type_icon = {"conceptual":"💡","practical":"🔧","scenario":"🎬","project":"🗂️"}.get(q.get("type",""),"❓")
@@ -828,7 +916,7 @@ if mode == "interview":
                             if session_question_id:
                                 confidence = int(result.get("likert", 0))
                                 feedback   = result.get("detailed_feedback", "")
-                                oe_db.save_oe_response(
+                                oe_row = dict(
                                     session_id=oe_session_id,
                                     session_question_id=session_question_id,
                                     skill=q.get("skill", ""),
@@ -838,6 +926,11 @@ if mode == "interview":
                                     feedback=feedback,
                                     evaluator_model="groq"
                                 )
+                                writer = get_answer_writer()
+                                if writer is not None:
+                                    writer.submit("oe_response", oe_row)
+                                else:
+                                    oe_db.save_oe_response(**oe_row)
                     except Exception as e:
                         print(f"[OE DB] save response failed: {e}")
 
@@ -846,26 +939,17 @@ if mode == "interview":
                     score        = result.get("total_score", 0)
                     frac_correct = score / 100.0
 
-                    if cat in st.session_state.get("category_thetas", {}):
-                        theta_before = st.session_state.category_thetas[cat]
-                        p_pred       = irt.p_correct(theta_before, b_param)
-                        surprise     = frac_correct - p_pred
-                        theta_after  = float(max(irt.THETA_MIN, min(irt.THETA_MAX,
-                                            theta_before + irt.ALPHA * surprise)))
-                        st.session_state.category_thetas[cat] = theta_after
-                        st.session_state.category_responses[cat].append({
-                            "theta_before": theta_before, "b_used": b_param,
-                            "frac_correct": frac_correct, "surprise": surprise,
-                            "theta_after":  theta_after})
-                        st.session_state.category_asked[cat].add(q_uid)
+                    tracker = st.session_state.get("category_trackers", {}).get(cat)
+                    if tracker is not None:
+                        upd = tracker.record(q_uid, b_param, frac_correct)
                         result["irt"] = {
-                            "theta_before":  round(theta_before, 3),
-                            "theta_after":   round(theta_after, 3),
+                            "theta_before":  round(upd["theta_before"], 3),
+                            "theta_after":   round(upd["theta_after"], 3),
                             "b_param":       b_param,
-                            "p_correct_irt": round(p_pred, 3),
-                            "surprise":      round(surprise, 3),
-                            "proficiency":   irt.theta_to_proficiency(theta_after),
-                            "se":            irt.se_theta(st.session_state.category_responses[cat]),
+                            "p_correct_irt": round(upd["p_pred"], 3),
+                            "surprise":      round(upd["surprise"], 3),
+                            "proficiency":   irt.theta_to_proficiency(upd["theta_after"]),
+                            "se":            upd["se"],
                         }
                         st.session_state.evaluations[q_uid] = result
 
@@ -969,6 +1053,8 @@ if mode == "interview":
 
     # ── STAGE 4: RESULTS ──────────────────────────────────────────────────────
     elif st.session_state.stage == "results":
+        if st.session_state.get("question_stream") is not None:
+            st.session_state.question_stream.cancel()   # no more questions needed
         questions   = st.session_state.questions
         evaluations = st.session_state.evaluations
 
@@ -987,6 +1073,7 @@ if mode == "interview":
                 answered      = len(evaluations)
                 avg           = summary["average_score"]
                 grade         = summary["overall_grade"]
+                flush_answers()
                 oe_db.update_oe_session_stats(
                     session_id=oe_session_id,
                     total_questions=total,
@@ -1053,8 +1140,8 @@ if mode == "interview":
                 </div>""", unsafe_allow_html=True)
 
         st.write("")
-        cat_thetas    = st.session_state.get("category_thetas", {})
-        cat_responses = st.session_state.get("category_responses", {})
+        cat_trackers  = st.session_state.get("category_trackers", {})
+        cat_thetas    = {cat: t.theta for cat, t in cat_trackers.items()}
         if cat_thetas:
             st.markdown('<div class="content-card">', unsafe_allow_html=True)
             st.markdown('<div class="section-label">🧠 Skill Proficiency (IRT)</div>', unsafe_allow_html=True)
@@ -1076,9 +1163,9 @@ if mode == "interview":
             prof_cols = st.columns(min(len(cat_thetas), 4))
             for col, (cat, theta) in zip(prof_cols, cat_thetas.items()):
                 prof      = irt.theta_to_proficiency(theta)
-                responses = cat_responses.get(cat, [])
-                se        = irt.se_theta(responses)
-                n_ans     = len(responses)
+                tracker   = cat_trackers[cat]
+                se        = tracker.theta_se
+                n_ans     = len(tracker.responses)
                 color     = prof["color"]
                 with col:
                     st.markdown(f"""
@@ -1180,8 +1267,7 @@ if mode == "interview":
 
         st.write("")
         if st.button("↺  Start a New Interview", type="primary", use_container_width=True):
-            for k, v in _interview_defaults.items():
-                st.session_state[k] = v
+            reset_interview()
             st.rerun()
 
 
@@ -1317,16 +1403,22 @@ elif mode == "test":
                 "question_text": q["question_text"],
                 "options":     option_map,
             }
-            test_db.save_test_response(
+            test_row = dict(
                 session_id=st.session_state.test_session_id,
                 question_id=q["question_id"],
                 skill=q["skill"],
                 selected_option=choice,
                 is_correct=is_correct,
             )
+            writer = get_answer_writer()
+            if writer is not None:
+                writer.submit("test_response", test_row)
+            else:
+                test_db.save_test_response(**test_row)
             if is_last:
                 answers       = st.session_state.test_answers
                 total_correct = sum(1 for a in answers.values() if a["is_correct"])
+                flush_answers()
                 test_db.complete_test_session(
                     session_id=st.session_state.test_session_id,
                     total_correct=total_correct,
@@ -1430,24 +1522,23 @@ elif mode == "test":
         if st.button("🔄 Refresh", use_container_width=True):
             st.rerun()
 
-        lb          = test_db.get_test_leaderboard()
+        summary     = test_db.get_test_summary()
         current_sid = str(st.session_state.test_session_id or "")
 
-        if not lb:
+        if not summary["count"]:
             st.info("No completed tests yet.")
             st.stop()
 
-        scores = [r["total_correct"] for r in lb]
+        lb      = test_db.get_test_leaderboard(TEST_LB_TOP)
+        my_rank = test_db.get_test_rank(current_sid) if current_sid else None
         c1, c2 = st.columns(2)
-        c1.metric("👥 Students", len(lb))
-        c2.metric("🥇 Top score", f"{max(scores)}/10")
+        c1.metric("👥 Students", summary["count"])
+        c2.metric("🥇 Top score", f"{int(summary['max'])}/10")
 
         MEDALS  = {1: "🥇", 2: "🥈", 3: "🥉"}
         ROW_CLS = {1: "gold", 2: "silver", 3: "bronze"}
 
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="section-label">Rankings</div>', unsafe_allow_html=True)
-        for r in lb:
+        def _test_lb_row(r):
             rank      = int(r["rank"])
             medal     = MEDALS.get(rank, "")
             row_cls   = ROW_CLS.get(rank, "")
@@ -1475,6 +1566,23 @@ elif mode == "test":
                     <div style="font-size:0.75rem;color:#94a3b8;margin-top:2px">{pct}%</div>
                 </div>
             </div>""", unsafe_allow_html=True)
+
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown('<div class="section-label">Rankings</div>', unsafe_allow_html=True)
+        if my_rank:
+            st.markdown(f"**Your rank: #{my_rank['rank']} of {my_rank['total']}** "
+                        f"· {int(my_rank['total_correct'])}/10 correct")
+        for r in lb:
+            _test_lb_row(r)
+        # Below the top rows: only a small window around the current student
+        if my_rank and my_rank["rank"] > TEST_LB_TOP:
+            around = [r for r in test_db.get_test_neighbours(current_sid, TEST_LB_AROUND)
+                      if r["rank"] > TEST_LB_TOP]
+            if around and around[0]["rank"] > TEST_LB_TOP + 1:
+                st.markdown('<div style="text-align:center;color:#94a3b8">⋯</div>',
+                            unsafe_allow_html=True)
+            for r in around:
+                _test_lb_row(r)
         st.markdown('</div>', unsafe_allow_html=True)
 
         if st.button("← Back to Results", use_container_width=True):
@@ -0,0 +1,287 @@
+"""
+calibrate.py
+Offline joint-maximum-likelihood (JMLE) calibration of b_param over the
+whole mcq_responses table.
+
+calibrate_b() looks at one item's pass rate and update_b_online() nudges b
+per answer — neither accounts for WHO answered. A hard item answered mostly
+by strong candidates looks easy to both. JMLE fits item difficulties and
+person abilities together, so each item's b is judged against the θ of the
+people who actually saw it.
+
+HOW IT WORKS:
+  ✅ streaming      — rows come through a server-side cursor
+                      (mcq_database.iter_response_chunks), fetch_size at a time
+  ✅ compact matrix — the sparse person × item matrix is kept as three
+                      parallel columns (person idx int32, item idx int32,
+                      correct int8) = 9 bytes per response; persons are
+                      (session_id, skill) pairs and are numbered as they
+                      stream past, so no per-person dict is kept
+  ✅ vectorized     — every Newton step is np.bincount over those columns
+                      (the sparse mat-vec), no Python loop over responses
+  ✅ extremes       — persons / items with all-right or all-wrong answers
+                      (infinite MLE) and items under CALIB_MIN_RESPONSES are
+                      pruned repeatedly; their b is left as it is
+  ✅ anchoring      — per skill, the mean of the calibrated b's is held at
+                      its current value, so θ's already on the leaderboard
+                      stay on the same scale
+  ✅ JMLE bias      — (L-1)/L correction of the b spread, L = mean items
+                      answered per person (Wright & Douglas)
+  ✅ write-back     — one UPDATE ... FROM (VALUES ...) in one transaction;
+                      the rows are marked (b_calibrated_at) so live answers
+                      only nudge them instead of re-deriving b from pass rate
+
+USAGE (from inside mcq_irt/, like mcq_app.py):
+  python calibrate.py --dry-run
+  python calibrate.py --skill Python --max-iter 200
+"""
+
+import argparse
+import time
+from array import array
+
+import numpy as np
+
+try:
+    from . import rasch_engine as irt
+except ImportError:               # run as a script from inside mcq_irt/
+    import rasch_engine as irt
+
+PERSON_THETA_LIMIT = 6.0          # |θ| cap during estimation (wider than THETA_MAX)
+MAX_STEP           = 1.0          # Newton step cap per iteration (logits)
+
+
+# ── Response matrix ──────────────────────────────────────────────────────────
+
+class ResponseMatrix:
+    """
+    Sparse person × item response matrix, built incrementally from
+    (session_id, skill, question_id, is_correct) rows.
+
+    Rows MUST arrive grouped by (session_id, skill) — the streaming query
+    orders them that way — so a new person index is opened whenever the
+    key changes and only the last key is remembered.
+    """
+
+    def __init__(self):
+        self.person  = array("i")
+        self.item    = array("i")
+        self.correct = array("b")
+        self.item_ids:    list[str]      = []
+        self.item_skills: list[str]      = []
+        self._item_index: dict[str, int] = {}
+        self._last_key   = None
+        self.n_persons   = 0
+
+    def __len__(self) -> int:
+        return len(self.correct)
+
+    @property
+    def n_items(self) -> int:
+        return len(self.item_ids)
+
+    def add_rows(self, rows) -> None:
+        item_index = self._item_index
+        for session_id, skill, question_id, is_correct in rows:
+            key = (session_id, skill)
+            if key != self._last_key:
+                self._last_key   = key
+                self.n_persons  += 1
+            j = item_index.get(question_id)
+            if j is None:
+                j = item_index[question_id] = len(self.item_ids)
+                self.item_ids.append(question_id)
+                self.item_skills.append(skill)
+            self.person.append(self.n_persons - 1)
+            self.item.append(j)
+            self.correct.append(1 if is_correct else 0)
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(person, item, correct) as NumPy views — no copy."""
+        return (np.frombuffer(self.person, dtype=np.int32),
+                np.frombuffer(self.item, dtype=np.int32),
+                np.frombuffer(self.correct, dtype=np.int8))
+
+
+# ── JMLE ─────────────────────────────────────────────────────────────────────
+
+def _prune_extremes(person, item, y, n_persons, n_items, min_responses):
+    """Mask of responses left after repeatedly dropping extreme persons / items."""
+    keep = np.ones(len(y), dtype=bool)
+    while True:
+        p, i, yk = person[keep], item[keep], y[keep]
+        n_p = np.bincount(p, minlength=n_persons)
+        s_p = np.bincount(p, weights=yk, minlength=n_persons)
+        n_i = np.bincount(i, minlength=n_items)
+        s_i = np.bincount(i, weights=yk, minlength=n_items)
+        bad_p = (s_p == 0) | (s_p == n_p)
+        bad_i = (n_i < min_responses) | (s_i == 0) | (s_i == n_i)
+        new_keep = keep & ~bad_p[person] & ~bad_i[item]
+        if new_keep.sum() == keep.sum():
+            return keep
+        keep = new_keep
+
+
+def jmle(matrix: ResponseMatrix, b_init: np.ndarray,
+         max_iter: int = 100, tol: float = 1e-3,
+         min_responses: int | None = None) -> dict:
+    """
+    Joint maximum-likelihood estimates of b (and θ) for every item in matrix.
+
+    b_init: current b per item (matrix.item_ids order) — starting point,
+            per-skill anchor, and the value kept for items that cannot be
+            calibrated.
+    Returns:
+      {"b": ndarray, "calibrated": bool ndarray, "theta": ndarray,
+       "iterations": int, "converged": bool, "max_change": float,
+       "n_responses": int, "n_used": int, "n_persons": int, "n_items": int}
+    """
+    if min_responses is None:
+        min_responses = irt.CALIB_MIN_RESPONSES
+    person, item, y = matrix.arrays()
+    n_persons, n_items = matrix.n_persons, matrix.n_items
+    b_init = np.asarray(b_init, dtype=float)
+
+    keep = _prune_extremes(person, item, y, n_persons, n_items, min_responses)
+    p, i, yk = person[keep], item[keep], y[keep].astype(float)
+    calibrated = np.bincount(i, minlength=n_items) > 0
+    active_p   = np.bincount(p, minlength=n_persons) > 0
+
+    skills, skill_of = np.unique(np.asarray(matrix.item_skills, dtype=object),
+                                 return_inverse=True)
+    skill_of = skill_of.astype(np.int64)
+    n_skill  = np.bincount(skill_of, weights=calibrated, minlength=len(skills))
+
+    s_p   = np.bincount(p, weights=yk, minlength=n_persons)
+    s_i   = np.bincount(i, weights=yk, minlength=n_items)
+    b     = b_init.copy()
+    theta = np.zeros(n_persons)
+    # start persons at the log-odds of their raw score, items at b_init
+    n_p = np.bincount(p, minlength=n_persons)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        theta[active_p] = np.log(s_p[active_p] / (n_p[active_p] - s_p[active_p]))
+
+    converged, change, it = False, 0.0, 0
+    for it in range(1, max_iter + 1):
+        prob = 1.0 / (1.0 + np.exp(-(theta[p] - b[i])))
+        info = np.bincount(p, weights=prob * (1.0 - prob), minlength=n_persons)
+        step = np.zeros(n_persons)
+        step[active_p] = (s_p - np.bincount(p, weights=prob, minlength=n_persons))[active_p] \
+                         / info[active_p]
+        theta = np.clip(theta + np.clip(step, -MAX_STEP, MAX_STEP),
+                        -PERSON_THETA_LIMIT, PERSON_THETA_LIMIT)
+
+        prob = 1.0 / (1.0 + np.exp(-(theta[p] - b[i])))
+        info = np.bincount(i, weights=prob * (1.0 - prob), minlength=n_items)
+        db   = np.zeros(n_items)
+        db[calibrated] = (np.bincount(i, weights=prob, minlength=n_items) - s_i)[calibrated] \
+                         / info[calibrated]
+        b_new = b + np.clip(db, -MAX_STEP, MAX_STEP)
+        # hold each skill's mean calibrated b at its current value
+        drift = np.bincount(skill_of, weights=np.where(calibrated, b_new - b_init, 0.0),
+                            minlength=len(skills))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drift = np.where(n_skill > 0, drift / n_skill, 0.0)
+        b_new = np.where(calibrated, b_new - drift[skill_of], b_init)
+
+        change = float(np.max(np.abs(b_new - b))) if n_items else 0.0
+        b = b_new
+        if change < tol:
+            converged = True
+            break
+
+    # JMLE over-spreads b by roughly L/(L-1); shrink around each skill's anchor
+    L = float(len(yk) / active_p.sum()) if active_p.any() else 0.0
+    if L > 1.0:
+        anchor = np.bincount(skill_of, weights=np.where(calibrated, b, 0.0),
+                             minlength=len(skills))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            anchor = np.where(n_skill > 0, anchor / n_skill, 0.0)[skill_of]
+        b = np.where(calibrated, anchor + (b - anchor) * (L - 1.0) / L, b)
+
+    b = np.where(calibrated, np.clip(b, irt.B_MIN, irt.B_MAX), b_init)
+    return {
+        "b":           b,
+        "calibrated":  calibrated,
+        "theta":       theta,
+        "iterations":  it,
+        "converged":   converged,
+        "max_change":  change,
+        "n_responses": len(y),
+        "n_used":      int(keep.sum()),
+        "n_persons":   n_persons,
+        "n_items":     n_items,
+    }
+
+
+# ── DB job ───────────────────────────────────────────────────────────────────
+
+def run_calibration(skill: str | None = None, fetch_size: int = 50_000,
+                    max_iter: int = 100, tol: float = 1e-3,
+                    min_responses: int | None = None, dry_run: bool = False) -> dict:
+    """
+    Stream mcq_responses, fit JMLE, write calibrated b's back in one
+    statement (unless dry_run). Returns jmle()'s dict plus
+    {"changes": [(question_id, b_old, b_new)], "updated": int,
+     "error": str, "load_s": float, "fit_s": float}
+    """
+    try:
+        from . import mcq_database as db
+    except ImportError:
+        import mcq_database as db
+
+    t0 = time.perf_counter()
+    matrix = ResponseMatrix()
+    for rows in db.iter_response_chunks(skill, fetch_size):
+        matrix.add_rows(rows)
+    current = db.get_b_params(skill)
+    t1 = time.perf_counter()
+
+    # responses to questions no longer in mcq_questions start at 0 and are not written
+    b_init = np.array([current.get(qid, 0.0) for qid in matrix.item_ids], dtype=float)
+    res = jmle(matrix, b_init, max_iter, tol, min_responses)
+    t2 = time.perf_counter()
+
+    changes = [(qid, float(b_init[j]), round(float(res["b"][j]), 4))
+               for j, qid in enumerate(matrix.item_ids)
+               if res["calibrated"][j] and qid in current]
+    res.update(changes=changes, updated=0, error="",
+               load_s=round(t1 - t0, 3), fit_s=round(t2 - t1, 3))
+    if not dry_run:
+        res["updated"], res["error"] = db.update_b_params_bulk(
+            {qid: b_new for qid, _, b_new in changes})
+    return res
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JMLE calibration of mcq_questions.b_param.")
+    parser.add_argument("--skill",         default=None, help="calibrate one skill only")
+    parser.add_argument("--fetch-size",    type=int,   default=50_000)
+    parser.add_argument("--max-iter",      type=int,   default=100)
+    parser.add_argument("--tol",           type=float, default=1e-3)
+    parser.add_argument("--min-responses", type=int,   default=None,
+                        help=f"default {irt.CALIB_MIN_RESPONSES}")
+    parser.add_argument("--dry-run",       action="store_true", help="fit and report, write nothing")
+    parser.add_argument("--show",          type=int,   default=10, help="largest b shifts to print")
+    args = parser.parse_args(argv)
+
+    res = run_calibration(args.skill, args.fetch_size, args.max_iter, args.tol,
+                          args.min_responses, args.dry_run)
+    print(f"responses {res['n_responses']:,} (used {res['n_used']:,}) · "
+          f"persons {res['n_persons']:,} · items {res['n_items']:,} · "
+          f"load {res['load_s']}s · fit {res['fit_s']}s")
+    print(f"JMLE {'converged' if res['converged'] else 'did NOT converge'} after "
+          f"{res['iterations']} iterations (max Δb {res['max_change']:.2e}); "
+          f"{len(res['changes'])} items calibrated")
+    for qid, old, new in sorted(res["changes"], key=lambda c: -abs(c[2] - c[1]))[:args.show]:
+        print(f"  {qid:<20} b {old:+.3f} → {new:+.3f}")
+    if res["error"]:
+        print(f"[MCQ DB] calibration write-back error: {res['error']}")
+    elif args.dry_run:
+        print("dry run — nothing written")
+    else:
+        print(f"b_param updated for {res['updated']} questions")
+
+
+if __name__ == "__main__":
+    main()
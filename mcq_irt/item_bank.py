@@ -0,0 +1,276 @@
+"""
+item_bank.py
+NumPy-backed item bank for the Rasch engine.
+
+select_question() in rasch_engine.py filters the pool into a new list and
+calls min() with a lambda (and one random.uniform) per item — O(n) Python
+work for every question served. ItemPool keeps one skill's items as
+parallel NumPy arrays SORTED BY b, so:
+
+  ✅ select()       — nearest-b item found by searchsorted + a short walk
+                      over the asked-mask; random tie-breaking only touches
+                      the handful of items within 1e-4 of the best distance
+  ✅ p_correct()    — P(correct | θ) for the whole pool in one vector op
+  ✅ fisher_info()  — I(θ, b) = P(1-P) for the whole pool in one vector op
+  ✅ asked masks    — one bool array per student instead of set lookups
+  ✅ refreshed()    — a new, re-sorted snapshot with fresh b / counts from DB
+                      write-backs; the old one is never modified (LiveBanks
+                      swaps the new one into every live bank of the process)
+
+Selection rule is identical to select_question():
+  - first question / last CORRECT → b closest to θ
+  - last WRONG → closest among b <= θ, falling back to any item
+  - distance + U(0, 1e-4) noise, so near-equal items are not always
+    served in the same order
+
+USAGE:
+    bank = ItemBank({sk: db.get_questions_for_skill(sk) for sk in skills})
+    pool = bank[skill]
+    mask = pool.new_mask()                 # True = still available
+    q    = pool.select(theta, mask, last_correct)
+    pool.mark_asked(mask, q["question_id"])
+
+This is the only nearest-b search: rasch_engine.SortedBIndex is an
+ItemPool plus one student's mask, and SkillSession.next_question() serves
+list pools and ItemPools through it.
+
+Benchmark: python -m benchmarks.bench_item_bank
+"""
+
+import threading
+import weakref
+
+import numpy as np
+
+TIE_NOISE = 1e-4          # same noise width as select_question()
+TIERS     = ("easy", "medium", "hard")
+_SCAN     = 64            # first chunk when walking the mask for a free item
+
+
+class ItemPool:
+    """One skill's questions as parallel arrays, sorted by b_param."""
+
+    def __init__(self, questions: list[dict], rng: np.random.Generator | None = None):
+        b     = np.fromiter((q["b_param"] for q in questions),
+                            dtype=np.float64, count=len(questions))
+        order = np.argsort(b, kind="stable")
+        self.questions = [questions[i] for i in order]
+        self.b     = b[order]
+        self.ids   = np.array([q["question_id"] for q in self.questions], dtype=object)
+        self.tiers = np.fromiter(
+            (TIERS.index(q.get("difficulty_tier", "medium"))
+             if q.get("difficulty_tier", "medium") in TIERS else 1
+             for q in self.questions),
+            dtype=np.int8, count=len(self.questions))
+        self.index = {qid: i for i, qid in enumerate(self.ids)}
+        self.rng   = rng or np.random.default_rng()
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    # ── Masks ────────────────────────────────────────────────────────────
+
+    def new_mask(self, asked_ids=()) -> np.ndarray:
+        """Availability mask (True = not asked yet)."""
+        mask = np.ones(len(self.questions), dtype=bool)
+        for qid in asked_ids:
+            i = self.index.get(qid)
+            if i is not None:
+                mask[i] = False
+        return mask
+
+    def mark_asked(self, mask: np.ndarray, question_id: str):
+        i = self.index.get(question_id)
+        if i is not None:
+            mask[i] = False
+
+    def freeze(self):
+        """Make the selection arrays read-only — the pool is a shared snapshot."""
+        for arr in (self.b, self.ids, self.tiers):
+            arr.flags.writeable = False
+
+    # ── Live updates ─────────────────────────────────────────────────────
+
+    def refreshed(self, updates: dict) -> "ItemPool | None":
+        """
+        A new snapshot with fresh DB values {question_id: (b_param,
+        response_count, correct_count)} applied and re-sorted by b, or None
+        if none of this pool's questions is in updates.
+
+        This pool is not touched: it may be shared (pool_cache.py), and a
+        session holding it keeps selecting and scoring on the same b until
+        it is handed the new snapshot (SkillSession then rebuilds its mask
+        from asked_ids). Unchanged question dicts are shared by both.
+        """
+        if not any(qid in self.index for qid in updates):
+            return None
+        fresh = []
+        for q in self.questions:
+            u = updates.get(q["question_id"])
+            fresh.append(q if u is None else
+                         {**q, "b_param": u[0], "response_count": u[1], "correct_count": u[2]})
+        pool = ItemPool(fresh, self.rng)
+        if not self.b.flags.writeable:
+            pool.freeze()
+        return pool
+
+    # ── Vectorized IRT ───────────────────────────────────────────────────
+
+    def p_correct(self, theta: float) -> np.ndarray:
+        """Rasch P(correct) for every item at ability θ."""
+        p = self.b - theta                  # one temporary, then in-place
+        np.exp(p, out=p)
+        p += 1.0
+        return np.reciprocal(p, out=p)
+
+    def fisher_info(self, theta: float) -> np.ndarray:
+        """Fisher information P(1-P) for every item at ability θ."""
+        p = self.p_correct(theta)
+        return np.multiply(p, 1.0 - p, out=p)
+
+    # ── Selection ────────────────────────────────────────────────────────
+
+    def select(self, theta: float, mask: np.ndarray, last_correct=None) -> dict | None:
+        """Next question for a student (same rule as select_question())."""
+        i = self.select_index(theta, mask, last_correct)
+        return None if i is None else self.questions[i]
+
+    def select_index(self, theta: float, mask: np.ndarray, last_correct=None) -> int | None:
+        n = len(self.b)
+        if n == 0:
+            return None
+        theta = float(theta)
+
+        if last_correct is False:
+            # step-down: only items with b <= θ, i.e. indices [0, split)
+            split = int(np.searchsorted(self.b, theta, side="right"))
+            i = self._nearest(theta, mask, 0, split)
+            if i is not None:
+                return i
+        return self._nearest(theta, mask, 0, n)
+
+    def _nearest(self, theta: float, mask: np.ndarray, lo: int, hi: int) -> int | None:
+        """Index in [lo, hi) minimising |b - θ| + noise among available items."""
+        if hi <= lo:
+            return None
+        pos   = min(max(int(np.searchsorted(self.b, theta)), lo), hi)
+        left  = self._free_left(mask, lo, pos)
+        right = self._free_right(mask, pos, hi)
+        if left is None and right is None:
+            return None
+
+        best = min(abs(self.b[i] - theta) for i in (left, right) if i is not None)
+        # Only items within TIE_NOISE of the best distance can win once noise is added
+        w_lo = max(lo, int(np.searchsorted(self.b, theta - best - TIE_NOISE, side="left")))
+        w_hi = min(hi, int(np.searchsorted(self.b, theta + best + TIE_NOISE, side="right")))
+        cand = w_lo + np.flatnonzero(mask[w_lo:w_hi])
+        if len(cand) == 1:
+            return int(cand[0])
+        score = np.abs(self.b[cand] - theta) + self.rng.uniform(0.0, TIE_NOISE, len(cand))
+        return int(cand[np.argmin(score)])
+
+    @staticmethod
+    def _free_left(mask: np.ndarray, lo: int, pos: int) -> int | None:
+        """Largest available index in [lo, pos), scanning in doubling chunks."""
+        end, step = pos, _SCAN
+        while end > lo:
+            start = max(lo, end - step)
+            hits  = np.flatnonzero(mask[start:end])
+            if len(hits):
+                return start + int(hits[-1])
+            end, step = start, step * 2
+        return None
+
+    @staticmethod
+    def _free_right(mask: np.ndarray, pos: int, hi: int) -> int | None:
+        """Smallest available index in [pos, hi), scanning in doubling chunks."""
+        start, step = pos, _SCAN
+        while start < hi:
+            end  = min(hi, start + step)
+            hits = np.flatnonzero(mask[start:end])
+            if len(hits):
+                return start + int(hits[0])
+            start, step = end, step * 2
+        return None
+
+
+class ItemBank:
+    """skill → ItemPool."""
+
+    def __init__(self, pools: dict, rng: np.random.Generator | None = None):
+        self.pools = {
+            sk: p if isinstance(p, ItemPool) else ItemPool(p, rng)
+            for sk, p in pools.items()
+        }
+
+    @classmethod
+    def from_questions(cls, questions: list[dict], rng=None) -> "ItemBank":
+        by_skill: dict[str, list] = {}
+        for q in questions:
+            by_skill.setdefault(q["skill"], []).append(q)
+        return cls(by_skill, rng)
+
+    def __getitem__(self, skill: str) -> ItemPool:
+        return self.pools[skill]
+
+    def __contains__(self, skill: str) -> bool:
+        return skill in self.pools
+
+    @property
+    def skills(self) -> list[str]:
+        return list(self.pools)
+
+    def sizes(self) -> dict[str, int]:
+        return {sk: len(p) for sk, p in self.pools.items()}
+
+    def refresh(self, updates: dict, replaced: dict | None = None) -> int:
+        """
+        Swap in ItemPool.refreshed() for every pool the updates touch.
+        replaced (id(old pool) → (old, new or None)) is shared between banks
+        so a snapshot they share is rebuilt once. Returns pools swapped.
+        """
+        replaced = {} if replaced is None else replaced
+        n = 0
+        for sk, pool in list(self.pools.items()):
+            if id(pool) not in replaced:
+                replaced[id(pool)] = (pool, pool.refreshed(updates))
+            new = replaced[id(pool)][1]
+            if new is not None:
+                self.pools[sk] = new
+                n += 1
+        return n
+
+
+class LiveBanks:
+    """
+    Every ItemBank currently in use on this server (held weakly — a bank
+    disappears with the session that loaded it). Register refresh() with
+    mcq_database.add_b_listener() and each committed b write-back swaps a
+    refreshed snapshot into all live banks, and into cache (a PoolCache)
+    so sessions started later get it too.
+    """
+
+    def __init__(self, cache=None):
+        self._banks = weakref.WeakSet()
+        self._lock  = threading.Lock()
+        self._cache = cache
+
+    def add(self, bank: ItemBank):
+        with self._lock:
+            self._banks.add(bank)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._banks)
+
+    def refresh(self, updates: dict) -> int:
+        """Returns how many distinct snapshots were replaced."""
+        with self._lock:
+            banks = list(self._banks)
+            # banks share pool snapshots (pool_cache.py) — rebuild each one once
+            replaced: dict = {}
+            for bank in banks:
+                bank.refresh(updates, replaced)
+            if self._cache is not None:
+                self._cache.refresh(updates, replaced)
+        return sum(new is not None for _, new in replaced.values())
@@ -25,9 +25,19 @@ load_dotenv()
 
 import rasch_engine as irt
 import mcq_database as db
+from item_bank import ItemPool, LiveBanks
+from pool_cache import PoolCache
+import write_behind            # importable once mcq_database has set up the path
 
 QUESTIONS_PER_SKILL = 15
+LB_PAGE_SIZE        = 25      # overall leaderboard rows per page
+LB_SKILL_TOP_K      = 10      # rows per skill tab
+LB_AROUND           = 2       # results page: rows either side of "you"
 MCQ_DATA_PATH       = "mcq_data.json"
+IRT_ESTIMATOR       = os.environ.get("IRT_ESTIMATOR", "step")   # step | mle | eap
+STOP_SE_TARGET      = float(os.environ.get("STOP_SE_TARGET", 0.6))
+STOP_MIN_ITEMS      = 7
+STOP_PLATEAU_DELTA  = 0.05    # |Δθ| below this for 3 answers in a row → settled
 
 
 def auto_setup():
@@ -49,6 +59,30 @@ def auto_setup():
 
 auto_setup()
 
+
+@st.cache_resource
+def get_answer_writer():
+    """One write-behind queue per server process (None → synchronous writes)."""
+    if not write_behind.WRITE_BEHIND_ENABLED:
+        return None
+    return write_behind.WriteBehindQueue(
+        {"mcq_answer": db.record_answers_batch}, name="mcq_answers")
+
+
+@st.cache_resource
+def get_pool_cache() -> PoolCache:
+    """Per-skill ItemPool snapshots shared by every session on this server."""
+    return PoolCache(lambda skill: ItemPool(db.get_questions_for_skill(skill)),
+                     db.get_pool_versions)
+
+
+@st.cache_resource
+def get_live_banks() -> LiveBanks:
+    """Item banks of every session on this server; DB b write-backs refresh them all."""
+    live = LiveBanks(get_pool_cache())
+    db.add_b_listener(live.refresh)
+    return live
+
 # ─────────────────────────────────────────────────────────────────────────────
 # PAGE CONFIG + CSS
 # ─────────────────────────────────────────────────────────────────────────────
@@ -148,7 +182,7 @@ DEFAULTS = {
     "student_email":   "",
     "session_id":      None,
     "skills":          [],           # list of skill names to test
-    "skill_pools":     {},           # { skill: [question dicts] }
+    "skill_pools":     {},           # ItemBank — { skill: ItemPool }
     "skill_index":     0,            # which skill we're on (0-4)
     "skill_thetas":    {},           # { skill: current θ }
     "skill_responses": {},           # { skill: [response dicts] }
@@ -158,6 +192,7 @@ DEFAULTS = {
     "q_count":         0,            # questions answered in current skill
     "current_q":       None,         # current question dict
     "questions_per_skill": 15,          # user chosen
+    "stopping_rule":   None,         # irt.StoppingRule or None (fixed length)
 }
 
 for k, v in DEFAULTS.items():
@@ -251,6 +286,24 @@ with st.sidebar:
         st.success("🟢 DB connected")
     else:
         st.error(f"🔴 DB error\n{msg[:60]}")
+    ps = db.pool_stats()
+    st.caption(
+        f"Pool {ps['in_use']}/{ps['size']} in use · hit rate {ps['hit_rate']:.0%} · "
+        f"waits {ps['waits']} · checkout {ps['checkout_ms_avg']:.1f} ms avg"
+    )
+    writer = get_answer_writer()
+    if writer is not None:
+        ws = writer.stats()
+        st.caption(
+            f"Write-behind: {ws['pending']} pending · {ws['written']} written · "
+            f"{ws['spilled']} spilled · flush {ws['flush_ms_avg']:.1f} ms avg"
+        )
+    cs = get_pool_cache().stats()
+    st.caption(
+        f"Pool cache: {cs['entries']} skills · hit rate {cs['hit_rate']:.0%} · "
+        f"{cs['loads']} loads ({cs['load_ms_avg']:.1f} ms avg) · "
+        f"{cs['invalidated']} invalidated · {cs['expired']} expired"
+    )
     st.markdown("---")
     if st.session_state.get("student_name", ""):
         st.markdown(f"**👤 {st.session_state.student_name}**")
@@ -280,7 +333,7 @@ if st.session_state.stage == "home":
     name  = st.text_input("Full Name *", placeholder="e.g. Priya S")
     email = st.text_input("Email *",     placeholder="e.g. priya@email.com")
 
-    max_qs = min(15, min(len(db.get_questions_for_skill(sk)) for sk in skills_available))
+    max_qs = min(15, min(get_pool_cache().sizes(skills_available).values()))
     if max_qs > 7:
         st.markdown("**Number of questions per skill:**")
         q_per_skill = st.slider(
@@ -289,6 +342,11 @@ if st.session_state.stage == "home":
         )
     else:
         q_per_skill = max_qs
+    early_stop = st.checkbox(
+        "⏱️ Finish a skill early once θ is precise", value=True,
+        help=f"Stops a skill when SE(θ) ≤ {STOP_SE_TARGET} or θ stops moving "
+             f"(never before {STOP_MIN_ITEMS} questions). Unticked = always "
+             f"{q_per_skill} per skill.")
     total_qs = len(skills_available) * q_per_skill
 
     col1, col2, col3 = st.columns(3)
@@ -317,9 +375,9 @@ if st.session_state.stage == "home":
 
     if st.button("🚀 Start Assessment", type="primary", use_container_width=True,
                  disabled=not (name.strip() and email_ok and agreed)):
-        # Load question pools for all skills
-        pools = {sk: db.get_questions_for_skill(sk) for sk in skills_available}
-        empty = [sk for sk, qs in pools.items() if not qs]
+        # Shared question pools for all skills (cached per server process)
+        bank  = get_pool_cache().bank(skills_available)
+        empty = [sk for sk, n in bank.sizes().items() if not n]
         if empty:
             st.error(f"No questions found for: {', '.join(empty)}")
             st.stop()
@@ -333,7 +391,8 @@ if st.session_state.stage == "home":
         st.session_state.student_email      = email.strip()
         st.session_state.session_id         = sid
         st.session_state.skills             = skills_available
-        st.session_state.skill_pools        = pools
+        st.session_state.skill_pools        = bank
+        get_live_banks().add(bank)          # fresh b / counts pushed in after each write-back
         st.session_state.skill_index        = 0
         st.session_state.skill_thetas       = {sk: irt.THETA_INIT for sk in skills_available}
         st.session_state.skill_responses    = {sk: [] for sk in skills_available}
@@ -343,6 +402,10 @@ if st.session_state.stage == "home":
         st.session_state.q_count            = 0
         st.session_state.current_q          = None
         st.session_state.questions_per_skill = q_per_skill
+        st.session_state.stopping_rule      = (
+            irt.StoppingRule(se_target=STOP_SE_TARGET, min_items=STOP_MIN_ITEMS,
+                             plateau_delta=STOP_PLATEAU_DELTA)
+            if early_stop else None)
         st.session_state.stage              = "quiz"
         st.rerun()
 
@@ -367,7 +430,9 @@ elif st.session_state.stage == "quiz":
     # ── Get or create SkillSession — MUST be before any skill_sess usage ──
     sess_key = f"skill_session_{current_skill}"
     if sess_key not in st.session_state:
-        st.session_state[sess_key] = irt.SkillSession(current_skill, st.session_state.get("questions_per_skill", QUESTIONS_PER_SKILL))
+        st.session_state[sess_key] = irt.SkillSession(current_skill, st.session_state.get("questions_per_skill", QUESTIONS_PER_SKILL),
+                                                      estimator=IRT_ESTIMATOR,
+                                                      stopping=st.session_state.get("stopping_rule"))
     skill_sess = st.session_state[sess_key]
 
     theta = skill_sess.theta
@@ -389,7 +454,7 @@ elif st.session_state.stage == "quiz":
     qps  = st.session_state.get("questions_per_skill", QUESTIONS_PER_SKILL)
     pct = int((q_count / qps) * 100)
     st.markdown(
-        f"**{current_skill}** · Q {q_count+1}/{qps} · "
+        f"**{current_skill}** · Q {q_count+1}/{'≤' if skill_sess.stopping else ''}{qps} · "
         f"θ = {theta:+.3f} · {prof['label']}"
     )
     st.markdown(
@@ -429,6 +494,9 @@ elif st.session_state.stage == "quiz":
             overall_prof  = irt.theta_to_proficiency(overall_theta)
             total_ans = sum(p["answered"] for p in st.session_state.skill_profiles.values())
             total_cor = sum(p["correct"]  for p in st.session_state.skill_profiles.values())
+            writer = get_answer_writer()
+            if writer is not None:
+                writer.flush()      # leaderboard reads must see every answer
             db.complete_session(
                 session_id        = st.session_state.session_id,
                 theta_overall     = overall_theta,
@@ -488,25 +556,32 @@ elif st.session_state.stage == "quiz":
 
             rec = skill_sess.record_answer(q, choice)
 
-            # Save to DB
-            db_err = db.save_response(
-                session_id         = st.session_state.session_id,
-                question_id        = rec["question_id"],
-                skill              = current_skill,
-                selected_option    = rec["selected_option"],
-                is_correct         = rec["is_correct"],
-                b_used             = rec["b_used"],
-                theta_before       = rec["theta_before"],
-                theta_after        = rec["theta_after"],
-                p_correct_irt      = rec["p_correct_irt"],
-                surprise           = rec["surprise"],
-                proficiency_before = rec["proficiency_before"],
-                proficiency_after  = rec["proficiency_after"],
-            )
-            if db_err:
-                st.warning(f"⚠️ DB save error: {db_err}")
-            db.update_question_b(rec["question_id"], rec["b_final"],
-                                 rec["is_correct"], rec["b_source"])
+            # Save to DB — queued for the write-behind flusher when enabled,
+            # otherwise response row + b write-back in one statement.
+            # The DB computes the new b from its current counters.
+            answer = {
+                "session_id":         st.session_state.session_id,
+                "question_id":        rec["question_id"],
+                "skill":              current_skill,
+                "selected_option":    rec["selected_option"],
+                "is_correct":         rec["is_correct"],
+                "b_used":             rec["b_used"],
+                "theta_before":       rec["theta_before"],
+                "theta_after":        rec["theta_after"],
+                "p_correct_irt":      rec["p_correct_irt"],
+                "surprise":           rec["surprise"],
+                "proficiency_before": rec["proficiency_before"],
+                "proficiency_after":  rec["proficiency_after"],
+            }
+            writer = get_answer_writer()
+            if writer is not None:
+                queued = writer.submit("mcq_answer", answer)
+                saved  = {"error": "" if queued else "answer dropped (write queue full)",
+                          "commit_ms": None}
+            else:
+                saved = db.record_answer_atomic(**answer)
+            if saved["error"]:
+                st.warning(f"⚠️ DB save error: {saved['error']}")
 
             st.session_state.skill_thetas[current_skill] = skill_sess.theta
             st.session_state.q_count   += 1
@@ -529,6 +604,9 @@ elif st.session_state.stage == "quiz":
             col_s3.metric("θ change",
                           f"{rec['theta_after']:+.3f}",
                           f"{dtheta:+.3f}")
+            if not saved["error"]:
+                st.caption("💾 Answer queued for saving" if saved["commit_ms"] is None
+                           else f"💾 Answer saved in {saved['commit_ms']:.1f} ms")
             
             if rec.get("explanation"):
                 st.markdown(
@@ -600,6 +678,14 @@ elif st.session_state.stage == "results":
                 </div>
             </div>""", unsafe_allow_html=True)
 
+    # Overall standing — rank + the few rows around it, not the whole board
+    my_rank = db.get_overall_rank(st.session_state.session_id)
+    if my_rank:
+        st.markdown('<div class="section-label">Your Standing</div>', unsafe_allow_html=True)
+        st.markdown(f"**Overall rank #{my_rank['overall_rank']} of {my_rank['total']}**")
+        render_lb_rows(db.get_overall_neighbours(st.session_state.session_id, LB_AROUND),
+                       str(st.session_state.session_id))
+
     st.markdown("")
     col_a, col_b = st.columns(2)
     with col_a:
@@ -630,29 +716,45 @@ elif st.session_state.stage == "leaderboard":
 
     current_sid = st.session_state.session_id
 
-    overall_lb    = db.get_overall_leaderboard()
-    skill_lb_all  = db.get_all_skills_leaderboard()
-    skills        = db.get_skills()
+    summary       = db.get_overall_summary()
+    skill_lb_all  = db.get_all_skills_leaderboard(LB_SKILL_TOP_K, current_sid)
+    skills        = sorted(skill_lb_all)
 
-    if not overall_lb:
+    if not summary["count"]:
         st.info("No completed sessions yet. Be the first to take the assessment!")
         st.stop()
 
     # ── Overall summary metrics ──────────────────────────────────────────
-    thetas = [float(r["theta_overall"]) for r in overall_lb]
     c1,c2,c3,c4 = st.columns(4)
-    c1.metric("👥 Students", len(overall_lb))
-    c2.metric("📊 Avg θ",    f"{sum(thetas)/len(thetas):+.3f}")
-    c3.metric("🥇 Best θ",   f"{max(thetas):+.3f}")
-    c4.metric("📉 Lowest θ", f"{min(thetas):+.3f}")
+    c1.metric("👥 Students", summary["count"])
+    c2.metric("📊 Avg θ",    f"{summary['avg']:+.3f}")
+    c3.metric("🥇 Best θ",   f"{summary['max']:+.3f}")
+    c4.metric("📉 Lowest θ", f"{summary['min']:+.3f}")
 
     st.markdown("---")
 
-    # ── Overall rank ──────────────────────────────────────────────────────
+    # ── Overall rank (one page at a time) ─────────────────────────────────
+    n_pages = max(1, math.ceil(summary["count"] / LB_PAGE_SIZE))
+    page    = min(st.session_state.get("lb_page", 0), n_pages - 1)
+    overall_lb = db.get_overall_leaderboard(LB_PAGE_SIZE, page * LB_PAGE_SIZE)
+    my_rank    = db.get_overall_rank(current_sid) if current_sid else None
+
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown('<div class="section-label">Overall Ranking (by average θ across all skills)</div>',
                 unsafe_allow_html=True)
+    if my_rank:
+        st.markdown(f"**Your overall rank: #{my_rank['overall_rank']} of {my_rank['total']}** "
+                    f"· θ = {my_rank['theta_overall']:+.3f}")
     render_lb_rows(overall_lb, current_sid)
+    if n_pages > 1:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        if col_prev.button("← Prev", disabled=page == 0, use_container_width=True):
+            st.session_state.lb_page = page - 1
+            st.rerun()
+        col_page.caption(f"Page {page + 1} of {n_pages}")
+        if col_next.button("Next →", disabled=page >= n_pages - 1, use_container_width=True):
+            st.session_state.lb_page = page + 1
+            st.rerun()
     st.markdown('</div>', unsafe_allow_html=True)
 
     # ── Per-skill breakdown ───────────────────────────────────────────────
@@ -660,16 +762,11 @@ elif st.session_state.stage == "leaderboard":
     skill_tabs = st.tabs(skills)
     for tab, skill in zip(skill_tabs, skills):
         with tab:
-            rows = skill_lb_all.get(skill, [])
+            rows   = skill_lb_all[skill]["top"]
+            my_row = skill_lb_all[skill]["me"]
             if not rows:
                 st.info(f"No submissions for {skill} yet.")
             else:
-                # Find current student's skill rank
-                my_row = next(
-                    (r for r in rows
-                     if str(r.get("session_id","")) == str(current_sid or "")),
-                    None
-                )
                 if my_row:
                     mcolor, mbg = PROF_COLORS.get(my_row["proficiency_label"],
                                                    ("#4f46e5","#eef2ff"))
@@ -680,4 +777,4 @@ elif st.session_state.stage == "leaderboard":
                         f'θ = {my_row["theta_final"]:+.3f} · {my_row["proficiency_label"]}'
                         f'</div>', unsafe_allow_html=True
                     )
-                render_lb_rows(rows)
\ No newline at end of file
+                render_lb_rows(rows, current_sid)
\ No newline at end of file
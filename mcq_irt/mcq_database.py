@@ -7,41 +7,39 @@ TABLES:
   mcq_sessions         — one row per student (overall session)
   mcq_responses        — one row per answer (full Rasch state captured)
   mcq_skill_profiles   — final θ per skill per student (leaderboard source)
+  mcq_pool_versions    — per-skill version, bumped on reload / recalibration
 """
 
 import os
 import json
+import time
 import psycopg2
 import psycopg2.extras
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 load_dotenv()
 
+try:
+    import db_pool
+except ImportError:
+    # Running from inside mcq_irt/ — shared modules live one level up
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import db_pool
+import leaderboard
+
+try:
+    from . import rasch_engine as irt
+except ImportError:               # imported from inside mcq_irt/ (mcq_app.py)
+    import rasch_engine as irt
+
+BULK_PAGE_SIZE = 1000     # rows per multi-row INSERT statement
+
 
 def _get_conn():
+    """Borrow a connection from the shared pool (db_pool.py). conn.close() returns it."""
     try:
-        cfg = st_secrets = None
-        try:
-            import streamlit as st
-            cfg = st.secrets.get("postgres", {})
-        except Exception:
-            pass
-
-        if cfg:
-            return psycopg2.connect(
-                host=cfg.get("host", "localhost"),
-                port=cfg.get("port", 5432),
-                dbname=cfg.get("dbname", "interview_coach"),
-                user=cfg.get("user", "postgres"),
-                password=cfg.get("password", ""),
-            )
-        return psycopg2.connect(
-            host=os.environ.get("POSTGRES_HOST", "localhost"),
-            port=int(os.environ.get("POSTGRES_PORT", 5432)),
-            dbname=os.environ.get("POSTGRES_DB", "interview_coach"),
-            user=os.environ.get("POSTGRES_USER", "postgres"),
-            password=os.environ.get("POSTGRES_PASSWORD", ""),
-        )
+        return db_pool.getconn()
     except Exception as e:
         print(f"[MCQ DB] Connection error: {e}")
         return None
@@ -55,12 +53,17 @@ def test_connection() -> tuple[bool, str]:
     return True, "Connected"
 
 
+def pool_stats() -> dict:
+    """Counters of the shared connection pool — hits, waits, checkout latency."""
+    return db_pool.stats()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SCHEMA VERIFICATION (tables already created via db_schema.sql)
 # ─────────────────────────────────────────────────────────────────────────────
 
 def init_db() -> bool:
-    """Verify MCQ tables exist in interview_coach database."""
+    """Verify MCQ tables exist in interview_coach database (and add columns newer than them)."""
     conn = _get_conn()
     if not conn:
         return False
@@ -73,7 +76,14 @@ def init_db() -> bool:
                 """)
                 exists = cur.fetchone()[0] > 0
         if exists:
+            with conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        ALTER TABLE mcq_questions
+                            ADD COLUMN IF NOT EXISTS b_calibrated_at TIMESTAMP WITH TIME ZONE
+                    """)
             print("[MCQ DB] Tables verified in interview_coach database.")
+            leaderboard.init_db()
         else:
             print("[MCQ DB] WARNING: MCQ tables not found. Run db_schema.sql first.")
         return exists
@@ -92,6 +102,9 @@ def load_questions_from_json(filepath: str) -> tuple[int, str]:
     """
     Load questions from mcq_data.json into mcq_questions table.
     Skips questions that already exist (by question_id).
+    All rows go in one multi-row INSERT (execute_values); RETURNING tells us
+    which ones were actually inserted, and their skills' pool versions are
+    bumped.
     Returns (count_inserted, error_message)
     """
     conn = _get_conn()
@@ -101,30 +114,36 @@ def load_questions_from_json(filepath: str) -> tuple[int, str]:
         with open(filepath, "r") as f:
             data = json.load(f)
 
-        inserted = 0
+        rows = []
+        for skill_block in data.get("skills", []):
+            skill    = skill_block["skill"]
+            category = skill_block.get("category", "")
+            for q in skill_block.get("questions", []):
+                rows.append((
+                    q["question_id"], skill, category,
+                    q["question_text"],
+                    q["option_a"], q["option_b"],
+                    q["option_c"], q["option_d"],
+                    q["correct_option"], q.get("explanation",""),
+                    q["b_param"],
+                ))
+        if not rows:
+            return 0, ""
+
         with conn:
             with conn.cursor() as cur:
-                for skill_block in data.get("skills", []):
-                    skill    = skill_block["skill"]
-                    category = skill_block.get("category", "")
-                    for q in skill_block.get("questions", []):
-                        cur.execute("""
-                            INSERT INTO mcq_questions
-                                (question_id, skill, category, question_text,
-                                 option_a, option_b, option_c, option_d,
-                                 correct_option, explanation, b_param)
-                            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                            ON CONFLICT (question_id) DO NOTHING
-                        """, (
-                            q["question_id"], skill, category,
-                            q["question_text"],
-                            q["option_a"], q["option_b"],
-                            q["option_c"], q["option_d"],
-                            q["correct_option"], q.get("explanation",""),
-                            q["b_param"],
-                        ))
-                        inserted += cur.rowcount
-        return inserted, ""
+                inserted = psycopg2.extras.execute_values(cur, """
+                    INSERT INTO mcq_questions
+                        (question_id, skill, category, question_text,
+                         option_a, option_b, option_c, option_d,
+                         correct_option, explanation, b_param)
+                    VALUES %s
+                    ON CONFLICT (question_id) DO NOTHING
+                    RETURNING question_id
+                """, rows, page_size=BULK_PAGE_SIZE, fetch=True)
+                if inserted:
+                    _bump_pool_versions(cur, [r[0] for r in inserted])
+        return len(inserted), ""
     except Exception as e:
         return 0, str(e)
     finally:
@@ -156,7 +175,8 @@ def get_questions_for_skill(skill: str) -> list[dict]:
             cur.execute("""
                 SELECT question_id, skill, category, question_text,
                        option_a, option_b, option_c, option_d,
-                       correct_option, explanation, b_param, difficulty_tier
+                       correct_option, explanation, b_param, difficulty_tier,
+                       response_count, correct_count, b_calibrated_at
                 FROM mcq_questions
                 WHERE skill = %s AND is_active = TRUE
                 ORDER BY b_param
@@ -169,6 +189,33 @@ def get_questions_for_skill(skill: str) -> list[dict]:
         conn.close()
 
 
+def get_pool_versions() -> dict[str, int]:
+    """skill → pool version (mcq_pool_versions). Skills never bumped are absent (= 0)."""
+    conn = _get_conn()
+    if not conn:
+        return {}
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT skill, version FROM mcq_pool_versions")
+            return {skill: int(v) for skill, v in cur.fetchall()}
+    except Exception as e:
+        print(f"[MCQ DB] get_pool_versions error: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def _bump_pool_versions(cur, question_ids: list[str]):
+    """Bump the pool version of every skill owning one of question_ids (caller's transaction)."""
+    cur.execute("""
+        INSERT INTO mcq_pool_versions (skill, version)
+        SELECT DISTINCT skill, 1 FROM mcq_questions WHERE question_id = ANY(%s)
+        ON CONFLICT (skill) DO UPDATE SET
+            version    = mcq_pool_versions.version + 1,
+            updated_at = NOW()
+    """, (list(question_ids),))
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SESSION MANAGEMENT
 # ─────────────────────────────────────────────────────────────────────────────
@@ -226,6 +273,204 @@ def save_response(session_id: str, question_id: str, skill: str,
         conn.close()
 
 
+MCQ_ANSWER_FIELDS = ("session_id", "question_id", "skill", "selected_option",
+                     "is_correct", "b_used", "theta_before", "theta_after",
+                     "p_correct_irt", "surprise",
+                     "proficiency_before", "proficiency_after")
+
+
+# b write-back computed INSIDE the UPDATE from the row's current b_param /
+# counters — the same rules as update_b_online() and calibrate_b(). When two
+# candidates answer the same question at once, the second UPDATE waits for
+# the first's row lock and then re-evaluates against the committed row, so
+# every answer is applied on top of the previous one (no lost updates).
+# Rows calibrated by the offline JMLE job (b_calibrated_at set) keep that b
+# and only take the small online step; the pass-rate log-odds would throw
+# the calibration away on their next answer.
+_PASS_RATE = ("GREATEST(0.01, LEAST(0.99, "
+              "(correct_count + %(y)s)::float8 / (response_count + 1)))")
+B_UPDATE_SET = f"""
+    response_count = response_count + 1,
+    correct_count  = correct_count + %(y)s,
+    b_param = GREATEST(%(b_min)s, LEAST(%(b_max)s, CASE
+        WHEN b_calibrated_at IS NULL AND response_count + 1 >= %(calib_min)s
+            THEN LN((1 - {_PASS_RATE}) / {_PASS_RATE})
+        ELSE b_param + %(alpha_b)s * (%(y)s - 1 / (1 + EXP(-(%(theta)s - b_param))))
+    END))
+"""
+
+
+def _b_update_params(theta_before: float, is_correct: bool) -> dict:
+    """Parameters for B_UPDATE_SET — engine constants are read per call."""
+    return {"theta": float(theta_before), "y": 1 if is_correct else 0,
+            "alpha_b": irt.ALPHA_B, "calib_min": irt.CALIB_MIN_RESPONSES,
+            "b_min": irt.B_MIN, "b_max": irt.B_MAX}
+
+
+def _b_source(response_count: int | None, jmle: bool = False) -> str | None:
+    if response_count is None:
+        return None
+    if jmle:
+        return "online"
+    return "calibrated" if response_count >= irt.CALIB_MIN_RESPONSES else "online"
+
+
+# Callbacks fed {question_id: (b_param, response_count, correct_count)} after
+# every committed write-back — mcq_app uses this to refresh live ItemPools.
+_b_listeners: list = []
+
+
+def add_b_listener(callback) -> None:
+    """Register callback(updates) for fresh b / counts after each write-back."""
+    if callback not in _b_listeners:
+        _b_listeners.append(callback)
+
+
+def _publish_b(updates: dict) -> None:
+    for callback in list(_b_listeners):
+        try:
+            callback(updates)
+        except Exception as e:
+            print(f"[MCQ DB] b listener error: {e}")
+
+
+def record_answer_atomic(session_id: str, question_id: str, skill: str,
+                         selected_option: str, is_correct: bool,
+                         b_used: float, theta_before: float, theta_after: float,
+                         p_correct_irt: float, surprise: float,
+                         proficiency_before: float, proficiency_after: float) -> dict:
+    """
+    Write one answer AND its b write-back in a single statement.
+
+    Replaces the save_response() + update_question_b() pair, which used two
+    connections / two transactions — a failure between them left the
+    mcq_responses row and the item's b_param / response_count out of step.
+    Here a data-modifying CTE inserts the response and updates mcq_questions
+    together; run in autocommit mode the statement is its own transaction,
+    so the whole answer costs ONE round trip.
+
+    The new b is computed by the database from the CURRENT b_param and
+    counters (B_UPDATE_SET), not from the copy the session loaded at start,
+    so concurrent candidates cannot overwrite each other's calibration.
+
+    Returns:
+      {"error": str, "response_id": str|None, "b_param": float|None,
+       "response_count": int|None, "correct_count": int|None,
+       "b_source": "online"|"calibrated"|None,
+       "commit_ms": float}   # wall-clock of the statement incl. commit
+    """
+    result = {"error": "", "response_id": None, "b_param": None,
+              "response_count": None, "correct_count": None, "b_source": None,
+              "commit_ms": 0.0}
+    conn = _get_conn()
+    if not conn:
+        result["error"] = "DB connection failed"
+        return result
+    params = _b_update_params(theta_before, is_correct)
+    params.update(session_id=session_id, question_id=question_id, skill=skill,
+                  selected_option=selected_option, is_correct=is_correct,
+                  b_used=b_used, theta_before=theta_before, theta_after=theta_after,
+                  p_correct_irt=p_correct_irt, surprise=surprise,
+                  proficiency_before=proficiency_before,
+                  proficiency_after=proficiency_after)
+    try:
+        conn.autocommit = True
+        t0 = time.perf_counter()
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                WITH ins AS (
+                    INSERT INTO mcq_responses ({", ".join(MCQ_ANSWER_FIELDS)})
+                    VALUES (%(session_id)s::uuid, %(question_id)s, %(skill)s,
+                            %(selected_option)s, %(is_correct)s, %(b_used)s,
+                            %(theta_before)s, %(theta_after)s, %(p_correct_irt)s,
+                            %(surprise)s, %(proficiency_before)s, %(proficiency_after)s)
+                    RETURNING response_id
+                ), upd AS (
+                    UPDATE mcq_questions SET {B_UPDATE_SET}
+                    WHERE question_id = %(question_id)s
+                    RETURNING b_param, response_count, correct_count,
+                              b_calibrated_at IS NOT NULL AS jmle
+                )
+                SELECT ins.response_id, upd.b_param,
+                       upd.response_count, upd.correct_count, upd.jmle
+                FROM ins LEFT JOIN upd ON TRUE
+            """, params)
+            row = cur.fetchone()
+        result["commit_ms"] = round((time.perf_counter() - t0) * 1000.0, 3)
+        if row:
+            result["response_id"]    = str(row[0])
+            result["b_param"]        = row[1]
+            result["response_count"] = row[2]
+            result["correct_count"]  = row[3]
+            result["b_source"]       = _b_source(row[2], row[4])
+    except Exception as e:
+        print(f"[MCQ DB] record_answer_atomic error: {e}")
+        result["error"] = str(e)
+    finally:
+        try:
+            conn.autocommit = False
+        except Exception:
+            pass
+        conn.close()
+    if result["b_param"] is not None:
+        _publish_b({question_id: (result["b_param"], result["response_count"],
+                                  result["correct_count"])})
+    return result
+
+
+def record_answers_batch(rows: list[dict]) -> str:
+    """
+    Write-behind flusher: many answers (same keys as record_answer_atomic's
+    arguments) in ONE transaction — one multi-row INSERT into mcq_responses,
+    then the B_UPDATE_SET write-back once per answer, sent in pages of
+    BULK_PAGE_SIZE statements per round trip (execute_batch).
+
+    Answers to the same question are applied one after another in the order
+    they were queued, each on top of the previous b. Updates are issued in
+    question_id order so concurrent batches lock rows in the same order and
+    cannot deadlock. Fresh b / counts are read back in the same transaction
+    and published to add_b_listener() callbacks after commit.
+    Returns error string or empty string.
+    """
+    if not rows:
+        return ""
+    ordered = sorted(rows, key=lambda r: r["question_id"])      # stable: keeps answer order
+    updates = []
+    for r in ordered:
+        params = _b_update_params(r["theta_before"], r["is_correct"])
+        params["question_id"] = r["question_id"]
+        updates.append(params)
+
+    conn = _get_conn()
+    if not conn:
+        return "DB connection failed"
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                psycopg2.extras.execute_values(cur, f"""
+                    INSERT INTO mcq_responses ({", ".join(MCQ_ANSWER_FIELDS)})
+                    VALUES %s
+                """, [tuple(r[k] for k in MCQ_ANSWER_FIELDS) for r in rows],
+                    template="(%s::uuid,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)",
+                    page_size=BULK_PAGE_SIZE)
+                psycopg2.extras.execute_batch(cur, f"""
+                    UPDATE mcq_questions SET {B_UPDATE_SET}
+                    WHERE question_id = %(question_id)s
+                """, updates, page_size=BULK_PAGE_SIZE)
+                cur.execute("""
+                    SELECT question_id, b_param, response_count, correct_count
+                    FROM mcq_questions WHERE question_id = ANY(%s)
+                """, (sorted({r["question_id"] for r in rows}),))
+                fresh = {qid: (b, n, c) for qid, b, n, c in cur.fetchall()}
+    except Exception as e:
+        print(f"[MCQ DB] record_answers_batch error: {e}")
+        return str(e)
+    finally:
+        conn.close()
+    _publish_b(fresh)
+    return ""
+
+
 def save_skill_profile(session_id: str, student_name: str,
                        student_email: str, skill: str,
                        theta_final: float, proficiency_score: float,
@@ -266,7 +511,8 @@ def complete_session(session_id: str, theta_overall: float,
                      total_answered: int, total_correct: int):
     """
     Mark MCQ session as completed and store final overall θ.
-    Also updates final_sessions via final_database.
+    Also updates the overall leaderboard (same transaction) and
+    final_sessions via final_database.
     """
     conn = _get_conn()
     if not conn:
@@ -290,12 +536,20 @@ def complete_session(session_id: str, theta_overall: float,
                 
                 # Get student info for final session update
                 cur.execute("""
-                    SELECT student_name, student_email FROM mcq_sessions 
+                    SELECT student_name, student_email, completed_at FROM mcq_sessions 
                     WHERE session_id = %s::uuid
                 """, (session_id,))
                 row = cur.fetchone()
                 if row:
-                    student_name, student_email = row
+                    student_name, student_email, completed_at = row
+                    leaderboard.record(cur, "mcq_overall", session_id, theta_overall, {
+                        "session_id": session_id, "student_name": student_name,
+                        "student_email": student_email, "theta_overall": theta_overall,
+                        "proficiency_label": proficiency_label,
+                        "proficiency_score": proficiency_score,
+                        "total_answered": total_answered, "total_correct": total_correct,
+                        "completed_at": completed_at,
+                    })
                     try:
                         import final_database as fdb
                         final_sid = fdb.create_final_session(
@@ -325,76 +579,107 @@ def complete_session(session_id: str, theta_overall: float,
 # LEADERBOARD QUERIES
 # ─────────────────────────────────────────────────────────────────────────────
 
-def get_overall_leaderboard() -> list[dict]:
+def get_overall_leaderboard(limit: int | None = None, offset: int = 0) -> list[dict]:
     """
     Overall leaderboard — ranked by average θ across all skills.
-    One row per student session.
+    One row per student session; rows [offset, offset+limit) in rank order
+    (limit None = all). Served from the leaderboard summary tables.
     """
-    conn = _get_conn()
-    if not conn:
-        return []
-    try:
-        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute("""
-                SELECT
-                    s.session_id,
-                    s.student_name,
-                    s.student_email,
-                    s.theta_overall,
-                    s.proficiency_label,
-                    s.proficiency_score,
-                    s.total_answered,
-                    s.total_correct,
-                    s.completed_at,
-                    RANK() OVER (ORDER BY s.theta_overall DESC) AS overall_rank
-                FROM mcq_sessions s
-                WHERE s.status = 'completed'
-                ORDER BY s.theta_overall DESC
-            """)
-            return [dict(r) for r in cur.fetchall()]
-    except Exception as e:
-        print(f"[MCQ DB] get_overall_leaderboard error: {e}")
-        return []
-    finally:
-        conn.close()
+    rows = leaderboard.top("mcq_overall", limit, offset)
+    for r in rows:
+        r["overall_rank"] = r.pop("rank")
+    return rows
 
 
-def get_skill_leaderboard(skill: str) -> list[dict]:
+def get_all_skills_leaderboard(top_k: int | None = 10,
+                               session_id: str | None = None) -> dict[str, dict]:
     """
-    Leaderboard for one specific skill — ranked by θ for that skill.
+    Top-K of every skill + one session's row in each skill, in ONE query.
+
+    Each active skill gets its top_k profiles through a LATERAL ... LIMIT
+    (an index range scan on (skill, theta_final DESC) — only k rows read
+    per skill), ranked with a window PARTITION BY skill. The session's own
+    rank is 1 + the number of higher θ in that skill (same index).
+    Ties share a rank (RANK()). top_k None = every row.
+
+    Returns {skill: {"top": [row, ...], "me": row | None}} for every
+    active skill (skills with no submissions have an empty "top").
     """
     conn = _get_conn()
     if not conn:
-        return []
+        return {}
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             cur.execute("""
-                SELECT
-                    sp.student_name,
-                    sp.student_email,
-                    sp.skill,
-                    sp.theta_final,
-                    sp.proficiency_score,
-                    sp.proficiency_label,
-                    sp.questions_answered,
-                    sp.questions_correct,
-                    RANK() OVER (ORDER BY sp.theta_final DESC) AS skill_rank
-                FROM mcq_skill_profiles sp
-                WHERE sp.skill = %s
-                ORDER BY sp.theta_final DESC
-            """, (skill,))
-            return [dict(r) for r in cur.fetchall()]
+                WITH skills AS (
+                    SELECT DISTINCT skill FROM mcq_questions WHERE is_active = TRUE
+                ), ranked AS (
+                    SELECT s.skill, p.session_id, p.student_name, p.student_email,
+                           p.theta_final, p.proficiency_score, p.proficiency_label,
+                           p.questions_answered, p.questions_correct,
+                           RANK() OVER w       AS skill_rank,
+                           ROW_NUMBER() OVER w AS row_num
+                    FROM skills s
+                    LEFT JOIN LATERAL (
+                        SELECT * FROM mcq_skill_profiles sp
+                        WHERE sp.skill = s.skill
+                        ORDER BY sp.theta_final DESC, sp.completed_at ASC
+                        LIMIT %(k)s
+                    ) p ON TRUE
+                    WINDOW w AS (PARTITION BY s.skill
+                                 ORDER BY p.theta_final DESC, p.completed_at ASC)
+                )
+                SELECT skill, session_id::text AS session_id, student_name, student_email,
+                       theta_final, proficiency_score, proficiency_label,
+                       questions_answered, questions_correct, skill_rank, row_num,
+                       FALSE AS is_me
+                FROM ranked
+                UNION ALL
+                SELECT m.skill, m.session_id::text, m.student_name, m.student_email,
+                       m.theta_final, m.proficiency_score, m.proficiency_label,
+                       m.questions_answered, m.questions_correct,
+                       1 + (SELECT COUNT(*) FROM mcq_skill_profiles x
+                            WHERE x.skill = m.skill AND x.theta_final > m.theta_final),
+                       NULL, TRUE
+                FROM mcq_skill_profiles m
+                WHERE m.session_id = %(sid)s::uuid
+                ORDER BY skill, row_num
+            """, {"k": top_k, "sid": session_id})
+            result: dict[str, dict] = {}
+            for r in cur.fetchall():
+                r = dict(r)
+                entry = result.setdefault(r["skill"], {"top": [], "me": None})
+                if r.pop("is_me"):
+                    entry["me"] = r
+                elif r["session_id"] is not None:
+                    entry["top"].append(r)
+            return result
     except Exception as e:
-        print(f"[MCQ DB] get_skill_leaderboard error: {e}")
-        return []
+        print(f"[MCQ DB] get_all_skills_leaderboard error: {e}")
+        return {}
     finally:
         conn.close()
 
 
-def get_all_skills_leaderboard() -> dict[str, list[dict]]:
-    """Return leaderboard for every skill in one call."""
-    skills = get_skills()
-    return {skill: get_skill_leaderboard(skill) for skill in skills}
+def get_overall_rank(session_id: str) -> dict | None:
+    """One session's overall leaderboard row + "overall_rank" and "total", or None."""
+    row = leaderboard.rank_of("mcq_overall", session_id)
+    if row:
+        row["overall_rank"] = row.pop("rank")
+    return row
+
+
+def get_overall_neighbours(session_id: str, k: int = 2) -> list[dict]:
+    """The session's overall row with up to k rows either side, each with "overall_rank"."""
+    rows = leaderboard.neighbours("mcq_overall", session_id, k)
+    for r in rows:
+        r["overall_rank"] = r.pop("rank")
+    return rows
+
+
+def get_overall_summary() -> dict:
+    """{"count", "avg", "max", "min"} of theta_overall over completed sessions."""
+    return leaderboard.summary("mcq_overall")
 
 
 def get_session_skill_profiles(session_id: str) -> list[dict]:
@@ -419,26 +704,138 @@ def get_session_skill_profiles(session_id: str) -> list[dict]:
         conn.close()
 
 
-def update_question_b(question_id: str, b_final: float,
-                      is_correct: bool, b_source: str):
+# ─────────────────────────────────────────────────────────────────────────────
+# ITEM CALIBRATION (b_param write-back)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def iter_response_chunks(skill: str | None = None, fetch_size: int = 50_000):
     """
-    Update b_param in DB after every answer — mirrors senior's QB write-back.
-    Also increments response_count and correct_count for calibration.
+    Stream (session_id, skill, question_id, is_correct) tuples out of
+    mcq_responses in chunks of fetch_size, through a server-side (named)
+    cursor — the table is never materialised client-side, so memory stays
+    bounded however many responses there are.
+
+    Rows come ordered by (session_id, skill) so one person's answers are
+    contiguous (calibrate.py relies on this). Yields lists of tuples;
+    yields nothing when no connection is available.
     """
     conn = _get_conn()
     if not conn:
         return
     try:
+        with conn:
+            with conn.cursor(name="mcq_calibration_stream") as cur:
+                cur.itersize = fetch_size
+                cur.execute("""
+                    SELECT session_id::text, skill, question_id, is_correct
+                    FROM mcq_responses
+                    WHERE %(skill)s::text IS NULL OR skill = %(skill)s
+                    ORDER BY session_id, skill
+                """, {"skill": skill})
+                while True:
+                    rows = cur.fetchmany(fetch_size)
+                    if not rows:
+                        break
+                    yield rows
+    finally:
+        conn.close()
+
+
+def get_b_params(skill: str | None = None) -> dict[str, float]:
+    """question_id → current b_param (all questions, or one skill's)."""
+    conn = _get_conn()
+    if not conn:
+        return {}
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT question_id, b_param FROM mcq_questions
+                WHERE %(skill)s::text IS NULL OR skill = %(skill)s
+            """, {"skill": skill})
+            return {qid: float(b) for qid, b in cur.fetchall()}
+    except Exception as e:
+        print(f"[MCQ DB] get_b_params error: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def update_b_params_bulk(b_by_question: dict[str, float]) -> tuple[int, str]:
+    """
+    Write many b_param values in ONE statement / ONE transaction
+    (UPDATE ... FROM (VALUES ...)) — used by the offline calibration job.
+    b_calibrated_at is set, so later answers only move these b's by the
+    online step (B_UPDATE_SET); response_count / correct_count are left
+    alone. The affected skills' pool versions are bumped so cached pools are reloaded (pool_cache.py).
+    The rows are locked in question_id order first (SELECT ... FOR UPDATE),
+    the same order record_answers_batch() uses, so the job cannot deadlock
+    against live write-behind batches.
+    Returns (rows_updated, error_message)
+    """
+    if not b_by_question:
+        return 0, ""
+    conn = _get_conn()
+    if not conn:
+        return 0, "DB connection failed"
+    try:
+        items = sorted(b_by_question.items())
         with conn:
             with conn.cursor() as cur:
                 cur.execute("""
-                    UPDATE mcq_questions SET
-                        b_param        = %s,
-                        response_count = response_count + 1,
-                        correct_count  = correct_count + %s
-                    WHERE question_id = %s
-                """, (b_final, 1 if is_correct else 0, question_id))
+                    SELECT question_id FROM mcq_questions
+                    WHERE question_id = ANY(%s) ORDER BY question_id FOR UPDATE
+                """, ([qid for qid, _ in items],))
+                updated = psycopg2.extras.execute_values(cur, """
+                    UPDATE mcq_questions AS q SET b_param = v.b, b_calibrated_at = NOW()
+                    FROM (VALUES %s) AS v(question_id, b)
+                    WHERE q.question_id = v.question_id
+                    RETURNING q.question_id
+                """, items,
+                    template="(%s, %s::float8)",
+                    page_size=len(b_by_question), fetch=True)
+                _bump_pool_versions(cur, [r[0] for r in updated])
+        return len(updated), ""
+    except Exception as e:
+        print(f"[MCQ DB] update_b_params_bulk error: {e}")
+        return 0, str(e)
+    finally:
+        conn.close()
+
+
+def update_question_b(question_id: str, theta_before: float,
+                      is_correct: bool) -> dict:
+    """
+    b write-back for one answer on its own (no mcq_responses row).
+    Increments response_count / correct_count and moves b_param with the
+    same in-database rule as record_answer_atomic() (B_UPDATE_SET).
+    Returns {"b_param", "response_count", "correct_count", "b_source"}
+    (all None on error).
+    """
+    result = {"b_param": None, "response_count": None,
+              "correct_count": None, "b_source": None}
+    conn = _get_conn()
+    if not conn:
+        return result
+    params = _b_update_params(theta_before, is_correct)
+    params["question_id"] = question_id
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    UPDATE mcq_questions SET {B_UPDATE_SET}
+                    WHERE question_id = %(question_id)s
+                    RETURNING b_param, response_count, correct_count,
+                              b_calibrated_at IS NOT NULL
+                """, params)
+                row = cur.fetchone()
+        if row:
+            result.update(b_param=row[0], response_count=row[1],
+                          correct_count=row[2], b_source=_b_source(row[1], row[3]))
     except Exception as e:
         print(f"[MCQ DB] update_question_b error: {e}")
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+    if result["b_param"] is not None:
+        _publish_b({question_id: (result["b_param"], result["response_count"],
+                                  result["correct_count"])})
+    return result
@@ -0,0 +1,179 @@
+"""
+pool_cache.py
+Process-wide cache of per-skill question pools (ItemPool snapshots).
+
+Each skill is loaded once into a read-only ItemPool shared by every
+session on the server; per-candidate state stays in SkillSession.
+
+  ✅ TTL           — a snapshot is reloaded after TTL seconds (picks up b drift)
+  ✅ invalidation  — a skill whose mcq_pool_versions row was bumped is dropped
+                     at the next poll (every CHECK_SECONDS)
+  ✅ no stampede   — one loader per skill; other callers wait for it
+  ✅ live b        — refresh() swaps in a re-sorted copy after b write-backs
+                     (item_bank.LiveBanks calls it); snapshots are never edited
+  ✅ metrics       — hits, misses, expired, invalidated, load time
+
+CONFIG (environment):
+  MCQ_POOL_CACHE_TTL            300   seconds a snapshot may be served
+  MCQ_POOL_CACHE_CHECK_SECONDS  5     seconds between version polls
+
+USAGE:
+    cache = PoolCache(lambda sk: ItemPool(db.get_questions_for_skill(sk)),
+                      db.get_pool_versions)
+    bank  = cache.bank(skills)          # ItemBank over the shared snapshots
+"""
+
+import os
+import time
+import threading
+
+try:
+    from .item_bank import ItemBank, ItemPool
+except ImportError:               # imported from inside mcq_irt/ (mcq_app.py)
+    from item_bank import ItemBank, ItemPool
+
+POOL_CACHE_TTL           = float(os.environ.get("MCQ_POOL_CACHE_TTL", 300))
+POOL_CACHE_CHECK_SECONDS = float(os.environ.get("MCQ_POOL_CACHE_CHECK_SECONDS", 5))
+
+
+class _Entry:
+    __slots__ = ("pool", "version", "loaded_at")
+
+    def __init__(self, pool: ItemPool, version: int, loaded_at: float):
+        self.pool      = pool
+        self.version   = version
+        self.loaded_at = loaded_at
+
+
+class PoolCache:
+    """skill → shared, read-only ItemPool snapshot with TTL + version invalidation."""
+
+    def __init__(self, loader, version_loader=None,
+                 ttl: float = POOL_CACHE_TTL,
+                 check_seconds: float = POOL_CACHE_CHECK_SECONDS,
+                 clock=time.monotonic):
+        self._loader         = loader            # skill → ItemPool
+        self._version_loader = version_loader    # () → {skill: version}, or None
+        self.ttl             = ttl
+        self.check_seconds   = check_seconds
+        self._clock          = clock
+        self._entries: dict[str, _Entry]          = {}
+        self._loading: dict[str, threading.Lock]  = {}
+        self._versions: dict[str, int]            = {}
+        self._last_check = None
+        self._lock       = threading.Lock()
+        self._counters   = {"hits": 0, "misses": 0, "expired": 0,
+                            "invalidated": 0, "loads": 0, "load_ms_total": 0.0}
+
+    # ── Lookup ───────────────────────────────────────────────────────────
+
+    def get(self, skill: str) -> ItemPool:
+        """Shared snapshot for skill (loaded on first use / after expiry)."""
+        self._poll_versions()
+        pool = self._fresh(skill, count=True)
+        if pool is not None:
+            return pool
+
+        with self._lock:
+            load_lock = self._loading.setdefault(skill, threading.Lock())
+        with load_lock:
+            pool = self._fresh(skill, count=False)     # loaded while we waited
+            if pool is not None:
+                return pool
+            with self._lock:
+                version = self._versions.get(skill, 0)
+            t0   = time.perf_counter()
+            pool = self._loader(skill)
+            pool.freeze()
+            with self._lock:
+                self._counters["loads"]         += 1
+                self._counters["load_ms_total"] += (time.perf_counter() - t0) * 1000.0
+                if len(pool):                          # never cache a failed / empty load
+                    self._entries[skill] = _Entry(pool, version, self._clock())
+            return pool
+
+    def bank(self, skills) -> ItemBank:
+        """ItemBank over the shared snapshots of skills."""
+        return ItemBank({sk: self.get(sk) for sk in skills})
+
+    def sizes(self, skills) -> dict[str, int]:
+        return {sk: len(self.get(sk)) for sk in skills}
+
+    def refresh(self, updates: dict, replaced: dict | None = None) -> int:
+        """
+        Replace cached snapshots the updates touch with ItemPool.refreshed()
+        (version and TTL unchanged). replaced: see ItemBank.refresh().
+        """
+        replaced = {} if replaced is None else replaced
+        with self._lock:
+            entries = list(self._entries.values())
+        n = 0
+        for entry in entries:
+            pool = entry.pool
+            if id(pool) not in replaced:
+                replaced[id(pool)] = (pool, pool.refreshed(updates))
+            new = replaced[id(pool)][1]
+            if new is None:
+                continue
+            with self._lock:
+                if entry.pool is pool:
+                    entry.pool = new
+                    n += 1
+        return n
+
+    def invalidate(self, skill: str | None = None):
+        """Drop one skill's snapshot (or all); the next get() reloads it."""
+        with self._lock:
+            dropped = ([skill] if skill is not None else list(self._entries))
+            for sk in dropped:
+                if self._entries.pop(sk, None) is not None:
+                    self._counters["invalidated"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            c       = dict(self._counters)
+            entries = len(self._entries)
+        lookups = c["hits"] + c["misses"]
+        loads   = c["loads"]
+        return {
+            "entries":     entries,
+            "hits":        c["hits"],
+            "misses":      c["misses"],
+            "expired":     c["expired"],
+            "invalidated": c["invalidated"],
+            "loads":       loads,
+            "hit_rate":    c["hits"] / lookups if lookups else 0.0,
+            "load_ms_avg": c["load_ms_total"] / loads if loads else 0.0,
+        }
+
+    # ── Internals ────────────────────────────────────────────────────────
+
+    def _fresh(self, skill: str, count: bool) -> ItemPool | None:
+        with self._lock:
+            entry = self._entries.get(skill)
+            if entry is not None and self._clock() - entry.loaded_at >= self.ttl:
+                del self._entries[skill]
+                self._counters["expired"] += 1
+                entry = None
+            if count:
+                self._counters["hits" if entry is not None else "misses"] += 1
+            return entry.pool if entry is not None else None
+
+    def _poll_versions(self):
+        if self._version_loader is None:
+            return
+        with self._lock:
+            now = self._clock()
+            if self._last_check is not None and now - self._last_check < self.check_seconds:
+                return
+            self._last_check = now
+        versions = self._version_loader()
+        if not versions and self._versions:
+            return                                     # DB hiccup — keep what we have
+        with self._lock:
+            self._versions = versions
+            for sk, entry in list(self._entries.items()):
+                if versions.get(sk, 0) != entry.version:
+                    del self._entries[sk]
+                    self._counters["invalidated"] += 1
+
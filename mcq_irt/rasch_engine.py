@@ -8,16 +8,30 @@ FORMULA:  P(correct | θ, b) = 1 / (1 + e^-(θ-b))
 
 MATCHES SENIOR'S NOTEBOOK:
   ✅ update_theta()         — same alpha=0.3, same formula
+  ✅ estimators             — step (α update, default), MLE (Newton-Raphson),
+                              EAP (NumPy quadrature grid) — pluggable per session
   ✅ update_b_online()      — b drifts per response (alpha_b=0.03)
   ✅ calibrate_b()          — log-odds batch recalibration after N responses
   ✅ select_question()      — b≈θ + random tie-breaking + step-down on wrong
+  ✅ SortedBIndex           — same selection in O(log n) over an item_bank.ItemPool
   ✅ fisher_info()          — Fisher information I(θ,b) = P(1-P)
   ✅ se_theta()             — Standard error of θ estimate
   ✅ SkillSession class     — mirrors StudentSession from Cell 3
+  ✅ CategoryTracker        — θ / SE per open-ended interview category
+  ✅ ResponseLog            — compact column store for SkillSession answers
+  ✅ StoppingRule           — variable-length sessions (SE target / plateau)
 """
 
 import math
 import random
+from array import array
+
+import numpy as np
+
+try:
+    from .item_bank import TIE_NOISE, ItemPool
+except ImportError:               # imported from inside mcq_irt/ (mcq_app.py)
+    from item_bank import TIE_NOISE, ItemPool
 
 # ── Constants (from senior's CFG dict) ───────────────────────────────────────
 ALPHA               = 0.3     # θ learning rate
@@ -58,6 +72,127 @@ def update_theta(theta: float, b: float, is_correct: bool) -> float:
     return float(max(THETA_MIN, min(THETA_MAX, new_theta)))
 
 
+# ── Ability estimators ───────────────────────────────────────────────────────
+#
+# Every estimator is a small stateful object owned by one session:
+#   est.update(b, y) -> new θ     y = 1/0 for MCQ, score/100 for open-ended
+#   est.theta                     current estimate
+#   est.se                        the estimator's own SE(θ), or None to let the
+#                                 session use its running Fisher-information SE
+# Pick one by name: make_estimator("step" | "mle" | "eap").
+
+class StepEstimator:
+    """The original fixed-step update: θ += ALPHA × (y − P). Default."""
+
+    name = "step"
+
+    def __init__(self, theta: float = THETA_INIT):
+        self.theta = theta
+        self.se    = None
+
+    def update(self, b: float, y: float) -> float:
+        new_theta  = self.theta + ALPHA * (y - p_correct(self.theta, b))
+        self.theta = float(max(THETA_MIN, min(THETA_MAX, new_theta)))
+        return self.theta
+
+
+class MLEEstimator:
+    """
+    Maximum-likelihood θ by Newton-Raphson over all responses so far.
+
+      l'(θ)  = Σ (y_i − P_i)        l''(θ) = −Σ P_i (1 − P_i)
+      SE     = 1 / sqrt(Σ P_i (1 − P_i)) at θ̂
+
+    The MLE does not exist while every answer is right (or every answer
+    wrong), so until the pattern is mixed θ moves with the step update.
+    """
+
+    name     = "mle"
+    MAX_ITER = 20
+    TOL      = 1e-6
+
+    def __init__(self, theta: float = THETA_INIT):
+        self.theta  = theta
+        self.se     = None
+        self._b     = array("d")
+        self._y     = array("d")
+        self._y_sum = 0.0
+        self._step  = StepEstimator(theta)
+
+    def update(self, b: float, y: float) -> float:
+        self._b.append(b)
+        self._y.append(y)
+        self._y_sum += y
+        n = len(self._y)
+
+        if self._y_sum <= 0.0 or self._y_sum >= n:
+            self._step.theta = self.theta
+            self.theta = self._step.update(b, y)
+            return self.theta
+
+        theta, info = self.theta, 0.0
+        for _ in range(self.MAX_ITER):
+            grad, info = 0.0, 0.0
+            for bi, yi in zip(self._b, self._y):
+                p     = p_correct(theta, bi)
+                grad += yi - p
+                info += p * (1.0 - p)
+            if info <= 0:
+                break
+            step  = max(-1.0, min(1.0, grad / info))
+            theta = max(THETA_MIN, min(THETA_MAX, theta + step))
+            if abs(step) < self.TOL:
+                break
+        self.theta = float(theta)
+        self.se    = se_from_info(info)
+        return self.theta
+
+
+class EAPEstimator:
+    """
+    Expected a-posteriori θ on a fixed quadrature grid (NumPy).
+
+    The log-posterior over GRID_POINTS θ values starts as a N(0, PRIOR_SD)
+    prior and each response adds its log-likelihood — one vector op per
+    answer, no re-scan of the history. θ is the posterior mean and SE the
+    posterior standard deviation.
+    """
+
+    name        = "eap"
+    GRID_POINTS = 61
+    PRIOR_SD    = 1.0
+
+    def __init__(self, theta: float = THETA_INIT):
+        self.grid     = np.linspace(THETA_MIN, THETA_MAX, self.GRID_POINTS)
+        self.log_post = -0.5 * ((self.grid - theta) / self.PRIOR_SD) ** 2
+        self.theta    = theta
+        self.se       = None
+
+    def update(self, b: float, y: float) -> float:
+        p = 1.0 / (1.0 + np.exp(-(self.grid - b)))
+        self.log_post += y * np.log(p) + (1.0 - y) * np.log1p(-p)
+        w  = np.exp(self.log_post - self.log_post.max())
+        w /= w.sum()
+        mean       = float(w @ self.grid)
+        self.theta = mean
+        self.se    = round(float(np.sqrt(w @ (self.grid - mean) ** 2)), 4)
+        return self.theta
+
+
+ESTIMATORS = {cls.name: cls for cls in (StepEstimator, MLEEstimator, EAPEstimator)}
+
+
+def make_estimator(estimator="step", theta: float = THETA_INIT):
+    """Estimator instance from a name in ESTIMATORS (instances pass through)."""
+    if not isinstance(estimator, str):
+        return estimator
+    try:
+        return ESTIMATORS[estimator](theta)
+    except KeyError:
+        raise ValueError(f"unknown estimator {estimator!r}, "
+                         f"choose from {sorted(ESTIMATORS)}") from None
+
+
 def update_b_online(b: float, theta: float, is_correct: bool) -> float:
     """
     Online b update — called after every answer (from senior's Cell 1).
@@ -109,7 +244,12 @@ def se_theta(responses: list[dict]) -> float:
     if not responses:
         return 1.0
     total = sum(fisher_info(r["theta_before"], r["b_used"]) for r in responses)
-    return round(1.0 / math.sqrt(total), 4) if total > 0 else 1.0
+    return se_from_info(total)
+
+
+def se_from_info(info_total: float) -> float:
+    """SE(θ) from an already-summed Fisher information (same rounding as se_theta)."""
+    return round(1.0 / math.sqrt(info_total), 4) if info_total > 0 else 1.0
 
 
 def select_question(pool: list[dict], theta: float,
@@ -144,6 +284,60 @@ def select_question(pool: list[dict], theta: float,
     )
 
 
+class SortedBIndex:
+    """
+    One student's view of a pool sorted by b_param: O(log n) select_question().
+
+    The nearest-b search is item_bank.ItemPool's — bisect for θ, walk
+    outward over the asked-mask, the step-down to b <= θ after a wrong
+    answer, and U(0, 1e-4) noise drawn only for items within 1e-4 of the
+    best distance. This class adds the student's mask, so list pools and
+    shared ItemPool snapshots are served by the same code.
+
+    A list pool is indexed once into a private ItemPool (asked items
+    dropped), compacted once more than half of it has been asked, and its
+    tie-break noise is seeded from the `random` module. An ItemPool is used
+    as is — it may be shared, so it is never rebuilt here.
+    """
+
+    TIE_NOISE = TIE_NOISE
+
+    def __init__(self, pool, asked_ids=()):
+        self._owned = not isinstance(pool, ItemPool)
+        if self._owned:
+            asked = set(asked_ids)
+            self._build(q for q in pool if q["question_id"] not in asked)
+        else:
+            self.pool = pool
+            self.mask = pool.new_mask(asked_ids)
+            self.left = int(self.mask.sum())
+
+    def _build(self, questions):
+        self.pool = ItemPool(list(questions), np.random.default_rng(random.getrandbits(64)))
+        self.mask = self.pool.new_mask()
+        self.left = len(self.pool)
+
+    @property
+    def items(self) -> list[dict]:
+        return self.pool.questions
+
+    def __len__(self) -> int:
+        return self.left
+
+    def remove(self, question_id: str):
+        """Mark a question as asked."""
+        i = self.pool.index.get(question_id)
+        if i is None or not self.mask[i]:
+            return
+        self.mask[i] = False
+        self.left   -= 1
+        if self._owned and self.left * 2 < len(self.pool):
+            self._build(q for q, ok in zip(self.pool.questions, self.mask) if ok)
+
+    def select(self, theta: float, last_correct=None) -> dict | None:
+        return self.pool.select(theta, self.mask, last_correct)
+
+
 def theta_to_proficiency(theta: float) -> dict:
     """Convert θ to proficiency score, label and color."""
     score = round(100.0 / (1.0 + math.exp(-theta)), 1)
@@ -160,6 +354,128 @@ def compute_overall_theta(skill_thetas: dict) -> float:
     return round(sum(skill_thetas.values()) / len(skill_thetas), 4)
 
 
+# ── StoppingRule — variable-length adaptive sessions ─────────────────────────
+
+class StoppingRule:
+    """
+    When to end a skill / category before its fixed length is used up.
+
+      se_target      stop once SE(θ) <= se_target
+      plateau_delta  stop once |Δθ| < plateau_delta for plateau_window answers
+      min_items      neither rule fires before this many answers
+
+    The fixed length (SkillSession.quiz_length, CategoryTracker.max_items)
+    stays the hard cap. check() returns the reason as a string, or None.
+    """
+
+    def __init__(self, se_target: float | None = None, min_items: int = 5,
+                 plateau_delta: float | None = None, plateau_window: int = 3):
+        self.se_target      = se_target
+        self.min_items      = min_items
+        self.plateau_delta  = plateau_delta
+        self.plateau_window = plateau_window
+
+    def check(self, n_items: int, se: float, deltas,
+              max_items: int | None = None) -> str | None:
+        """
+        n_items: answers so far · se: current SE(θ)
+        deltas:  θ_after − θ_before of the most recent answers (oldest first)
+        """
+        if max_items is not None and n_items >= max_items:
+            return "max_items"
+        if n_items < self.min_items:
+            return None
+        if self.se_target is not None and se <= self.se_target:
+            return "se_target"
+        if (self.plateau_delta is not None and len(deltas) >= self.plateau_window
+                and all(abs(d) < self.plateau_delta for d in deltas[-self.plateau_window:])):
+            return "plateau"
+        return None
+
+
+# ── ResponseLog — compact per-session answer history ─────────────────────────
+
+class ResponseLog:
+    """
+    Column-oriented replacement for SkillSession's list of response dicts.
+
+    A response used to be a ~25-key dict per answer, kept in st.session_state
+    for every concurrent student. Here numeric fields live in typed
+    array.array columns and question text / options / explanation are not
+    stored at all — each row keeps a reference to its question dict (the
+    pool's own object), and to_dict() rebuilds the old record on demand.
+
+    Behaves like the old list where callers relied on it:
+      len(log), log[i] / log[-1] (dicts), iteration (dicts), bool(log)
+    """
+
+    FLOAT_FIELDS = ("b_used", "b_after_online", "b_final", "theta_before",
+                    "theta_after", "p_correct_irt", "surprise",
+                    "proficiency_before", "proficiency_after")
+    B_SOURCES    = ("online", "calibrated")
+
+    __slots__ = ("skill", "questions", "selected", "is_correct", "b_source",
+                 "n_correct") + FLOAT_FIELDS
+
+    def __init__(self, skill: str):
+        self.skill      = skill
+        self.questions  = []           # question dicts (shared with the pool)
+        self.selected   = []           # selected option letters
+        self.is_correct = array("b")
+        self.b_source   = array("b")   # index into B_SOURCES
+        self.n_correct  = 0
+        for f in self.FLOAT_FIELDS:
+            setattr(self, f, array("d"))
+
+    def append(self, question: dict, record: dict):
+        """Store one record built by SkillSession.record_answer()."""
+        self.questions.append(question)
+        self.selected.append(record["selected_option"])
+        self.is_correct.append(1 if record["is_correct"] else 0)
+        self.b_source.append(self.B_SOURCES.index(record["b_source"]))
+        self.n_correct += 1 if record["is_correct"] else 0
+        for f in self.FLOAT_FIELDS:
+            getattr(self, f).append(record[f])
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def __getitem__(self, i: int) -> dict:
+        if i < 0:
+            i += len(self.questions)
+        return self.to_dict(i)
+
+    def __iter__(self):
+        for i in range(len(self.questions)):
+            yield self.to_dict(i)
+
+    def to_dict(self, i: int) -> dict:
+        """The full response record, same keys as before."""
+        q = self.questions[i]
+        record = {
+            "q_number":        i + 1,
+            "question_id":     q["question_id"],
+            "skill":           self.skill,
+            "question_text":   q["question_text"],
+            "selected_option": self.selected[i],
+            "correct_option":  q["correct_option"],
+            "is_correct":      bool(self.is_correct[i]),
+            "b_source":        self.B_SOURCES[self.b_source[i]],
+            "difficulty_tier": q.get("difficulty_tier", "medium"),
+            "explanation":     q.get("explanation", ""),
+            "option_a":        q.get("option_a", ""),
+            "option_b":        q.get("option_b", ""),
+            "option_c":        q.get("option_c", ""),
+            "option_d":        q.get("option_d", ""),
+        }
+        for f in self.FLOAT_FIELDS:
+            record[f] = getattr(self, f)[i]
+        return record
+
+    def to_dicts(self) -> list[dict]:
+        return [self.to_dict(i) for i in range(len(self.questions))]
+
+
 # ── SkillSession — mirrors StudentSession from senior's Cell 3 ────────────────
 
 class SkillSession:
@@ -178,14 +494,20 @@ class SkillSession:
       ✅ last_correct tracked for step-down selection
     """
 
-    def __init__(self, skill: str, quiz_length: int = 15):
+    def __init__(self, skill: str, quiz_length: int = 15, estimator="step",
+                 stopping: StoppingRule | None = None):
         self.skill        = skill
-        self.quiz_length  = quiz_length
-        self.theta        = THETA_INIT
+        self.quiz_length  = quiz_length            # hard cap on questions
+        self.stopping     = stopping               # None → always quiz_length
+        self.estimator    = make_estimator(estimator)
+        self.theta        = self.estimator.theta
         self.theta_se     = 1.0
-        self.responses    = []         # list of response dicts
+        self.responses    = ResponseLog(skill)   # compact; iterates as dicts
         self.asked_ids    = set()
         self.last_correct = None       # tracks last answer for selection
+        self.info_total   = 0.0        # running Σ Fisher info → O(1) SE updates
+        self._pool_src    = None       # pool the view below was built for
+        self._pool_view   = None       # SortedBIndex: the pool + this student's mask
 
     # ── Properties ───────────────────────────────────────────────────────
 
@@ -193,13 +515,24 @@ class SkillSession:
     def q_number(self) -> int:
         return len(self.responses) + 1
 
+    @property
+    def stop_reason(self) -> str | None:
+        """"max_items", "se_target", "plateau" — or None while still running."""
+        n = len(self.responses)
+        if self.stopping is None:
+            return "max_items" if n >= self.quiz_length else None
+        w      = self.stopping.plateau_window
+        deltas = [a - b for a, b in zip(self.responses.theta_after[-w:],
+                                        self.responses.theta_before[-w:])]
+        return self.stopping.check(n, self.theta_se, deltas, self.quiz_length)
+
     @property
     def done(self) -> bool:
-        return len(self.responses) >= self.quiz_length
+        return self.stop_reason is not None
 
     @property
     def correct_count(self) -> int:
-        return sum(1 for r in self.responses if r["is_correct"])
+        return self.responses.n_correct
 
     @property
     def proficiency(self) -> dict:
@@ -207,9 +540,17 @@ class SkillSession:
 
     # ── Core methods ─────────────────────────────────────────────────────
 
-    def next_question(self, pool: list[dict]) -> dict | None:
-        """Pick next question from pool using adaptive selection."""
-        return select_question(pool, self.theta, self.asked_ids, self.last_correct)
+    def next_question(self, pool) -> dict | None:
+        """
+        Pick next question from pool using adaptive selection.
+        pool: list of question dicts or an item_bank.ItemPool; either way a
+        SortedBIndex holds it with this session's asked-mask. The view is
+        rebuilt only when a different pool is passed in.
+        """
+        if self._pool_src is not pool:
+            self._pool_src  = pool
+            self._pool_view = SortedBIndex(pool, self.asked_ids)
+        return self._pool_view.select(self.theta, self.last_correct)
 
     def record_answer(self, question: dict, selected_option: str) -> dict:
         """
@@ -225,8 +566,8 @@ class SkillSession:
         surprise    = int(is_correct) - p_pred
         theta_before = self.theta
 
-        # ── 1. Update θ ───────────────────────────────────────────────
-        self.theta = update_theta(self.theta, b_used, is_correct)
+        # ── 1. Update θ (step / MLE / EAP) ────────────────────────────
+        self.theta = self.estimator.update(b_used, int(is_correct))
         self.last_correct = is_correct
 
         # ── 2. Online b update (mirrors senior Cell 3 QB write-back) ──
@@ -234,16 +575,22 @@ class SkillSession:
 
         # ── 3. Batch b calibration ────────────────────────────────────
         # Count how many times this question has been answered (across all sessions)
-        # This is tracked in DB — passed in via question dict if available
+        # This is tracked in DB — passed in via question dict if available.
+        # The DB write-back recomputes b from its own current counters; this
+        # is the session's local view of the same rule. Items calibrated by
+        # the offline JMLE job (b_calibrated_at) only take the online step.
         resp_count = question.get("response_count", 0) + 1
         corr_count = question.get("correct_count", 0) + (1 if is_correct else 0)
-        b_calibrated = calibrate_b(resp_count, corr_count)
+        b_calibrated = (None if question.get("b_calibrated_at")
+                        else calibrate_b(resp_count, corr_count))
         b_final      = b_calibrated if b_calibrated is not None else b_after_online
         b_source     = "calibrated" if b_calibrated is not None else "online"
 
-        # ── 4. Update SE(θ) ───────────────────────────────────────────
+        # ── 4. Update SE(θ) — running Fisher total, no re-sum ─────────
+        self.info_total += fisher_info(theta_before, b_used)
         self.asked_ids.add(question["question_id"])
-        self.theta_se = se_theta(self.responses)  # before appending
+        if self._pool_view is not None:
+            self._pool_view.remove(question["question_id"])
 
         # ── 5. Build response record ──────────────────────────────────
         record = {
@@ -271,9 +618,9 @@ class SkillSession:
             "option_c":          question.get("option_c", ""),
             "option_d":          question.get("option_d", ""),
         }
-        self.responses.append(record)
-        # Update SE after appending
-        self.theta_se = se_theta(self.responses)
+        self.responses.append(question, record)
+        self.theta_se = (self.estimator.se if self.estimator.se is not None
+                         else se_from_info(self.info_total))
         return record
 
     def summary(self) -> dict:
@@ -287,6 +634,65 @@ class SkillSession:
             "proficiency_label": prof["label"],
             "proficiency_color": prof["color"],
             "questions_answered": len(self.responses),
+            "stop_reason":        self.stop_reason,
             "questions_correct":  self.correct_count,
             "accuracy_pct":       round(self.correct_count / max(len(self.responses), 1) * 100, 1),
-        }
\ No newline at end of file
+        }
+
+
+# ── CategoryTracker — open-ended interview categories ─────────────────────────
+
+class CategoryTracker:
+    """
+    θ and SE(θ) for one open-ended interview category.
+
+    Answers are scored 0–100 by the LLM evaluator, so the Rasch update uses
+    the fractional score as y:  θ_new = θ + α × (score/100 − P(θ, b)).
+    Fisher information is summed as answers arrive, so SE is O(1) per
+    answer instead of re-summing the category's whole history.
+    Any estimator from ESTIMATORS can replace the step update.
+    """
+
+    def __init__(self, category: str, estimator="step",
+                 stopping: StoppingRule | None = None, max_items: int | None = None):
+        self.category   = category
+        self.stopping   = stopping
+        self.max_items  = max_items
+        self.estimator  = make_estimator(estimator)
+        self.theta      = self.estimator.theta
+        self.theta_se   = 1.0
+        self.info_total = 0.0
+        self.responses  = []           # theta_before, b_used, frac_correct, surprise, theta_after
+        self.asked_ids  = set()
+
+    def record(self, question_id: str, b: float, frac_correct: float) -> dict:
+        """Apply one scored answer; returns the response record (incl. p_pred, se)."""
+        theta_before = self.theta
+        p_pred       = p_correct(theta_before, b)
+        surprise     = frac_correct - p_pred
+        self.theta   = self.estimator.update(b, frac_correct)
+
+        self.info_total += fisher_info(theta_before, b)
+        self.theta_se    = (self.estimator.se if self.estimator.se is not None
+                            else se_from_info(self.info_total))
+        self.asked_ids.add(question_id)
+
+        record = {"theta_before": theta_before, "b_used": b,
+                  "frac_correct": frac_correct, "surprise": surprise,
+                  "theta_after":  self.theta}
+        self.responses.append(record)
+        return {**record, "p_pred": p_pred, "se": self.theta_se}
+
+    @property
+    def stop_reason(self) -> str | None:
+        n = len(self.responses)
+        if self.stopping is None:
+            return ("max_items" if self.max_items is not None and n >= self.max_items
+                    else None)
+        deltas = [r["theta_after"] - r["theta_before"]
+                  for r in self.responses[-self.stopping.plateau_window:]]
+        return self.stopping.check(n, self.theta_se, deltas, self.max_items)
+
+    @property
+    def done(self) -> bool:
+        return self.stop_reason is not None
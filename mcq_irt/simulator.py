@@ -0,0 +1,390 @@
+"""
+simulator.py
+Offline CAT simulation harness for the Rasch engine — no DB, no Streamlit.
+
+A simulated examinee has a known true θ and answers each item correctly
+with probability P(θ_true, b_true). Running populations of them through
+SkillSession shows how well (and how fast) the engine recovers θ, so
+ALPHA, ALPHA_B, CALIB_MIN_RESPONSES, the estimator, the stopping rule and
+the selection rule can be tuned without real candidates.
+
+REPORTS:
+  ✅ bias / RMSE of θ̂ — overall and per true-θ band
+  ✅ test length      — mean / min / max items, stop reasons
+  ✅ item exposure    — max exposure rate, unused items, items over 20%
+  ✅ b recovery       — RMSE of the bank's b vs b_true after online
+                        updates / calibration (when b starts miscalibrated)
+
+Sessions are split into chunks and run in a ProcessPoolExecutor. Each
+chunk applies b write-backs to its OWN copy of the bank, in the order its
+sessions run — like one app server writing to the DB. Results depend only
+on the seed and chunk size, not on the number of workers.
+
+USAGE (from inside mcq_irt/, like mcq_app.py):
+  python simulator.py --examinees 100000
+  python simulator.py --bank synthetic:2000 --b-noise 0.5 --alpha-b 0.05
+  python simulator.py --estimator eap --se-target 0.5 --population uniform
+
+    bank = load_bank()                            # mcq_data.json, skill → items
+    bank = synthetic_bank(500)                    # or b ~ U[B_MIN, B_MAX]
+    res  = simulate_session(0.8, bank["Python"], estimator="eap")
+    rep  = run_simulation(bank, make_population(10_000), workers=4)
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from . import rasch_engine as irt
+except ImportError:               # run as a script from inside mcq_irt/
+    import rasch_engine as irt
+
+MCQ_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcq_data.json")
+
+SELECTIONS   = ("nearest", "random")
+THETA_BANDS  = [(-3.0, -1.5), (-1.5, -0.5), (-0.5, 0.5), (0.5, 1.5), (1.5, 3.0)]
+HIGH_EXPOSURE = 0.20              # share of sessions above which an item is over-exposed
+
+
+# ── Item banks ────────────────────────────────────────────────────────────────
+
+def load_bank(path: str = MCQ_DATA_PATH) -> dict[str, list[dict]]:
+    """skill → question dicts from an mcq_data.json-style file."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    return {s["skill"]: [dict(q, skill=s["skill"]) for q in s["questions"]]
+            for s in data["skills"]}
+
+
+def synthetic_bank(n_items: int, skill: str = "Synthetic",
+                   seed: int = 0) -> dict[str, list[dict]]:
+    """One skill of n_items with b ~ U[B_MIN, B_MAX]."""
+    rnd = random.Random(seed)
+    return {skill: [{"question_id": f"{skill[:3].lower()}{i:06d}", "skill": skill,
+                     "b_param": round(rnd.uniform(irt.B_MIN, irt.B_MAX), 4),
+                     "correct_option": "a", "question_text": ""}
+                    for i in range(n_items)]}
+
+
+def miscalibrate(bank: dict, b_noise: float, seed: int = 0) -> dict:
+    """
+    Copy of bank where b_true is the original b and b_param is off by
+    N(0, b_noise) — the situation online updates / calibration must fix.
+    """
+    rnd = random.Random(seed)
+    out = {}
+    for skill, items in bank.items():
+        out[skill] = []
+        for q in items:
+            b = float(q["b_param"])
+            noisy = b + rnd.gauss(0.0, b_noise) if b_noise else b
+            out[skill].append(dict(q, b_true=b, response_count=0, correct_count=0,
+                                   b_param=max(irt.B_MIN, min(irt.B_MAX, noisy))))
+    return out
+
+
+# ── Populations ───────────────────────────────────────────────────────────────
+
+def make_population(n: int, dist: str = "normal", mean: float = 0.0,
+                    sd: float = 1.0, seed: int = 0) -> list[float]:
+    """
+    n true θ values, clipped to [THETA_MIN, THETA_MAX].
+    dist: "normal" (mean, sd) · "uniform" (whole θ range) · "fixed" (all = mean)
+    """
+    rnd = random.Random(seed)
+    if dist == "normal":
+        draw = lambda: rnd.gauss(mean, sd)
+    elif dist == "uniform":
+        draw = lambda: rnd.uniform(irt.THETA_MIN, irt.THETA_MAX)
+    elif dist == "fixed":
+        draw = lambda: mean
+    else:
+        raise ValueError(f"unknown population {dist!r} (normal | uniform | fixed)")
+    return [max(irt.THETA_MIN, min(irt.THETA_MAX, draw())) for _ in range(n)]
+
+
+# ── One examinee ──────────────────────────────────────────────────────────────
+
+def _true_b(q: dict) -> float:
+    return float(q.get("b_true", q["b_param"]))
+
+
+def simulate_session(true_theta: float, pool, quiz_length: int = 15,
+                     estimator="step", rng: random.Random | None = None,
+                     stopping: irt.StoppingRule | None = None,
+                     selection: str = "nearest", update_bank: bool = False) -> dict:
+    """
+    Run one simulated examinee through a SkillSession.
+
+    Answers are drawn from P(θ_true, b_true) (b_true defaults to b_param).
+    selection="random" serves a random unasked item — a baseline for the
+    b ≈ θ rule. update_bank=True writes b_final / counters back into the
+    question dicts, as the app does after every answer.
+
+    Returns:
+      {"true_theta", "theta", "se", "n_items", "stop_reason", "item_ids",
+       "theta_trace", "se_trace"}    # traces: value after each answer
+    """
+    if selection not in SELECTIONS:
+        raise ValueError(f"selection must be one of {SELECTIONS}")
+    rng  = rng or random.Random()
+    sess = irt.SkillSession("sim", quiz_length=quiz_length, estimator=estimator,
+                            stopping=stopping)
+    item_ids, theta_trace, se_trace = [], [], []
+    while not sess.done:
+        if selection == "random":
+            left = [q for q in pool if q["question_id"] not in sess.asked_ids]
+            q    = rng.choice(left) if left else None
+        else:
+            q = sess.next_question(pool)
+        if q is None:
+            break
+        correct = rng.random() < irt.p_correct(true_theta, _true_b(q))
+        rec = sess.record_answer(q, q["correct_option"] if correct else "_")
+        if update_bank:
+            q["b_param"]        = rec["b_final"]
+            q["response_count"] = q.get("response_count", 0) + 1
+            q["correct_count"]  = q.get("correct_count", 0) + int(correct)
+        item_ids.append(q["question_id"])
+        theta_trace.append(sess.theta)
+        se_trace.append(sess.theta_se)
+    return {
+        "true_theta":  true_theta,
+        "theta":       sess.theta,
+        "se":          sess.theta_se,
+        "n_items":     len(item_ids),
+        "stop_reason": sess.stop_reason or "pool_exhausted",
+        "item_ids":    item_ids,
+        "theta_trace": theta_trace,
+        "se_trace":    se_trace,
+    }
+
+
+def simulate_category(true_theta: float, pool: list[dict], max_items: int = 9,
+                      estimator="step", rng: random.Random | None = None,
+                      stopping: irt.StoppingRule | None = None,
+                      score_noise: float = 0.15) -> dict:
+    """
+    One open-ended interview category, as main_app runs it: the LLM grade
+    is simulated as P(θ_true, b) plus Gaussian noise, clipped to [0, 1].
+    Every answer is one LLM evaluation call.
+
+    Returns {"true_theta", "theta", "se", "n_items", "stop_reason"}.
+    """
+    rng     = rng or random.Random()
+    tracker = irt.CategoryTracker("sim", estimator, stopping=stopping, max_items=max_items)
+    while not tracker.done:
+        q = irt.select_question(pool, tracker.theta, tracker.asked_ids, None)
+        if q is None:
+            break
+        b     = float(q["b_param"])
+        score = irt.p_correct(true_theta, b) + rng.gauss(0.0, score_noise)
+        tracker.record(q["question_id"], b, min(1.0, max(0.0, score)))
+    return {
+        "true_theta":  true_theta,
+        "theta":       tracker.theta,
+        "se":          tracker.theta_se,
+        "n_items":     len(tracker.responses),
+        "stop_reason": tracker.stop_reason or "pool_exhausted",
+    }
+
+
+# ── Many examinees (process pool) ─────────────────────────────────────────────
+
+_KNOBS = {"alpha": "ALPHA", "alpha_b": "ALPHA_B", "calib_min": "CALIB_MIN_RESPONSES"}
+
+
+def _run_chunk(bank: dict, thetas: list[float], cfg: dict, seed: int) -> dict:
+    """Worker: run every examinee in `thetas` through every skill of the bank."""
+    saved = {}
+    for key, const in _KNOBS.items():
+        if cfg.get(key) is not None:
+            saved[const] = getattr(irt, const)
+            setattr(irt, const, cfg[key])
+    try:
+        # each chunk = one server with its own copy of the bank; seeding the
+        # module RNG too makes select_question's tie-break noise reproducible
+        bank     = {sk: [dict(q) for q in items] for sk, items in bank.items()}
+        rng      = random.Random(seed)
+        random.seed(seed)
+        rule     = cfg.get("stopping")
+        sessions = []                   # (skill, true θ, θ̂, n_items, stop_reason)
+        exposure = {}
+        for true_theta in thetas:
+            for skill, pool in bank.items():
+                res = simulate_session(true_theta, pool, cfg["quiz_length"],
+                                       cfg["estimator"], rng, rule,
+                                       cfg["selection"], cfg["update_bank"])
+                sessions.append((skill, true_theta, res["theta"], res["n_items"],
+                                 res["stop_reason"]))
+                for qid in res["item_ids"]:
+                    exposure[qid] = exposure.get(qid, 0) + 1
+        final_b = ({q["question_id"]: q["b_param"] for items in bank.values() for q in items}
+                   if cfg["update_bank"] else {})
+        return {"sessions": sessions, "exposure": exposure, "final_b": final_b}
+    finally:
+        for const, value in saved.items():
+            setattr(irt, const, value)
+
+
+def run_simulation(bank: dict, thetas: list[float], quiz_length: int = 15,
+                   estimator: str = "step", stopping: irt.StoppingRule | None = None,
+                   selection: str = "nearest", alpha: float | None = None,
+                   alpha_b: float | None = None, calib_min: int | None = None,
+                   update_bank: bool = True, workers: int | None = None,
+                   chunk_size: int = 2000, seed: int = 0) -> dict:
+    """
+    Run every θ in `thetas` through every skill of `bank`, in parallel.
+    alpha / alpha_b / calib_min override the engine constants for this run.
+    workers=1 runs in-process (no pool). Returns a report dict (see report()).
+    """
+    cfg = {"quiz_length": quiz_length, "estimator": estimator, "stopping": stopping,
+           "selection": selection, "alpha": alpha, "alpha_b": alpha_b,
+           "calib_min": calib_min, "update_bank": update_bank}
+    chunks = [thetas[i:i + chunk_size] for i in range(0, len(thetas), chunk_size)]
+    t0 = time.perf_counter()
+    if workers == 1 or len(chunks) <= 1:
+        parts = [_run_chunk(bank, c, cfg, seed + i) for i, c in enumerate(chunks)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_run_chunk, bank, c, cfg, seed + i)
+                       for i, c in enumerate(chunks)]
+            parts = [f.result() for f in futures]
+    elapsed = time.perf_counter() - t0
+    return _aggregate(bank, parts, elapsed)
+
+
+def _aggregate(bank: dict, parts: list[dict], elapsed: float) -> dict:
+    sessions = [s for p in parts for s in p["sessions"]]
+    exposure = {}
+    for p in parts:
+        for qid, n in p["exposure"].items():
+            exposure[qid] = exposure.get(qid, 0) + n
+
+    errors  = [est - true for _, true, est, _, _ in sessions]
+    lengths = [n for _, _, _, n, _ in sessions]
+    reasons = {}
+    for *_, why in sessions:
+        reasons[why] = reasons.get(why, 0) + 1
+
+    bands = []
+    for lo, hi in THETA_BANDS:
+        errs = [est - true for _, true, est, _, _ in sessions
+                if lo <= true < hi or (hi == irt.THETA_MAX and true == hi)]
+        if errs:
+            bands.append({"band": f"[{lo:+.1f}, {hi:+.1f}]", "n": len(errs),
+                          "bias": sum(errs) / len(errs),
+                          "rmse": math.sqrt(sum(e * e for e in errs) / len(errs))})
+
+    per_skill_sessions = {sk: 0 for sk in bank}
+    for skill, *_ in sessions:
+        per_skill_sessions[skill] += 1
+    rates = []
+    for skill, items in bank.items():
+        n_sess = max(per_skill_sessions[skill], 1)
+        rates += [exposure.get(q["question_id"], 0) / n_sess for q in items]
+
+    b_rmse = None
+    b_true = {q["question_id"]: q["b_true"] for items in bank.values()
+              for q in items if "b_true" in q}
+    finals = [p["final_b"] for p in parts if p["final_b"]]
+    if b_true and finals:
+        sq = [(sum(f[qid] for f in finals) / len(finals) - b) ** 2 for qid, b in b_true.items()]
+        b_rmse = math.sqrt(sum(sq) / len(sq))
+
+    n = len(sessions)
+    return {
+        "sessions":      n,
+        "seconds":       elapsed,
+        "bias":          sum(errors) / n if n else 0.0,
+        "rmse":          math.sqrt(sum(e * e for e in errors) / n) if n else 0.0,
+        "length_mean":   sum(lengths) / n if n else 0.0,
+        "length_min":    min(lengths, default=0),
+        "length_max":    max(lengths, default=0),
+        "stop_reasons":  {k: v / n for k, v in sorted(reasons.items())},
+        "bands":         bands,
+        "exposure_max":  max(rates, default=0.0),
+        "unused_items":  sum(1 for r in rates if r == 0) / max(len(rates), 1),
+        "overexposed":   sum(1 for r in rates if r > HIGH_EXPOSURE) / max(len(rates), 1),
+        "b_rmse":        b_rmse,
+    }
+
+
+def report(rep: dict) -> str:
+    lines = [
+        f"sessions      {rep['sessions']:,}  ({rep['seconds']:.1f} s, "
+        f"{rep['sessions'] / max(rep['seconds'], 1e-9):,.0f} sessions/s)",
+        f"θ bias        {rep['bias']:+.4f}",
+        f"θ RMSE        {rep['rmse']:.4f}",
+        f"test length   mean {rep['length_mean']:.2f} · min {rep['length_min']} · "
+        f"max {rep['length_max']}",
+        "stop reasons  " + ", ".join(f"{k} {v:.1%}" for k, v in rep["stop_reasons"].items()),
+        f"exposure      max {rep['exposure_max']:.1%} · unused {rep['unused_items']:.1%} · "
+        f"over {HIGH_EXPOSURE:.0%}: {rep['overexposed']:.1%} of items",
+    ]
+    if rep["b_rmse"] is not None:
+        lines.append(f"b recovery    RMSE(b, b_true) {rep['b_rmse']:.4f}")
+    lines.append("by true θ:")
+    for b in rep["bands"]:
+        lines.append(f"  {b['band']:<16} n={b['n']:<8,} bias {b['bias']:+.3f}  RMSE {b['rmse']:.3f}")
+    return "\n".join(lines)
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline CAT simulation for the Rasch engine.")
+    parser.add_argument("--examinees",   type=int, default=10_000)
+    parser.add_argument("--population",  default="normal", choices=("normal", "uniform", "fixed"))
+    parser.add_argument("--mean",        type=float, default=0.0)
+    parser.add_argument("--sd",          type=float, default=1.0)
+    parser.add_argument("--bank",        default="mcq_data",
+                        help="mcq_data | path/to/bank.json | synthetic:N")
+    parser.add_argument("--b-noise",     type=float, default=0.0,
+                        help="start with b_param = b_true + N(0, b-noise)")
+    parser.add_argument("--quiz-length", type=int, default=15)
+    parser.add_argument("--estimator",   default="step", choices=sorted(irt.ESTIMATORS))
+    parser.add_argument("--selection",   default="nearest", choices=SELECTIONS)
+    parser.add_argument("--se-target",   type=float, default=None)
+    parser.add_argument("--plateau",     type=float, default=None, help="plateau |Δθ| threshold")
+    parser.add_argument("--min-items",   type=int, default=5)
+    parser.add_argument("--alpha",       type=float, default=None, help=f"default {irt.ALPHA}")
+    parser.add_argument("--alpha-b",     type=float, default=None, help=f"default {irt.ALPHA_B}")
+    parser.add_argument("--calib-min",   type=int, default=None,
+                        help=f"default {irt.CALIB_MIN_RESPONSES}")
+    parser.add_argument("--no-bank-updates", action="store_true")
+    parser.add_argument("--workers",     type=int, default=None, help="default: CPU count")
+    parser.add_argument("--chunk-size",  type=int, default=2000)
+    parser.add_argument("--seed",        type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.bank == "mcq_data":
+        bank = load_bank()
+    elif args.bank.startswith("synthetic:"):
+        bank = synthetic_bank(int(args.bank.split(":", 1)[1]), seed=args.seed)
+    else:
+        bank = load_bank(args.bank)
+    bank = miscalibrate(bank, args.b_noise, seed=args.seed)
+
+    stopping = None
+    if args.se_target is not None or args.plateau is not None:
+        stopping = irt.StoppingRule(se_target=args.se_target, min_items=args.min_items,
+                                    plateau_delta=args.plateau)
+    thetas = make_population(args.examinees, args.population, args.mean, args.sd, args.seed)
+    rep = run_simulation(bank, thetas, args.quiz_length, args.estimator, stopping,
+                         args.selection, args.alpha, args.alpha_b, args.calib_min,
+                         not args.no_bank_updates, args.workers, args.chunk_size, args.seed)
+    print(f"bank: {', '.join(f'{sk} ({len(items)})' for sk, items in bank.items())} · "
+          f"population: {args.population} · estimator: {args.estimator} · "
+          f"selection: {args.selection}")
+    print(report(rep))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
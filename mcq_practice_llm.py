@@ -24,6 +24,8 @@ import html as html_module
 import streamlit as st
 from groq import Groq
 
+import llm_cache
+
 # ─────────────────────────────────────────────────────────────────────────────
 # CONSTANTS
 # ─────────────────────────────────────────────────────────────────────────────
@@ -184,13 +186,14 @@ def _generate_for_domain(domain: str, n: int) -> tuple:
         return [], "GROQ_API_KEY not found in environment variables."
     try:
         client   = Groq(api_key=api_key)
-        response = client.chat.completions.create(
+        raw = llm_cache.complete(
+            client, "mcq_practice.generate",
             model=GROQ_MODEL,
             messages=[{"role": "user", "content": _build_prompt(domain, n)}],
             temperature=0.7,
             max_tokens=4096,
-        )
-        raw = response.choices[0].message.content.strip()
+            accept=lambda t: "[" in t,
+        ).strip()
 
         # Strip markdown fences if model wraps output
         if "```" in raw:
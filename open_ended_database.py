@@ -6,42 +6,27 @@ Tables:
   oe_sessions           — one row per student open-ended session
   oe_session_questions  — questions generated for that session
   oe_responses          — student answers + AI evaluation
+  resume_extractions    — skill/project extraction per resume hash, so a
+                          re-uploaded resume skips the LLM (oe_sessions.resume_hash
+                          points at the extraction a session was built from)
 """
 
-import os
+import uuid
 import psycopg2
 import psycopg2.extras
+import db_pool
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 
 load_dotenv()
 
+BULK_PAGE_SIZE = 1000     # rows per multi-row INSERT statement
+
 
 def _get_conn():
-    """Get PostgreSQL connection to interview_coach database."""
+    """Borrow a connection from the shared pool (db_pool.py). conn.close() returns it."""
     try:
-        cfg = None
-        try:
-            import streamlit as st
-            cfg = st.secrets.get("postgres", {})
-        except Exception:
-            pass
-
-        if cfg:
-            return psycopg2.connect(
-                host=cfg.get("host", "localhost"),
-                port=cfg.get("port", 5432),
-                dbname=cfg.get("dbname", "interview_coach"),
-                user=cfg.get("user", "postgres"),
-                password=cfg.get("password", ""),
-            )
-        return psycopg2.connect(
-            host=os.environ.get("POSTGRES_HOST", "localhost"),
-            port=int(os.environ.get("POSTGRES_PORT", 5432)),
-            dbname=os.environ.get("POSTGRES_DB", "interview_coach"),
-            user=os.environ.get("POSTGRES_USER", "postgres"),
-            password=os.environ.get("POSTGRES_PASSWORD", ""),
-        )
+        return db_pool.getconn()
     except Exception as e:
         print(f"[OE DB] Connection error: {e}")
         return None
@@ -56,12 +41,41 @@ def test_connection() -> tuple[bool, str]:
     return True, "Connected"
 
 
+def init_db() -> bool:
+    """Add the resume extraction cache to databases created before it (idempotent)."""
+    conn = _get_conn()
+    if not conn:
+        return False
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS resume_extractions (
+                        resume_hash  CHAR(64) NOT NULL,
+                        extractor    VARCHAR(100) NOT NULL,
+                        skills_data  JSONB NOT NULL,
+                        hits         INT NOT NULL DEFAULT 0,
+                        created_at   TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                        last_used_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                        PRIMARY KEY (resume_hash, extractor)
+                    );
+                    ALTER TABLE oe_sessions ADD COLUMN IF NOT EXISTS resume_hash CHAR(64);
+                """)
+        return True
+    except Exception as e:
+        print(f"[OE DB] init_db error: {e}")
+        return False
+    finally:
+        conn.close()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SESSION MANAGEMENT
 # ─────────────────────────────────────────────────────────────────────────────
 
 def create_oe_session(student_name: str, student_email: str,
-                      skills_tested: list[str], mode: str = "open_ended") -> str | None:
+                      skills_tested: list[str], mode: str = "open_ended",
+                      resume_hash: str | None = None) -> str | None:
     """Create a new open-ended session. Returns session_id (UUID string)."""
     conn = _get_conn()
     if not conn:
@@ -70,10 +84,11 @@ def create_oe_session(student_name: str, student_email: str,
         with conn:
             with conn.cursor() as cur:
                 cur.execute("""
-                    INSERT INTO oe_sessions (student_name, student_email, skills_tested, mode)
-                    VALUES (%s, %s, %s, %s)
+                    INSERT INTO oe_sessions
+                        (student_name, student_email, skills_tested, mode, resume_hash)
+                    VALUES (%s, %s, %s, %s, %s)
                     RETURNING session_id
-                """, (student_name, student_email, skills_tested, mode))
+                """, (student_name, student_email, skills_tested, mode, resume_hash))
                 return str(cur.fetchone()[0])
     except Exception as e:
         print(f"[OE DB] create_oe_session error: {e}")
@@ -104,6 +119,55 @@ def complete_oe_session(session_id: str, total_score: float, overall_label: str)
         conn.close()
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# RESUME EXTRACTION CACHE
+# ─────────────────────────────────────────────────────────────────────────────
+
+def get_resume_extraction(resume_hash: str, extractor: str) -> dict | None:
+    """Cached extract_all_skills() result for this resume + extractor version, or None."""
+    conn = _get_conn()
+    if not conn:
+        return None
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE resume_extractions
+                    SET hits = hits + 1, last_used_at = NOW()
+                    WHERE resume_hash = %s AND extractor = %s
+                    RETURNING skills_data
+                """, (resume_hash, extractor))
+                row = cur.fetchone()
+        return row[0] if row else None
+    except Exception as e:
+        print(f"[OE DB] get_resume_extraction error: {e}")
+        return None
+    finally:
+        conn.close()
+
+
+def save_resume_extraction(resume_hash: str, extractor: str, skills_data: dict) -> bool:
+    """Store (or refresh) the extraction for this resume + extractor version."""
+    conn = _get_conn()
+    if not conn:
+        return False
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO resume_extractions (resume_hash, extractor, skills_data)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (resume_hash, extractor) DO UPDATE SET
+                        skills_data = EXCLUDED.skills_data, last_used_at = NOW()
+                """, (resume_hash, extractor, psycopg2.extras.Json(skills_data)))
+        return True
+    except Exception as e:
+        print(f"[OE DB] save_resume_extraction error: {e}")
+        return False
+    finally:
+        conn.close()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # QUESTION STORAGE (per session)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -111,48 +175,58 @@ def complete_oe_session(session_id: str, total_score: float, overall_label: str)
 def store_oe_questions(session_id: str, questions: list[dict]) -> list[dict]:
     """
     Store questions generated for a session.
-    Returns list of stored question references:
+    Returns list of stored question references, in the same order as `questions`:
       [{"session_question_id": str, "question_id": str|None}, ...]
 
     FIX: question_generator.py outputs the question text under the key "question",
     but the DB column is question_text. We accept both keys gracefully.
+
+    BULK: all rows go in one multi-row INSERT (execute_values) instead of one
+    INSERT ... RETURNING per question. session_question_id UUIDs are generated
+    here rather than by the DB default, so the question_id → session_question_id
+    mapping main_app.py needs for oe_question_map is known up front and does not
+    depend on the order Postgres returns rows in.
     """
+    if not questions:
+        return []
     conn = _get_conn()
     if not conn:
         return []
     try:
         stored_questions = []
+        rows = []
+        for q in questions:
+            # Accept "question_text" (DB/MCQ convention) or
+            # "question" (open-ended generator convention)
+            question_text = q.get("question_text") or q.get("question", "")
+            sq_id = str(uuid.uuid4())
+            rows.append((
+                sq_id,
+                session_id,
+                q.get("skill", ""),
+                q.get("category", ""),
+                question_text,
+                q.get("difficulty", "medium"),
+                q.get("b_param", 0.0),
+                q.get("type", "conceptual"),
+                q.get("model_answer", ""),
+                q.get("hints", []),
+                q.get("source", "llm"),
+            ))
+            stored_questions.append({
+                "session_question_id": sq_id,
+                "question_id": q.get("question_id"),
+            })
         with conn:
             with conn.cursor() as cur:
-                for q in questions:
-                    # Accept "question_text" (DB/MCQ convention) or
-                    # "question" (open-ended generator convention)
-                    question_text = q.get("question_text") or q.get("question", "")
-
-                    cur.execute("""
-                        INSERT INTO oe_session_questions
-                            (session_id, skill, category, question_text,
-                             difficulty, b_param, type, model_answer, hints, source)
-                        VALUES (%s::uuid, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        RETURNING session_question_id
-                    """, (
-                        session_id,
-                        q.get("skill", ""),
-                        q.get("category", ""),
-                        question_text,
-                        q.get("difficulty", "medium"),
-                        q.get("b_param", 0.0),
-                        q.get("type", "conceptual"),
-                        q.get("model_answer", ""),
-                        q.get("hints", []),
-                        q.get("source", "llm"),
-                    ))
-                    row = cur.fetchone()
-                    if row:
-                        stored_questions.append({
-                            "session_question_id": str(row[0]),
-                            "question_id": q.get("question_id"),
-                        })
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO oe_session_questions
+                        (session_question_id, session_id, skill, category, question_text,
+                         difficulty, b_param, type, model_answer, hints, source)
+                    VALUES %s
+                """, rows,
+                    template="(%s::uuid, %s::uuid, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                    page_size=BULK_PAGE_SIZE)
         return stored_questions
     except Exception as e:
         print(f"[OE DB] store_oe_questions error: {e}")
@@ -212,6 +286,39 @@ def save_oe_response(session_id: str, session_question_id: str, skill: str,
         conn.close()
 
 
+def save_oe_responses_batch(rows: list[dict]) -> str:
+    """
+    Write-behind flusher: many save_oe_response() rows in one multi-row INSERT.
+    Each row has the same keys as save_oe_response()'s arguments.
+    Returns error string or empty string.
+    """
+    if not rows:
+        return ""
+    conn = _get_conn()
+    if not conn:
+        return "DB connection failed"
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO oe_responses
+                        (session_id, session_question_id, skill, answer_text,
+                         confidence, score, feedback, evaluator_model)
+                    VALUES %s
+                """, [(r["session_id"], r["session_question_id"], r["skill"],
+                       r["answer_text"], r["confidence"], r["score"],
+                       r["feedback"], r.get("evaluator_model", "groq"))
+                      for r in rows],
+                    template="(%s::uuid, %s::uuid, %s, %s, %s, %s, %s, %s)",
+                    page_size=BULK_PAGE_SIZE)
+        return ""
+    except Exception as e:
+        print(f"[OE DB] save_oe_responses_batch error: {e}")
+        return str(e)
+    finally:
+        conn.close()
+
+
 def get_oe_session_responses(session_id: str) -> list[dict]:
     """Get all responses for a session."""
     conn = _get_conn()
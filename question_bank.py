@@ -0,0 +1,303 @@
+"""
+question_bank.py
+Cross-session bank of generated interview questions.
+
+Tables:
+  oe_question_bank    — one row per distinct question (hash of its text):
+                        model answer, b_param, confidence, times served
+  oe_bank_exposure    — servings per candidate (email) per bank question
+
+QuestionGenerator takes each (skill × difficulty) cell from the bank first
+— least-served questions with confidence >= QBANK_MIN_CONFIDENCE that the
+candidate has seen fewer than QBANK_MAX_EXPOSURE times — and banks what
+the LLM generates to fill the rest. Project questions are never banked.
+init_db() backfills an empty bank from oe_session_questions.
+
+CONFIG (environment):
+  QBANK_ENABLED          1        0 = always generate (no reuse)
+  QBANK_MAX_EXPOSURE     1        servings per candidate per question
+  QBANK_MIN_CONFIDENCE   medium   low | medium | high
+
+Usage:
+  python question_bank.py            # init / backfill, print bank size per skill
+"""
+
+import os
+import hashlib
+import threading
+
+import psycopg2
+import psycopg2.extras
+import db_pool
+
+QBANK_ENABLED        = os.environ.get("QBANK_ENABLED", "1") != "0"
+QBANK_MAX_EXPOSURE   = int(os.environ.get("QBANK_MAX_EXPOSURE", 1))
+QBANK_MIN_CONFIDENCE = os.environ.get("QBANK_MIN_CONFIDENCE", "medium")
+
+CONFIDENCE_LEVELS = ("low", "medium", "high")
+
+
+def _get_conn():
+    """Borrow a connection from the shared pool (db_pool.py). conn.close() returns it."""
+    try:
+        return db_pool.getconn()
+    except Exception as e:
+        print(f"[QBank] Connection error: {e}")
+        return None
+
+
+def question_hash(text: str) -> str:
+    """Bank key of a question — same as md5(lower(btrim(question_text))) in SQL."""
+    return hashlib.md5(text.strip().lower().encode("utf-8")).hexdigest()
+
+
+def _confidences_from(floor: str) -> list[str]:
+    return list(CONFIDENCE_LEVELS[CONFIDENCE_LEVELS.index(floor):])
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SCHEMA + BACKFILL
+# ─────────────────────────────────────────────────────────────────────────────
+
+def init_db() -> bool:
+    """Create the bank tables if missing; backfill from oe_session_questions while empty."""
+    conn = _get_conn()
+    if not conn:
+        return False
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS oe_question_bank (
+                        question_hash  CHAR(32) PRIMARY KEY,
+                        skill          VARCHAR(100) NOT NULL,
+                        skill_key      VARCHAR(100) NOT NULL,
+                        category       VARCHAR(100),
+                        difficulty     VARCHAR(20) NOT NULL,
+                        confidence     VARCHAR(20) NOT NULL DEFAULT 'medium',
+                        similarity     FLOAT,
+                        question_text  TEXT NOT NULL,
+                        model_answer   TEXT,
+                        hints          TEXT[],
+                        type           VARCHAR(50),
+                        b_param        FLOAT,
+                        times_served   INT NOT NULL DEFAULT 0,
+                        created_at     TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                        last_served_at TIMESTAMP WITH TIME ZONE
+                    );
+
+                    CREATE INDEX IF NOT EXISTS idx_oe_question_bank_cell
+                        ON oe_question_bank(skill_key, difficulty, confidence, times_served);
+
+                    CREATE TABLE IF NOT EXISTS oe_bank_exposure (
+                        student_email  VARCHAR(200) NOT NULL,
+                        question_hash  CHAR(32) NOT NULL,
+                        n              INT NOT NULL DEFAULT 1,
+                        last_served_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                        PRIMARY KEY (student_email, question_hash)
+                    );
+                """)
+                cur.execute("SELECT EXISTS (SELECT 1 FROM oe_question_bank)")
+                if not cur.fetchone()[0]:
+                    _backfill(cur)
+        return True
+    except Exception as e:
+        print(f"[QBank] init_db error: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+def _backfill(cur):
+    """Bank every distinct non-project question already stored for past sessions."""
+    cur.execute("""
+        INSERT INTO oe_question_bank
+            (question_hash, skill, skill_key, category, difficulty, confidence, similarity,
+             question_text, model_answer, hints, type, b_param)
+        SELECT DISTINCT ON (md5(lower(btrim(question_text))))
+               md5(lower(btrim(question_text))), skill, lower(skill), category,
+               COALESCE(difficulty, 'medium'), 'medium', NULL,
+               question_text, model_answer, hints, type, b_param
+        FROM oe_session_questions
+        WHERE COALESCE(type, '') <> 'project' AND COALESCE(category, '') <> 'Project'
+          AND btrim(question_text) <> '' AND btrim(skill) <> ''
+        ORDER BY md5(lower(btrim(question_text))), created_at DESC
+        ON CONFLICT (question_hash) DO NOTHING
+    """)
+    cur.execute("""
+        INSERT INTO oe_bank_exposure (student_email, question_hash, n)
+        SELECT s.student_email, md5(lower(btrim(q.question_text))), COUNT(*)
+        FROM oe_session_questions q JOIN oe_sessions s ON s.session_id = q.session_id
+        WHERE COALESCE(q.type, '') <> 'project' AND COALESCE(q.category, '') <> 'Project'
+        GROUP BY 1, 2
+        ON CONFLICT (student_email, question_hash) DO NOTHING
+    """)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BANK
+# ─────────────────────────────────────────────────────────────────────────────
+
+class QuestionBank:
+    """
+    take() / add() for QuestionGenerator, plus in-process reuse stats.
+    A bank whose database is unreachable serves nothing (everything is
+    generated, as before) and never raises.
+    """
+
+    def __init__(self, max_exposure: int = QBANK_MAX_EXPOSURE,
+                 min_confidence: str = QBANK_MIN_CONFIDENCE):
+        self.max_exposure = max_exposure
+        self.confidences  = _confidences_from(min_confidence)
+        self.available    = init_db()
+        self._lock  = threading.Lock()
+        self._stats = {"cells": 0, "cells_full": 0, "requested": 0, "served": 0,
+                       "generated": 0, "llm_calls_saved": 0}
+
+    def take(self, skill: str, difficulty: str, n: int, candidate: str = "") -> list[dict]:
+        """
+        Up to n bank questions for one cell that `candidate` has been served
+        fewer than max_exposure times, least-served first. The servings are
+        recorded in the same statement. Returns generator-shaped dicts
+        (source "bank").
+        """
+        rows = []
+        if self.available and n > 0:
+            conn = _get_conn()
+            if conn:
+                try:
+                    with conn:
+                        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                            cur.execute("""
+                                WITH picked AS (
+                                    SELECT b.* FROM oe_question_bank b
+                                    LEFT JOIN oe_bank_exposure e
+                                           ON e.question_hash = b.question_hash
+                                          AND e.student_email = %(email)s
+                                    WHERE b.skill_key = lower(%(skill)s)
+                                      AND b.difficulty = %(difficulty)s
+                                      AND b.confidence = ANY(%(conf)s)
+                                      AND COALESCE(e.n, 0) < %(max_exposure)s
+                                    ORDER BY b.times_served ASC, random()
+                                    LIMIT %(n)s
+                                ), served AS (
+                                    UPDATE oe_question_bank b
+                                    SET times_served = b.times_served + 1,
+                                        last_served_at = NOW()
+                                    FROM picked p WHERE b.question_hash = p.question_hash
+                                ), exposed AS (
+                                    INSERT INTO oe_bank_exposure (student_email, question_hash)
+                                    SELECT %(email)s, question_hash FROM picked
+                                    WHERE %(email)s <> ''
+                                    ON CONFLICT (student_email, question_hash) DO UPDATE SET
+                                        n = oe_bank_exposure.n + 1, last_served_at = NOW()
+                                )
+                                SELECT * FROM picked
+                            """, {"email": candidate or "", "skill": skill,
+                                  "difficulty": difficulty, "conf": self.confidences,
+                                  "max_exposure": self.max_exposure, "n": n})
+                            rows = cur.fetchall()
+                except Exception as e:
+                    print(f"[QBank] take error: {e}")
+                    rows = []
+                finally:
+                    conn.close()
+
+        with self._lock:
+            self._stats["cells"]     += 1
+            self._stats["requested"] += n
+            self._stats["served"]    += len(rows)
+            if n and len(rows) == n:
+                self._stats["cells_full"] += 1
+        return [{
+            "skill":        r["skill"],
+            "category":     r["category"],
+            "difficulty":   r["difficulty"],
+            "question":     r["question_text"],
+            "type":         r["type"] or "conceptual",
+            "hints":        list(r["hints"] or []),
+            "model_answer": r["model_answer"] or "",
+            "b_param":      float(r["b_param"] if r["b_param"] is not None else 0.0),
+            "b_reasoning":  "Reused from question bank",
+            "confidence":   r["confidence"],
+            "similarity":   r["similarity"] if r["similarity"] is not None else 1.0,
+            "source":       "bank",
+        } for r in rows]
+
+    def add(self, questions: list[dict], candidate: str = "") -> int:
+        """
+        Bank newly generated questions (duplicates by text are ignored) and
+        count them as served to `candidate`. Returns rows added.
+        """
+        rows = [(question_hash(q["question"]), q.get("skill", ""), q.get("skill", "").lower(),
+                 q.get("category"), q.get("difficulty", "medium"),
+                 q.get("confidence", "medium"), q.get("similarity"),
+                 q["question"], q.get("model_answer", ""), q.get("hints", []),
+                 q.get("type", "conceptual"), q.get("b_param", 0.0))
+                for q in questions
+                if q.get("question", "").strip() and q.get("type") != "project"]
+        with self._lock:
+            self._stats["generated"] += len(rows)
+        if not (self.available and rows):
+            return 0
+        conn = _get_conn()
+        if not conn:
+            return 0
+        try:
+            with conn:
+                with conn.cursor() as cur:
+                    added = psycopg2.extras.execute_values(cur, """
+                        INSERT INTO oe_question_bank
+                            (question_hash, skill, skill_key, category, difficulty, confidence,
+                             similarity, question_text, model_answer, hints, type, b_param)
+                        VALUES %s
+                        ON CONFLICT (question_hash) DO NOTHING
+                        RETURNING question_hash
+                    """, rows, fetch=True)
+                    if candidate:
+                        psycopg2.extras.execute_values(cur, """
+                            INSERT INTO oe_bank_exposure (student_email, question_hash)
+                            VALUES %s
+                            ON CONFLICT (student_email, question_hash) DO UPDATE SET
+                                n = oe_bank_exposure.n + 1, last_served_at = NOW()
+                        """, sorted({(candidate, r[0]) for r in rows}))
+            return len(added)
+        except Exception as e:
+            print(f"[QBank] add error: {e}")
+            return 0
+        finally:
+            conn.close()
+
+    def saved(self, llm_calls: int):
+        """Record LLM round trips a caller skipped thanks to take()."""
+        with self._lock:
+            self._stats["llm_calls_saved"] += llm_calls
+
+    def stats(self) -> dict:
+        """Reuse counters since start: hit_ratio = served / requested questions."""
+        with self._lock:
+            s = dict(self._stats)
+        s["hit_ratio"] = round(s["served"] / s["requested"], 3) if s["requested"] else 0.0
+        return s
+
+
+def bank_sizes() -> dict[str, int]:
+    """skill → number of banked questions."""
+    conn = _get_conn()
+    if not conn:
+        return {}
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT skill_key, COUNT(*) FROM oe_question_bank GROUP BY 1 ORDER BY 1")
+            return {k: int(n) for k, n in cur.fetchall()}
+    except Exception as e:
+        print(f"[QBank] bank_sizes error: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    print("init:", "ok" if init_db() else "failed")
+    for skill, n in bank_sizes().items():
+        print(f"{skill:<30} {n:>8,}")
@@ -19,6 +19,42 @@ IRT INTEGRATION (Option 1 — Generate all upfront):
   During interview, IRT picks from this pool where b ≈ current θ.
   This matches exactly what the PDF guide and senior's notebook do.
 
+CONCURRENCY / STREAMING:
+  Every (skill × difficulty) cell — generation + its validations — and
+  every project question is an independent LLM round trip, so they run on
+  a thread pool (QGEN_CONCURRENCY workers, default 6) inside a
+  QuestionStream. Medium cells are scheduled first, round-robin across
+  categories, so the interview can start on the first category's medium
+  question while the rest of the pool fills in. Each cell owns a fixed
+  block of ids (cell_index × questions_per_skill + i + 1), so question_id
+  numbering does not depend on which call finishes first.
+
+MULTI-BAND MODE (QGEN_MULTI_BAND=1 or multi_band=True):
+  One call per skill asks for all three bands at once — the few-shot
+  examples, style rules and b scale are sent once instead of three times.
+  The reply is split by "difficulty" with b_param clamped to each band's
+  IRT_BANDS range; only a band that comes back short or malformed is
+  re-asked with the single-band prompt. Same ids as the per-band mode.
+
+BATCHED VALIDATION:
+  A cell's questions are validated together: validator answers for all
+  of them, then every model / validator answer pair goes to the shared
+  EncodeStage, which encodes the pairs of all cells validating at the
+  same time in common encode() calls (QGEN_ENCODE_BATCH texts, default
+  16) and computes the similarities as a matrix. A request does not wait
+  for cells still fetching validator answers (QGEN_ENCODE_LINGER_MS,
+  default 0); requests that queue while an encode runs share the next
+  one. The encoder is loaded on first use and shared process-wide;
+  repeated texts (banked model answers) come from embeddings.py's LRU /
+  disk cache instead of being re-encoded. Only the questions below 0.60
+  are regenerated — one call per band — and re-validated as a batch.
+
+QUESTION BANK (question_bank.py):
+  With QuestionGenerator(bank=QuestionBank()), each cell is served from
+  questions generated for earlier sessions first — never more than the
+  exposure limit per candidate email — and the LLM only tops up the
+  cells the bank cannot fill. New questions are banked as they arrive.
+
 b_param scale (from PDF guide):
   -2.0 → Trivially easy (factual recall)
   -1.0 → Easy (basic understanding)
@@ -34,16 +70,16 @@ import random
 import time
 import threading
 import requests
+import queue
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from groq import Groq
 from dotenv import load_dotenv
-load_dotenv()
 
-try:
-    from sentence_transformers import SentenceTransformer, util as st_util
-    _ST_AVAILABLE = True
-except ImportError:
-    _ST_AVAILABLE = False
-    print("WARNING: sentence-transformers not installed. Confidence validation disabled.")
+import llm_cache
+import embeddings
+
+load_dotenv()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -61,6 +97,29 @@ IRT_BANDS = {
 }
 
 
+def _clamp_to_band(q: dict, difficulty: str) -> dict:
+    """Tag q with its band and keep b_param inside that band's IRT_BANDS range."""
+    band = IRT_BANDS[difficulty]
+    try:
+        b = float(q.get("b_param", band["b_target"]))
+    except (TypeError, ValueError):
+        b = band["b_target"]
+    q["difficulty"] = difficulty
+    q["b_param"]    = max(band["b_min"], min(band["b_max"], b))
+    return q
+
+
+def _confidence(sim: float) -> str:
+    return "high" if sim >= 0.80 else ("medium" if sim >= 0.60 else "low")
+
+
+def _pair_similarities(emb, n: int):
+    """Cosine similarity of row i and row n + i of a (2n × d) embedding matrix."""
+    emb  = np.asarray(emb, dtype=np.float32)
+    emb  = emb / np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+    return np.einsum("ij,ij->i", emb[:n], emb[n:2 * n])
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # DATASET SOURCES (few-shot examples)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -224,6 +283,305 @@ class FewShotLoader:
         return len(q) >= 15 and len(a) >= 30 and q.count('\n') <= 2
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# QUESTION STREAM (background generation, questions delivered per cell)
+# ─────────────────────────────────────────────────────────────────────────────
+
+class QuestionStream:
+    """
+    One generation run on a thread pool; finished cells can be picked up
+    while the rest are still being generated.
+
+      stream = generator.stream_questions(skills_data, 5, resume_text)
+      stream.wait(stream.categories[0])   # first category has a question
+      new_qs = stream.poll()              # everything finished since last poll
+      stream.wait(timeout=30)             # more questions (or the end) arrived
+      ...
+      stream.done / stream.error / stream.result()
+
+    Categories are known up front (stream.categories, + "Project" once
+    project questions arrive), so per-category state can be created
+    before any question exists.
+    """
+
+    def __init__(self, generator, skills_data: dict, questions_per_skill: int = 5,
+                 resume_text: str = "", max_workers: int | None = None,
+                 candidate: str = "", projects: list[dict] | None = None,
+                 multi_band: bool | None = None):
+        self._gen   = generator
+        self._count = questions_per_skill
+        self._seed  = f"{int(time.time())}-{random.randint(1000, 9999)}"
+
+        by_cat = skills_data.get("categories", {})
+        self.categories = [cat for cat, skills_list in by_cat.items() if skills_list]
+        # canonical (serial) order — fixes each cell's id block
+        self._cells = [(skill["name"], category, difficulty)
+                       for category, skills_list in by_cat.items()
+                       for skill in skills_list
+                       for difficulty in generator.DIFFICULTIES]
+        nth = {}
+        for i, (skill_name, category, difficulty) in enumerate(self._cells):
+            nth.setdefault((category, difficulty), []).append(i)
+        rank = {i: (difficulty != "medium", pos, self.categories.index(category), difficulty)
+                for (category, difficulty), idxs in nth.items()
+                for pos, i in enumerate(idxs)}
+
+        self._lock      = threading.Lock()
+        self._ready     = threading.Condition(self._lock)
+        self._queue     = queue.Queue()
+        self._by_cell:  dict[int, list[dict]] = {}
+        self._projects: dict[int, list[dict]] = {}
+        self._per_cat:  dict[str, int] = {}
+        self._done      = threading.Event()
+        self.error: Exception | None = None
+
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers or generator.CONCURRENCY),
+                                        thread_name_prefix="qgen")
+        self._pending = 1       # held until every cell is submitted (no early finish)
+        # Project extraction (only when the caller has no project list,
+        # e.g. from extract_all_skills) overlaps with the skill cells
+        if projects is None and resume_text:
+            self._submit(("extract",), generator._extract_projects, resume_text)
+        order = sorted(range(len(self._cells)), key=rank.__getitem__)
+        if generator.MULTI_BAND if multi_band is None else multi_band:
+            # one call per skill for all its bands; a skill's cells are contiguous
+            n_bands = len(generator.DIFFICULTIES)
+            for i0 in dict.fromkeys(i - i % n_bands for i in order):
+                skill_name, category, _ = self._cells[i0]
+                self._submit(("skill", i0), generator._generate_skill_cells, skill_name,
+                             category, questions_per_skill, self._seed, candidate)
+        else:
+            for i in order:
+                skill_name, category, difficulty = self._cells[i]
+                self._submit(("cell", i), generator._generate_cell, skill_name, category,
+                             difficulty, questions_per_skill, self._seed, candidate)
+        if projects is not None:
+            self._submit_projects(projects)
+        self._release()
+
+    # ── internals ────────────────────────────────────────────────────────────
+    def _submit(self, tag, fn, *args):
+        with self._lock:
+            self._pending += 1
+        try:
+            future = self._pool.submit(fn, *args)
+        except RuntimeError:                      # pool already shut down (error / cancel)
+            self._release()
+            return
+        future.add_done_callback(lambda f: self._collect(tag, f))
+
+    def _submit_projects(self, projects: list[dict]):
+        for p_idx, project in enumerate(projects):
+            self._submit(("project", p_idx), self._gen._generate_for_project,
+                         project, self._seed)
+
+    def _release(self):
+        with self._ready:
+            self._pending -= 1
+            last = self._pending == 0
+            if last:
+                self._done.set()
+            self._ready.notify_all()
+        if last:
+            self._pool.shutdown(wait=False)
+
+    def _number(self, tag, result: list[dict]) -> list[dict]:
+        """Give a finished cell / project its fixed block of ids."""
+        if tag[0] == "cell":
+            skill_name, category, difficulty = self._cells[tag[1]]
+            batch = result[:self._count]
+            for i, q in enumerate(batch):
+                qid = tag[1] * self._count + i + 1
+                q["category"]    = category      # planned one, whatever the model echoed
+                q["id"]          = qid
+                q["question_id"] = f"q_{qid}_{skill_name[:3].lower()}_{difficulty[0]}"
+            return batch
+        # one question per project (that is what the prompt asks for)
+        qid   = len(self._cells) * self._count + tag[1] + 1
+        batch = result[:1]
+        for q in batch:
+            q["id"]          = qid
+            q["question_id"] = f"q_{qid}_proj"
+            q["confidence"]  = "high"
+            q["similarity"]  = 1.0
+            q["b_param"]     = 0.0   # project questions default medium
+            q["b_reasoning"] = "Project question — default medium difficulty"
+        return batch
+
+    def _collect(self, tag, future):
+        try:
+            result = future.result()
+        except Exception as e:                    # incl. CancelledError after an error
+            first = False
+            with self._lock:
+                if self.error is None:
+                    self.error, first = e, True
+            if first:                             # outside the lock: runs cancel callbacks
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._release()
+            return
+
+        if tag[0] == "extract":
+            self._submit_projects(result)
+        elif tag[0] == "skill":                   # {difficulty: questions} → its cells
+            bands = list(enumerate(self._gen.DIFFICULTIES))
+            for k, difficulty in sorted(bands, key=lambda kd: kd[1] != "medium"):
+                self._store(("cell", tag[1] + k), result.get(difficulty, []))
+        else:
+            self._store(tag, result)
+        self._release()
+
+    def _store(self, tag, result: list[dict]):
+        batch = self._number(tag, result)
+        with self._lock:
+            (self._by_cell if tag[0] == "cell" else self._projects)[tag[1]] = batch
+            for q in batch:
+                cat = q.get("category", "Other")
+                self._per_cat[cat] = self._per_cat.get(cat, 0) + 1
+            if batch:
+                self._queue.put(batch)
+
+    # ── public ───────────────────────────────────────────────────────────────
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def poll(self) -> list[dict]:
+        """Questions finished since the last poll (non-blocking), in arrival order."""
+        out = []
+        while True:
+            try:
+                out.extend(self._queue.get_nowait())
+            except queue.Empty:
+                return out
+
+    def wait(self, category: str | None = None, timeout: float | None = None) -> bool:
+        """
+        Block until `category` has at least one question (category None:
+        until poll() has something new) or the run is over / timeout.
+        Returns True if that condition holds.
+        """
+        def ready():
+            return (self._per_cat.get(category, 0) > 0 if category
+                    else not self._queue.empty())
+        with self._ready:
+            self._ready.wait_for(lambda: ready() or self._done.is_set(), timeout)
+            return ready()
+
+    def result(self) -> list[dict]:
+        """Block until finished; every question in canonical order. Re-raises a failed call."""
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+        return ([q for i in sorted(self._by_cell) for q in self._by_cell[i]] +
+                [q for i in sorted(self._projects) for q in self._projects[i]])
+
+    def cancel(self):
+        """Drop cells that have not started (e.g. the candidate left the interview)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SHARED ENCODE STAGE
+# Cells validating at the same time (one stream or several) share encode()
+# calls instead of each sending its own 2 × questions_per_skill texts.
+# ─────────────────────────────────────────────────────────────────────────────
+
+class EncodeStage:
+    """
+    Coalesces the similarity requests of concurrently validating cells into
+    shared embeddings.encode() calls. The first waiter that finds the
+    encoder idle runs the batch when one of these holds:
+      ✅ batch_size texts are queued
+      ✅ every cell inside validation is waiting here (nobody else can join)
+      ✅ the oldest request has lingered `linger` seconds (0 by default:
+         cells still waiting on validator answers are not waited for)
+    While one batch encodes, new requests queue up for the next one.
+    """
+
+    def __init__(self, batch_size: int, linger: float):
+        self.batch_size = batch_size
+        self.linger     = linger
+        self._cond      = threading.Condition()
+        self._queue     = []          # waiting requests, oldest first
+        self._members   = 0           # cells currently inside validation
+        self._busy      = False
+        self._stats     = {"calls": 0, "texts": 0, "requests": 0}
+
+    def join(self):
+        with self._cond:
+            self._members += 1
+
+    def leave(self):
+        with self._cond:
+            self._members -= 1
+            self._cond.notify_all()   # the rest may now all be waiting
+
+    def similarities(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """Cosine similarity of each (text_a, text_b) pair (1.0 when no encoder)."""
+        if not pairs:
+            return []
+        req = {"pairs": pairs, "t0": time.monotonic(), "sims": None}
+        with self._cond:
+            self._queue.append(req)
+            self._cond.notify_all()
+            while req["sims"] is None:
+                batch = self._due_locked()
+                if batch:
+                    self._busy = True
+                    self._cond.release()
+                    try:
+                        self._encode(batch)
+                    finally:
+                        self._cond.acquire()
+                        self._busy = False
+                        self._cond.notify_all()
+                elif req["sims"] is None:
+                    wait = self.linger - (time.monotonic() - self._queue[0]["t0"]) \
+                        if self._queue else self.linger
+                    self._cond.wait(max(wait, 0.001))
+        return req["sims"]
+
+    def _due_locked(self) -> list[dict]:
+        if self._busy or not self._queue:
+            return []
+        queued = sum(2 * len(r["pairs"]) for r in self._queue)
+        if (queued < self.batch_size and len(self._queue) < self._members
+                and time.monotonic() - self._queue[0]["t0"] < self.linger):
+            return []
+        batch, texts = [], 0                # whole requests, until batch_size texts
+        while self._queue and texts < self.batch_size:
+            texts += 2 * len(self._queue[0]["pairs"])
+            batch.append(self._queue.pop(0))
+        return batch
+
+    def _encode(self, batch: list[dict]):
+        texts = [t for r in batch for t in
+                 [a for a, _ in r["pairs"]] + [b for _, b in r["pairs"]]]
+        try:
+            emb = embeddings.encode(texts, batch_size=self.batch_size)
+        except Exception as e:
+            print(f"[QGen] Validation error: {e}")
+            emb = None
+        off = 0
+        for r in batch:
+            n = len(r["pairs"])
+            r["sims"] = ([1.0] * n if emb is None           # encoder failed to load
+                         else _pair_similarities(emb[off:off + 2 * n], n).tolist())
+            off += 2 * n
+        with self._cond:
+            self._stats["calls"]    += 1
+            self._stats["texts"]    += len(texts)
+            self._stats["requests"] += len(batch)
+
+    def stats(self) -> dict:
+        """encode() calls, texts and cell requests so far; texts per call."""
+        with self._cond:
+            s = dict(self._stats)
+        s["texts_per_call"] = round(s["texts"] / s["calls"], 1) if s["calls"] else 0.0
+        return s
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # QUESTION GENERATOR
 # ─────────────────────────────────────────────────────────────────────────────
@@ -232,19 +590,23 @@ class QuestionGenerator:
 
     VALIDATOR_MODEL = "llama-3.1-8b-instant"
     MAX_RETRIES     = 2
+    DIFFICULTIES    = ("easy", "medium", "hard")
+    CONCURRENCY     = int(os.environ.get("QGEN_CONCURRENCY", 6))   # parallel LLM round trips
+    MULTI_BAND      = os.environ.get("QGEN_MULTI_BAND", "0") == "1"  # one call per skill
+    ENCODE_BATCH_SIZE = int(os.environ.get("QGEN_ENCODE_BATCH", 16))  # texts per encode() batch
+    ENCODE_LINGER   = float(os.environ.get("QGEN_ENCODE_LINGER_MS", 0)) / 1000.0
 
-    def __init__(self):
+    def __init__(self, bank=None):
         self.client   = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+        self.bank     = bank        # question_bank.QuestionBank — None: always generate
         self.model    = "llama-3.1-8b-instant"
         self.few_shot = FewShotLoader()
-
-        if _ST_AVAILABLE:
-            self._st_model = SentenceTransformer("all-MiniLM-L6-v2")
-        else:
-            self._st_model = None
+        # the sentence encoder is loaded lazily and shared — see embeddings.py;
+        # every cell validating at the same time shares its encode() calls
+        self.encode_stage = EncodeStage(self.ENCODE_BATCH_SIZE, self.ENCODE_LINGER)
 
     # ──────────────────────────────────────────────────────────────────── #
-    #  PUBLIC: generate_questions                                           #
+    #  PUBLIC: generate_questions / stream_questions                        #
     # ──────────────────────────────────────────────────────────────────── #
 
     def generate_questions(
@@ -253,9 +615,22 @@ class QuestionGenerator:
         questions_per_skill: int = 5,   # per difficulty level — fixed at 5 for IRT
                                          # total = questions_per_skill × 3
         resume_text:         str = "",
+        max_workers:         int | None = None,
+        candidate:           str = "",
+        projects:            list[dict] | None = None,
+        multi_band:          bool | None = None,
     ) -> list[dict]:
         """
         Generates questions across all 3 difficulty levels per skill.
+        Cells run concurrently on up to max_workers threads
+        (default CONCURRENCY; 1 = the old serial loop).
+        With a question bank, each cell is filled from earlier sessions
+        first (at most its exposure limit per `candidate` email) and the
+        LLM only generates the shortfall.
+        `projects` (e.g. skills_data["projects"] from extract_all_skills)
+        replaces the separate project-extraction call on resume_text.
+        multi_band=True (default MULTI_BAND) asks for all three bands of a
+        skill in one call instead of one call per band; ids are the same.
 
         questions_per_skill=1 → 3 questions per skill (1 easy + 1 medium + 1 hard)
         questions_per_skill=2 → 6 questions per skill (2 easy + 2 medium + 2 hard)
@@ -269,61 +644,83 @@ class QuestionGenerator:
         Returns flat list of question dicts — NOT shuffled.
         IRT engine will pick from this pool using b ≈ θ.
         """
+        # DO NOT shuffle — IRT picks from pool by b ≈ θ
+        # App will use select_question() from rasch_engine
+        return self.stream_questions(
+            skills_data, questions_per_skill, resume_text, max_workers, candidate, projects,
+            multi_band
+        ).result()
+
+    def stream_questions(
+        self,
+        skills_data:         dict,
+        questions_per_skill: int = 5,
+        resume_text:         str = "",
+        max_workers:         int | None = None,
+        candidate:           str = "",
+        projects:            list[dict] | None = None,
+        multi_band:          bool | None = None,
+    ) -> "QuestionStream":
+        """
+        Start generation in the background and return at once.
+        Same questions / ids as generate_questions(), delivered per cell
+        (medium cells first) through the returned QuestionStream.
+        """
         api_key = os.environ.get("GROQ_API_KEY", "")
         if not api_key or not api_key.startswith("gsk_"):
             raise RuntimeError(
                 "GROQ_API_KEY is missing or invalid. "
                 "Add it to your .env or .secrets.toml file."
             )
-
-        session_seed = f"{int(time.time())}-{random.randint(1000, 9999)}"
-
-        all_skills: list[tuple[str, str]] = [
-            (skill["name"], category)
-            for category, skills_list in skills_data.get("categories", {}).items()
-            for skill in skills_list
-        ]
-
-        questions: list[dict] = []
-        qid = 1
-
-        for skill_name, category in all_skills:
-            # Generate questions for each difficulty level
-            for difficulty in ["easy", "medium", "hard"]:
-                skill_qs = self._generate_for_skill(
-                    skill_name, category, difficulty,
-                    questions_per_skill, session_seed
-                )
-                for q in skill_qs:
-                    q["id"]          = qid
-                    q["question_id"] = f"q_{qid}_{skill_name[:3].lower()}_{difficulty[0]}"
-                    q = self._validate_with_retry(
-                        q, skill_name, category, difficulty, session_seed
-                    )
-                    questions.append(q)
-                    qid += 1
-
-        # Project questions
-        if resume_text:
-            for project in self._extract_projects(resume_text):
-                for q in self._generate_for_project(project, session_seed):
-                    q["id"]          = qid
-                    q["question_id"] = f"q_{qid}_proj"
-                    q["confidence"]  = "high"
-                    q["similarity"]  = 1.0
-                    q["b_param"]     = 0.0   # project questions default medium
-                    q["b_reasoning"] = "Project question — default medium difficulty"
-                    questions.append(q)
-                    qid += 1
-
-        # DO NOT shuffle — IRT picks from pool by b ≈ θ
-        # App will use select_question() from rasch_engine
-        return questions
+        return QuestionStream(self, skills_data, questions_per_skill, resume_text,
+                              max_workers, candidate, projects, multi_band)
 
     # ──────────────────────────────────────────────────────────────────── #
     #  SKILL QUESTION GENERATION  (CoT + Few-Shot + IRT b_param)           #
     # ──────────────────────────────────────────────────────────────────── #
 
+    def _generate_cell(self, skill_name, category, difficulty, count, seed, candidate=""):
+        """
+        One (skill, difficulty) cell: bank questions first, then generate and
+        validate only the missing ones (and bank those for later sessions).
+        """
+        banked  = self.bank.take(skill_name, difficulty, count, candidate) if self.bank else []
+        missing = count - len(banked)
+        fresh   = self._validate_batch(
+            [(q, difficulty) for q in
+             self._generate_for_skill(skill_name, category, difficulty, missing, seed)],
+            skill_name, category,
+        ) if missing > 0 else []
+        if self.bank:
+            # generation call skipped if the bank filled the cell; validator call per banked question
+            self.bank.saved((missing <= 0) + len(banked) * embeddings.available())
+            self.bank.add(fresh, candidate)
+        return banked + fresh
+
+    def _generate_skill_cells(self, skill_name, category, count, seed, candidate=""):
+        """
+        All bands of one skill (multi-band mode): bank first, then ONE
+        generation call for every band still short, then validation.
+        Returns {difficulty: questions}.
+        """
+        banked = {d: (self.bank.take(skill_name, d, count, candidate) if self.bank else [])
+                  for d in self.DIFFICULTIES}
+        counts = {d: count - len(banked[d]) for d in self.DIFFICULTIES}
+        fresh  = self._generate_for_skill_bands(skill_name, category, counts, seed)
+        items  = [(q, d) for d in self.DIFFICULTIES for q in fresh.get(d, [])]
+        valid  = iter(self._validate_batch(items, skill_name, category))
+        out    = {}
+        for d in self.DIFFICULTIES:
+            new = [next(valid) for _ in fresh.get(d, [])]
+            if self.bank:
+                self.bank.add(new, candidate)
+            out[d] = banked[d] + new
+        if self.bank:
+            n_banked = sum(len(v) for v in banked.values())
+            self.bank.saved((not any(c > 0 for c in counts.values()))
+                            + n_banked * embeddings.available())
+        return out
+
     def _generate_for_skill(self, skill_name, category, difficulty, count, seed):
 
         band = IRT_BANDS[difficulty]
@@ -413,6 +810,113 @@ STEP 2 — OUTPUT FINAL JSON (no extra text, no markdown)
 """
         return self._call_llm_cot(prompt, context=f"skill '{skill_name}' [{difficulty}]")
 
+    def _generate_for_skill_bands(self, skill_name, category, counts, seed):
+        """
+        Multi-band mode: one CoT call asks for every band with counts[d] > 0
+        (shared few-shot examples and b scale, one JSON array tagged by
+        "difficulty"). The reply is split per band, b_param clamped to the
+        band's IRT_BANDS range; a band that comes back short or malformed
+        is retried on its own with the single-band prompt.
+        Returns {difficulty: questions}.
+        """
+        bands = [d for d in self.DIFFICULTIES if counts.get(d, 0) > 0]
+        if len(bands) <= 1:                       # nothing to share — plain per-band call
+            return {d: [_clamp_to_band(q, d) for q in
+                        self._generate_for_skill(skill_name, category, d, counts[d], seed)]
+                    for d in bands}
+
+        examples     = self.few_shot.get_examples(category, n=2)
+        source_note  = "live dataset" if self.few_shot.is_loaded else "reference examples"
+        few_shot_str = self._format_examples(examples, source_note)
+        band_block   = "\n".join(
+            f"  {d.upper():<6} — {counts[d]} question(s)\n"
+            f"           {IRT_BANDS[d]['description']}\n"
+            f"           b_param {IRT_BANDS[d]['b_min']} to {IRT_BANDS[d]['b_max']} "
+            f"(target {IRT_BANDS[d]['b_target']})"
+            for d in bands)
+        total = sum(counts[d] for d in bands)
+
+        prompt = f"""You are a senior technical interviewer conducting a campus placement
+interview for a fresher (B.Tech/B.E. CS/IT student).
+SESSION SEED: {seed}
+
+════════════════════════════════════════════════════════════
+TASK
+════════════════════════════════════════════════════════════
+Generate interview questions for EVERY difficulty band below ({total} in total) for:
+  Skill:      {skill_name}
+  Category:   {category}
+
+BANDS:
+{band_block}
+
+  b scale:
+    -2.0 → trivially easy (any student gets it)
+    -1.0 → easy (basic understanding)
+     0.0 → medium (average student 50/50 chance)
+    +1.0 → hard (requires strong understanding)
+    +2.0 → very hard (expert level)
+
+════════════════════════════════════════════════════════════
+REAL INTERVIEW EXAMPLES  ({source_note})
+Study these carefully. Match this tone and length exactly.
+════════════════════════════════════════════════════════════
+{few_shot_str}
+════════════════════════════════════════════════════════════
+STYLE RULES
+════════════════════════════════════════════════════════════
+  ✅ Questions are SHORT — 1-2 sentences max
+  ✅ DIRECT — no long setups or scenarios
+  ✅ Start with: What is / Explain / How does / Why / What is the difference
+  ✅ Model answer: 3-5 sentences, clear, explains the "why"
+  ✅ No two questions test the same concept, across all bands
+  ❌ NEVER use "You are working at..." or "Imagine a scenario..."
+
+════════════════════════════════════════════════════════════
+STEP 1 — THINK FIRST (Chain of Thought)
+════════════════════════════════════════════════════════════
+Inside ONE short <reasoning> block, for each band: which concept to test,
+and why the b_param falls inside that band's range.
+
+<reasoning>
+[thinking here]
+</reasoning>
+
+════════════════════════════════════════════════════════════
+STEP 2 — OUTPUT FINAL JSON (no extra text, no markdown)
+════════════════════════════════════════════════════════════
+ONE array with all {total} questions; "difficulty" names the band:
+[
+  {{
+    "skill":        "{skill_name}",
+    "category":     "{category}",
+    "difficulty":   "<{'|'.join(bands)}>",
+    "question":     "<question>",
+    "type":         "<conceptual|practical|scenario>",
+    "hints":        ["<hint 1>", "<hint 2>"],
+    "model_answer": "<3-5 sentence answer>",
+    "b_param":      <float inside that band's range>,
+    "b_reasoning":  "<one sentence: why this b value>"
+  }}
+]
+"""
+        out = {d: [] for d in bands}
+        for q in self._call_llm_cot(prompt, context=f"skill '{skill_name}' [all bands]",
+                                    max_tokens=2500 * len(bands)):
+            d = str(q.get("difficulty", "")).strip().lower()
+            if (d in out and len(out[d]) < counts[d]
+                    and str(q.get("question", "")).strip()
+                    and str(q.get("model_answer", "")).strip()):
+                out[d].append(_clamp_to_band(q, d))
+
+        for d in bands:
+            short = counts[d] - len(out[d])
+            if short > 0:
+                print(f"[QGen] Band '{d}' short by {short} for skill '{skill_name}' — retrying that band")
+                out[d] += [_clamp_to_band(q, d) for q in
+                           self._generate_for_skill(skill_name, category, d, short, seed)]
+        return out
+
     # ──────────────────────────────────────────────────────────────────── #
     #  PROJECT QUESTION GENERATION                                          #
     # ──────────────────────────────────────────────────────────────────── #
@@ -458,40 +962,72 @@ Ask about a technical decision, challenge faced, or lesson learned.
     #  VALIDATION WITH AUTO-RETRY                                           #
     # ──────────────────────────────────────────────────────────────────── #
 
-    def _validate_with_retry(self, q, skill_name, category, difficulty, seed):
-        best_q, best_sim = q, -1.0
+    def _validate_batch(self, items, skill_name, category):
+        """
+        Validate a cell's questions (in multi-band mode: all of a skill's
+        bands) together, retrying only the low-similarity ones:
+          1. a validator answer for every pending question (LLM, cached)
+          2. every (model_answer, validator answer) pair goes to the shared
+             EncodeStage, batched with the other cells validating now
+          3. pair similarities in one matrix operation per batch
+          4. one regeneration call per band for the items below 0.60
+        items: [(question, difficulty)]. Returns the questions in order,
+        each with confidence / similarity.
+        """
+        # load the encoder (once per process) BEFORE paying for validator
+        # answers — if it cannot load, they would all be thrown away
+        if embeddings.get_model() is None:
+            return [{**q, "confidence": "high", "similarity": 1.0} for q, _ in items]
 
+        self.encode_stage.join()
+        try:
+            return self._validate_rounds(items, skill_name, category)
+        finally:
+            self.encode_stage.leave()
+
+    def _validate_rounds(self, items, skill_name, category):
+        current  = [q for q, _ in items]
+        bands    = [d for _, d in items]
+        best     = list(current)
+        best_sim = [-1.0] * len(items)
+        pending  = list(range(len(items)))
         for attempt in range(self.MAX_RETRIES + 1):
-            val  = self._validate_model_answer(
-                q["question"], skill_name, q.get("model_answer", "")
-            )
-            sim  = val["similarity"]
-            conf = val["confidence"]
-
-            if sim > best_sim:
-                best_sim = sim
-                best_q   = {**q, "confidence": conf, "similarity": sim}
-
-            if sim >= 0.60:
-                return best_q
-
-            if attempt < self.MAX_RETRIES:
-                regen = self._generate_for_skill(
-                    skill_name, category, difficulty, 1,
-                    f"{int(time.time())}-{random.randint(1000, 9999)}"
-                )
-                if regen:
-                    q = regen[0]
-            else:
-                best_q["confidence"] = "medium"
-
-        return best_q
-
-    def _validate_model_answer(self, question, skill, model_answer):
-        if not _ST_AVAILABLE or self._st_model is None:
-            return {"confidence": "high", "similarity": 1.0}
+            seconds = {i: self._validator_answer(current[i]["question"], skill_name)
+                       for i in pending}
+            scored  = [i for i in pending if seconds[i] is not None]
+            sims    = dict(zip(scored, self.encode_stage.similarities(
+                [(current[i].get("model_answer", ""), seconds[i]) for i in scored])))
+
+            low = []
+            for i in pending:
+                sim = sims.get(i, 1.0)            # validator call failed → accept, as before
+                if sim > best_sim[i]:
+                    best_sim[i] = sim
+                    best[i]     = {**current[i], "confidence": _confidence(sim),
+                                   "similarity": round(sim, 2)}
+                if sim < 0.60:
+                    low.append(i)
+            if not low:
+                break
+            if attempt == self.MAX_RETRIES:
+                for i in low:
+                    best[i]["confidence"] = "medium"
+                break
+
+            retry_seed = f"{int(time.time())}-{random.randint(1000, 9999)}"
+            for d in dict.fromkeys(bands[i] for i in low):
+                idxs  = [i for i in low if bands[i] == d]
+                regen = self._generate_for_skill(skill_name, category, d, len(idxs), retry_seed)
+                for i, q in zip(idxs, regen):
+                    current[i] = _clamp_to_band(q, d)
+            pending = low
+        return best
+
+    def _validator_answer(self, question, skill):
+        """Second, independent answer from the validator model (None on error)."""
         try:
-            resp = self.client.chat.completions.create(
+            return llm_cache.complete(
+                self.client, "qgen.validate",
                 model=self.VALIDATOR_MODEL,
                 messages=[
                     {"role": "system", "content": "Answer accurately and concisely."},
@@ -499,16 +1035,10 @@ Ask about a technical decision, challenge faced, or lesson learned.
                      "content": f"Skill: {skill}\nQuestion: {question}\nAnswer in 3-5 sentences."},
                 ],
                 temperature=0.2, max_tokens=300,
-            )
-            second = resp.choices[0].message.content.strip()
-            e1  = self._st_model.encode(model_answer, convert_to_tensor=True)
-            e2  = self._st_model.encode(second,       convert_to_tensor=True)
-            sim = float(st_util.cos_sim(e1, e2))
-            conf = "high" if sim >= 0.80 else ("medium" if sim >= 0.60 else "low")
-            return {"confidence": conf, "similarity": round(sim, 2)}
+            ).strip()
         except Exception as e:
             print(f"[QGen] Validation error: {e}")
-            return {"confidence": "high", "similarity": 1.0}
+            return None
 
     # ──────────────────────────────────────────────────────────────────── #
     #  PROJECT EXTRACTION                                                   #
@@ -516,7 +1046,8 @@ Ask about a technical decision, challenge faced, or lesson learned.
 
     def _extract_projects(self, resume_text):
         try:
-            resp = self.client.chat.completions.create(
+            raw = llm_cache.complete(
+                self.client, "qgen.extract_projects",
                 model=self.model,
                 messages=[
                     {"role": "system",
@@ -527,9 +1058,9 @@ Ask about a technical decision, challenge faced, or lesson learned.
                                 f"technologies, highlights.\n\n{resume_text[:4000]}"},
                 ],
                 temperature=0.2, max_tokens=1000,
+                accept=llm_cache.parses(lambda t: json.loads(self._clean_json(t))),
             )
-            raw      = self._clean_json(resp.choices[0].message.content)
-            projects = json.loads(raw)
+            projects = json.loads(self._clean_json(raw))
             return projects if isinstance(projects, list) else []
         except Exception as e:
             print(f"[QGen] Project extraction error: {e}")
@@ -548,7 +1079,7 @@ Ask about a technical decision, challenge faced, or lesson learned.
             lines.append("")
         return "\n".join(lines)
 
-    def _call_llm_cot(self, prompt: str, context: str = "") -> list[dict]:
+    def _call_llm_cot(self, prompt: str, context: str = "", max_tokens: int = 2500) -> list[dict]:
         FALLBACK_MODELS = [
             "llama-3.3-70b-versatile",
             "llama-3.1-70b-versatile",
@@ -557,7 +1088,8 @@ Ask about a technical decision, challenge faced, or lesson learned.
         last_error = None
         for model in FALLBACK_MODELS:
             try:
-                resp = self.client.chat.completions.create(
+                raw = llm_cache.complete(
+                    self.client, "qgen.cot",
                     model=model,
                     messages=[
                         {"role": "system",
@@ -566,9 +1098,9 @@ Ask about a technical decision, challenge faced, or lesson learned.
                         {"role": "user", "content": prompt},
                     ],
                     temperature=0.7,
-                    max_tokens=2500,
-                )
-                raw = resp.choices[0].message.content.strip()
+                    max_tokens=max_tokens,
+                    accept=lambda t: "[" in t,
+                ).strip()
                 raw = re.sub(r"<reasoning>.*?</reasoning>", "", raw, flags=re.DOTALL).strip()
                 
                 # Extract JSON more robustly — find opening [ and parse char by char
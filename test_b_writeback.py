@@ -0,0 +1,182 @@
+"""
+Tests for the in-database b_param write-back (mcq_database.B_UPDATE_SET).
+
+The stress tests fire thousands of answers at ONE question from many
+threads and check that no update was lost. They need a reachable
+PostgreSQL with db_schema.sql applied (POSTGRES_* env vars) and are
+skipped otherwise. The listener / live-pool test runs anywhere.
+
+Run:  python -m pytest test_b_writeback.py -q
+"""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import db_pool
+import mcq_irt.rasch_engine as irt
+from mcq_irt import mcq_database as db
+from mcq_irt.item_bank import ItemBank, LiveBanks
+
+N_ANSWERS = 2000
+N_THREADS = 32
+
+
+def _db_ready() -> bool:
+    try:
+        return db.init_db()                 # also adds columns newer than the tables
+    except Exception:
+        return False
+
+
+needs_db = pytest.mark.skipif(not _db_ready(), reason="PostgreSQL not reachable")
+
+
+def _make_questions(n: int) -> list[str]:
+    qids = [f"stress_{uuid.uuid4().hex[:12]}" for _ in range(n)]
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        for qid in qids:
+            cur.execute("""
+                INSERT INTO mcq_questions (question_id, skill, question_text, option_a,
+                                           option_b, option_c, option_d, correct_option, b_param)
+                VALUES (%s, 'StressTest', 'q', 'a', 'b', 'c', 'd', 'a', 0.0)
+            """, (qid,))
+    conn.close()
+    return qids
+
+
+def _drop_questions(qids: list[str]):
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        cur.execute("DELETE FROM mcq_responses WHERE question_id = ANY(%s)", (qids,))
+        cur.execute("DELETE FROM mcq_questions WHERE question_id = ANY(%s)", (qids,))
+    conn.close()
+
+
+@pytest.fixture
+def question():
+    """A throw-away mcq_questions row, removed with its responses afterwards."""
+    qids = _make_questions(1)
+    yield qids[0]
+    _drop_questions(qids)
+
+
+@pytest.fixture
+def questions():
+    """Twenty throw-away mcq_questions rows."""
+    qids = _make_questions(20)
+    yield qids
+    _drop_questions(qids)
+
+
+def _answer(qid: str, i: int, correct: bool, theta: float = 0.0) -> dict:
+    return dict(session_id=str(uuid.uuid4()), question_id=qid, skill="StressTest",
+                selected_option="a" if correct else "b", is_correct=correct,
+                b_used=0.0, theta_before=theta, theta_after=theta, p_correct_irt=0.5,
+                surprise=0.5, proficiency_before=50.0, proficiency_after=50.0)
+
+
+def _state(qid: str) -> tuple:
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        cur.execute("SELECT b_param, response_count, correct_count FROM mcq_questions "
+                    "WHERE question_id = %s", (qid,))
+        row = cur.fetchone()
+    conn.close()
+    return row
+
+
+@needs_db
+def test_parallel_atomic_answers_lose_no_update(question):
+    answers = [_answer(question, i, i % 3 == 0) for i in range(N_ANSWERS)]
+    with ThreadPoolExecutor(N_THREADS) as ex:
+        results = list(ex.map(lambda a: db.record_answer_atomic(**a), answers))
+    assert not [r["error"] for r in results if r["error"]]
+    n_correct = sum(a["is_correct"] for a in answers)
+    b, n, c = _state(question)
+    assert (n, c) == (N_ANSWERS, n_correct)
+    assert b == pytest.approx(irt.calibrate_b(n, c))
+    assert sorted(r["response_count"] for r in results) == list(range(1, N_ANSWERS + 1))
+
+
+@needs_db
+def test_parallel_batches_lose_no_update(question):
+    answers = [_answer(question, i, i % 4 != 0) for i in range(N_ANSWERS)]
+    batches = [answers[i:i + 50] for i in range(0, N_ANSWERS, 50)]
+    with ThreadPoolExecutor(N_THREADS) as ex:
+        errors = [e for e in ex.map(db.record_answers_batch, batches) if e]
+    assert not errors
+    b, n, c = _state(question)
+    assert (n, c) == (N_ANSWERS, sum(a["is_correct"] for a in answers))
+    assert b == pytest.approx(irt.calibrate_b(n, c))
+
+
+@needs_db
+def test_parallel_online_steps_all_apply(question, monkeypatch):
+    monkeypatch.setattr(irt, "CALIB_MIN_RESPONSES", 10**9)     # online rule only
+    answers = [_answer(question, i, True, theta=1.0) for i in range(400)]
+    with ThreadPoolExecutor(N_THREADS) as ex:
+        list(ex.map(lambda a: db.record_answer_atomic(**a), answers))
+    expected = 0.0
+    for _ in answers:
+        expected = irt.update_b_online(expected, 1.0, True)
+    assert _state(question)[0] == pytest.approx(expected)
+
+
+@needs_db
+def test_bulk_calibration_and_live_batches_do_not_deadlock(questions):
+    """Both writers lock rows in question_id order, whatever order they are given."""
+    answers = [_answer(qid, i, i % 2 == 0) for i in range(10) for qid in questions]
+    batches = [answers[i:i + 40] for i in range(0, len(answers), 40)]
+    bulk    = [dict(zip(reversed(questions), [0.1 * k for k in range(20)]))] * 10
+    with ThreadPoolExecutor(N_THREADS) as ex:
+        live = [ex.submit(db.record_answers_batch, b) for b in batches]
+        jobs = [ex.submit(db.update_b_params_bulk, b) for b in bulk]
+        errors = [f.result() for f in live] + [f.result()[1] for f in jobs]
+    assert not [e for e in errors if e]
+    assert {_state(qid)[1] for qid in questions} == {10}
+
+
+@needs_db
+def test_jmle_b_survives_later_answers(question, monkeypatch):
+    monkeypatch.setattr(db, "_b_listeners", [])
+    for i in range(8):                                      # past CALIB_MIN_RESPONSES
+        db.record_answer_atomic(**_answer(question, i, True))
+    assert db.update_b_params_bulk({question: 1.5}) == (1, "")
+
+    res = db.record_answer_atomic(**_answer(question, 8, True, theta=0.0))
+    assert not res["error"]
+    assert res["b_source"] == "online"
+    assert res["b_param"] == pytest.approx(irt.update_b_online(1.5, 0.0, True))
+    assert not db.record_answers_batch([_answer(question, 9, False, theta=0.0)])
+    assert _state(question)[0] == pytest.approx(
+        irt.update_b_online(res["b_param"], 0.0, False))
+
+
+def test_session_view_keeps_jmle_b():
+    q    = {"question_id": "q1", "question_text": "Q", "correct_option": "a",
+            "b_param": 1.5, "response_count": 20, "correct_count": 19,
+            "b_calibrated_at": "2026-10-18T00:00:00+00:00"}
+    sess = irt.SkillSession("SQL")
+    rec  = sess.record_answer(q, "a")
+    assert rec["b_source"] == "online"
+    assert rec["b_final"] == pytest.approx(irt.update_b_online(1.5, 0.0, True))
+
+
+def test_listeners_refresh_live_pools(monkeypatch):
+    monkeypatch.setattr(db, "_b_listeners", [])
+    live = LiveBanks()
+    bank = ItemBank({"SQL": [{"question_id": "q1", "b_param": 0.0, "response_count": 0,
+                              "correct_count": 0},
+                             {"question_id": "q2", "b_param": 1.0}]})
+    live.add(bank)
+    db.add_b_listener(live.refresh)
+    db.add_b_listener(live.refresh)                            # registered once
+    db._publish_b({"q1": (-0.4, 7, 5), "other": (0.0, 1, 1)})
+    q1 = bank["SQL"].questions[bank["SQL"].index["q1"]]
+    assert (q1["b_param"], q1["response_count"], q1["correct_count"]) == (-0.4, 7, 5)
+    assert list(bank["SQL"].b) == [-0.4, 1.0]                   # selection sees the new b
+    del bank, q1
+    assert len(live) == 0
@@ -0,0 +1,74 @@
+"""
+Tests for mcq_irt.calibrate (JMLE math only — no DB needed).
+
+Run:  python -m pytest test_calibrate.py -q
+"""
+
+import numpy as np
+
+import mcq_irt.rasch_engine as irt
+from mcq_irt import calibrate as cal
+
+
+def _adaptive_matrix(n_persons=4000, n_items=120, length=12, seed=0):
+    """Each simulated person sees the items whose b is closest to their θ — like the CAT."""
+    rng    = np.random.default_rng(seed)
+    b_true = rng.uniform(-1.8, 1.8, n_items)
+    thetas = rng.normal(0.0, 1.0, n_persons)
+    rows   = []
+    for k, theta in enumerate(thetas):
+        near = np.argsort(np.abs(b_true - theta + rng.normal(0, 0.4, n_items)))[:length]
+        hits = rng.random(length) < 1.0 / (1.0 + np.exp(-(theta - b_true[near])))
+        rows.extend((f"s{k}", "Python", f"q{j}", bool(h)) for j, h in zip(near, hits))
+    m = cal.ResponseMatrix()
+    m.add_rows(rows)
+    order = np.array([int(q[1:]) for q in m.item_ids])
+    return m, b_true[order], rng
+
+
+def test_response_matrix_groups_persons_and_items():
+    m = cal.ResponseMatrix()
+    m.add_rows([("s1", "SQL", "q1", True), ("s1", "SQL", "q2", False)])
+    m.add_rows([("s1", "Python", "q3", True), ("s2", "SQL", "q1", False)])
+    person, item, correct = m.arrays()
+    assert len(m) == 4 and m.n_persons == 3 and m.n_items == 3
+    assert person.tolist() == [0, 0, 1, 2]
+    assert item.tolist() == [0, 1, 2, 0]
+    assert correct.tolist() == [1, 0, 1, 0]
+    assert m.item_skills == ["SQL", "SQL", "Python"]
+
+
+def test_jmle_recovers_b_where_pass_rate_calibration_cannot():
+    m, b_true, rng = _adaptive_matrix()
+    b_init = b_true + rng.normal(0.0, 0.5, len(b_true))
+    b_init += b_true.mean() - b_init.mean()           # same anchor as the true scale
+    res = cal.jmle(m, b_init, max_iter=200)
+
+    _, item, y = m.arrays()
+    n, s = np.bincount(item), np.bincount(item, weights=y)
+    pass_rate = np.array([irt.calibrate_b(int(a), int(c)) for a, c in zip(n, s)])
+
+    rmse = lambda b: float(np.sqrt(np.mean((b - b_true)[res["calibrated"]] ** 2)))
+    assert res["converged"]
+    assert res["calibrated"].mean() > 0.9
+    assert rmse(res["b"]) < 0.2
+    assert rmse(res["b"]) < rmse(pass_rate) / 2     # adaptive items all pass ≈ 50%
+    assert np.all((res["b"] >= irt.B_MIN) & (res["b"] <= irt.B_MAX))
+
+
+def test_extreme_and_sparse_items_keep_their_b():
+    rows = []
+    for k in range(40):
+        rows += [(f"s{k}", "SQL", "mixed_a", k % 2 == 0),
+                 (f"s{k}", "SQL", "mixed_b", k % 3 == 0),
+                 (f"s{k}", "SQL", "always_right", True)]
+    rows += [("late", "SQL", "rare", True), ("late", "SQL", "mixed_a", False)]
+    m = cal.ResponseMatrix()
+    m.add_rows(rows)
+    b_init = np.array([0.3, -0.2, -1.0, 0.7])
+    res = cal.jmle(m, b_init, min_responses=5)
+    calibrated = dict(zip(m.item_ids, res["calibrated"]))
+    assert calibrated == {"mixed_a": True, "mixed_b": True,
+                          "always_right": False, "rare": False}
+    assert res["b"][2] == -1.0 and res["b"][3] == 0.7
+    assert np.isclose(res["b"][:2].mean(), b_init[:2].mean())
@@ -4,36 +4,21 @@ Database layer for the fixed 10-question MCQ test.
 All students get the same questions, ranked by raw score.
 """
 
-import os
 import json
 import psycopg2
 import psycopg2.extras
+import db_pool
+import leaderboard
 from dotenv import load_dotenv
 load_dotenv()
 
+BULK_PAGE_SIZE = 1000     # rows per multi-row INSERT statement
+
 
 def _get_conn():
+    """Borrow a connection from the shared pool (db_pool.py). conn.close() returns it."""
     try:
-        try:
-            import streamlit as st
-            cfg = st.secrets.get("postgres", {})
-        except Exception:
-            cfg = {}
-        if cfg:
-            return psycopg2.connect(
-                host=cfg.get("host", "localhost"),
-                port=cfg.get("port", 5432),
-                dbname=cfg.get("dbname", "interview_coach"),
-                user=cfg.get("user", "postgres"),
-                password=cfg.get("password", ""),
-            )
-        return psycopg2.connect(
-            host=os.environ.get("POSTGRES_HOST", "localhost"),
-            port=int(os.environ.get("POSTGRES_PORT", 5432)),
-            dbname=os.environ.get("POSTGRES_DB", "interview_coach"),
-            user=os.environ.get("POSTGRES_USER", "postgres"),
-            password=os.environ.get("POSTGRES_PASSWORD", ""),
-        )
+        return db_pool.getconn()
     except Exception as e:
         print(f"[Test DB] Connection error: {e}")
         return None
@@ -92,35 +77,37 @@ def init_db():
         print(f"[Test DB] init_db error: {e}")
     finally:
         conn.close()
+    leaderboard.init_db()
 
 
 def load_test_questions_from_json(filepath: str) -> tuple[int, str]:
-    """Load the fixed 10 test questions from a JSON file."""
+    """Load the fixed 10 test questions from a JSON file (one multi-row INSERT)."""
     conn = _get_conn()
     if not conn:
         return 0, "DB connection failed"
     try:
         with open(filepath, "r") as f:
             data = json.load(f)
-        inserted = 0
+        rows = [(
+            q["question_id"], q["skill"], q["question_text"],
+            q["option_a"], q["option_b"], q["option_c"], q["option_d"],
+            q["correct_option"], q.get("explanation", ""),
+            q["display_order"],
+        ) for q in data.get("questions", [])]
+        if not rows:
+            return 0, ""
         with conn:
             with conn.cursor() as cur:
-                for q in data.get("questions", []):
-                    cur.execute("""
-                        INSERT INTO test_questions
-                            (question_id, skill, question_text,
-                             option_a, option_b, option_c, option_d,
-                             correct_option, explanation, display_order)
-                        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                        ON CONFLICT (question_id) DO NOTHING
-                    """, (
-                        q["question_id"], q["skill"], q["question_text"],
-                        q["option_a"], q["option_b"], q["option_c"], q["option_d"],
-                        q["correct_option"], q.get("explanation", ""),
-                        q["display_order"],
-                    ))
-                    inserted += cur.rowcount
-        return inserted, ""
+                inserted = psycopg2.extras.execute_values(cur, """
+                    INSERT INTO test_questions
+                        (question_id, skill, question_text,
+                         option_a, option_b, option_c, option_d,
+                         correct_option, explanation, display_order)
+                    VALUES %s
+                    ON CONFLICT (question_id) DO NOTHING
+                    RETURNING question_id
+                """, rows, page_size=BULK_PAGE_SIZE, fetch=True)
+        return len(inserted), ""
     except Exception as e:
         return 0, str(e)
     finally:
@@ -189,6 +176,31 @@ def save_test_response(session_id: str, question_id: str,
         conn.close()
 
 
+def save_test_responses_batch(rows: list[dict]) -> str:
+    """Write-behind flusher: many save_test_response() rows in one multi-row INSERT."""
+    if not rows:
+        return ""
+    conn = _get_conn()
+    if not conn:
+        return "DB connection failed"
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO test_responses
+                        (session_id, question_id, skill, selected_option, is_correct)
+                    VALUES %s
+                """, [(r["session_id"], r["question_id"], r["skill"],
+                       r["selected_option"], r["is_correct"]) for r in rows],
+                    template="(%s::uuid, %s, %s, %s, %s)",
+                    page_size=BULK_PAGE_SIZE)
+        return ""
+    except Exception as e:
+        return str(e)
+    finally:
+        conn.close()
+
+
 def complete_test_session(session_id: str, total_correct: int, total_score: int):
     conn = _get_conn()
     if not conn:
@@ -203,40 +215,43 @@ def complete_test_session(session_id: str, total_correct: int, total_score: int)
                         status        = 'completed',
                         completed_at  = NOW()
                     WHERE session_id = %s::uuid
+                    RETURNING student_name, completed_at
                 """, (total_correct, total_score, session_id))
+                row = cur.fetchone()
+                if row:
+                    leaderboard.record(cur, "test", session_id, total_correct, {
+                        "session_id": session_id, "student_name": row[0],
+                        "total_correct": total_correct, "total_score": total_score,
+                        "completed_at": row[1],
+                    })
     except Exception as e:
         print(f"[Test DB] complete_test_session error: {e}")
     finally:
         conn.close()
 
 
-def get_test_leaderboard() -> list[dict]:
-    """Ranked by total_correct DESC, then completed_at ASC (faster wins ties)."""
-    conn = _get_conn()
-    if not conn:
-        return []
-    try:
-        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute("""
-                SELECT
-                    session_id,
-                    student_name,
-                    total_correct,
-                    total_score,
-                    completed_at,
-                    RANK() OVER (
-                        ORDER BY total_correct DESC, completed_at ASC
-                    ) AS rank
-                FROM test_sessions
-                WHERE status = 'completed'
-                ORDER BY total_correct DESC, completed_at ASC
-            """)
-            return [dict(r) for r in cur.fetchall()]
-    except Exception as e:
-        print(f"[Test DB] get_test_leaderboard error: {e}")
-        return []
-    finally:
-        conn.close()
+def get_test_leaderboard(limit: int | None = None, offset: int = 0) -> list[dict]:
+    """
+    Ranked by total_correct DESC, then completion order (faster wins ties).
+    Rows [offset, offset+limit) (limit None = all), from the leaderboard
+    summary tables.
+    """
+    return leaderboard.top("test", limit, offset)
+
+
+def get_test_rank(session_id: str) -> dict | None:
+    """One session's test leaderboard row + "rank" and "total", or None."""
+    return leaderboard.rank_of("test", session_id)
+
+
+def get_test_neighbours(session_id: str, k: int = 2) -> list[dict]:
+    """The session's leaderboard row with up to k rows either side ([] if not ranked)."""
+    return leaderboard.neighbours("test", session_id, k)
+
+
+def get_test_summary() -> dict:
+    """{"count", "avg", "max", "min"} of total_correct over completed tests."""
+    return leaderboard.summary("test")
 
 
 def get_skill_breakdown(session_id: str) -> dict:
@@ -0,0 +1,152 @@
+"""
+Tests for db_pool.ConnectionPool.
+Uses an in-memory fake connection, so no PostgreSQL server is needed.
+
+Run:  python -m pytest test_db_pool.py -q
+"""
+
+import threading
+import time
+
+import psycopg2.extensions
+
+from db_pool import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        if self.conn.broken:
+            raise RuntimeError("server closed the connection unexpectedly")
+        self.conn.in_tx = True
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.in_tx  = False
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def get_transaction_status(self):
+        return (psycopg2.extensions.TRANSACTION_STATUS_INTRANS if self.in_tx
+                else psycopg2.extensions.TRANSACTION_STATUS_IDLE)
+
+    def rollback(self):
+        self.in_tx = False
+
+    def close(self):
+        self.closed = 1
+
+
+def _pool(**kw):
+    made = []
+
+    def connect():
+        c = FakeConn()
+        made.append(c)
+        return c
+
+    return ConnectionPool(connect=connect, **kw), made
+
+
+def test_connection_is_reused():
+    pool, made = _pool(maxconn=2)
+    for _ in range(5):
+        conn = pool.getconn()
+        conn.close()
+    s = pool.stats()
+    assert len(made) == 1
+    assert s["misses"] == 1 and s["hits"] == 4
+    assert s["size"] == 1 and s["idle"] == 1
+
+
+def test_open_transaction_rolled_back_on_return():
+    pool, made = _pool()
+    conn = pool.getconn()
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1")
+    assert made[0].in_tx
+    conn.close()
+    assert not made[0].in_tx
+
+
+def test_exhausted_pool_waits_then_times_out():
+    pool, _ = _pool(maxconn=1, timeout=0.05)
+    held = pool.getconn()
+    try:
+        pool.getconn()
+        assert False, "expected PoolTimeout"
+    except PoolTimeout:
+        pass
+    held.close()
+    s = pool.stats()
+    assert s["waits"] == 1 and s["timeouts"] == 1
+
+
+def test_waiter_gets_returned_connection():
+    pool, made = _pool(maxconn=1, timeout=2.0)
+    held = pool.getconn()
+    threading.Timer(0.05, held.close).start()
+    conn = pool.getconn()
+    conn.close()
+    assert len(made) == 1
+    assert pool.stats()["waits"] == 1
+
+
+def test_idle_connections_recycled_down_to_min():
+    pool, made = _pool(minconn=1, maxconn=3, max_idle=0.01)
+    conns = [pool.getconn() for _ in range(3)]
+    for c in conns:
+        c.close()
+    time.sleep(0.03)
+    pool.getconn().close()
+    s = pool.stats()
+    assert s["recycled"] == 2
+    assert s["size"] == 1
+    assert sum(c.closed for c in made) == 2
+
+
+def test_dead_connection_replaced_by_health_check():
+    pool, made = _pool(check_after=0.0)
+    pool.getconn().close()
+    made[0].broken = True
+    conn = pool.getconn()
+    assert conn.raw is made[1]
+    conn.close()
+    assert pool.stats()["health_failures"] == 1
+
+
+def test_concurrent_checkouts_never_exceed_max():
+    pool, made = _pool(maxconn=4, timeout=5.0)
+    peak, lock, active = [0], threading.Lock(), [0]
+
+    def worker():
+        for _ in range(50):
+            conn = pool.getconn()
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.0005)
+            with lock:
+                active[0] -= 1
+            conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] <= 4
+    assert len(made) <= 4
+    assert pool.stats()["checkouts"] == 16 * 50
@@ -0,0 +1,73 @@
+"""
+Tests for embeddings.py (lazy shared encoder, LRU cache, disk store).
+
+The encoder is a small deterministic stand-in assigned to embeddings._model,
+so no model download is needed.
+
+Run:  python -m pytest test_embeddings.py -q
+"""
+
+import numpy as np
+import pytest
+
+import embeddings
+
+
+class _Encoder:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, **kw):
+        self.calls.append(list(texts))
+        v = np.array([[len(t), t.count("a") + 1.0] for t in texts], dtype=np.float32)
+        return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def enc(monkeypatch):
+    e = _Encoder()
+    monkeypatch.setattr(embeddings, "_model", e)
+    monkeypatch.setattr(embeddings, "_lru", embeddings.OrderedDict())
+    monkeypatch.setattr(embeddings, "_store", None)
+    monkeypatch.setattr(embeddings, "_store_opened", True)
+    return e
+
+
+def test_repeated_texts_are_encoded_once_in_one_batch(enc, monkeypatch):
+    first = embeddings.encode(["alpha", "beta", "alpha"])
+    assert enc.calls == [["alpha", "beta"]]
+    assert first.shape == (3, 2) and np.allclose(first[0], first[2])
+
+    again = embeddings.encode(["beta", "gamma", "alpha"])
+    assert enc.calls[-1] == ["gamma"]
+    assert np.allclose(again[0], first[1]) and np.allclose(again[2], first[0])
+
+    monkeypatch.setattr(embeddings, "EMBED_CACHE_SIZE", 2)
+    embeddings.clear_cache()
+    embeddings.encode(["a", "b", "c"])
+    assert list(embeddings._lru) == [embeddings.text_key("b"), embeddings.text_key("c")]
+
+
+def test_disk_store_survives_a_restart(enc, tmp_path, monkeypatch):
+    path = str(tmp_path / "emb.sqlite3")
+    monkeypatch.setattr(embeddings, "_store", embeddings.EmbeddingStore(path))
+    first = embeddings.encode(["model answer", "validator answer"])
+    assert len(enc.calls) == 1 and embeddings._store.count() == 2
+
+    # new process: empty LRU, fresh encoder, same store file
+    fresh = _Encoder()
+    monkeypatch.setattr(embeddings, "_model", fresh)
+    monkeypatch.setattr(embeddings, "_store", embeddings.EmbeddingStore(path))
+    embeddings.clear_cache()
+    again = embeddings.encode(["validator answer", "model answer", "new text"])
+    assert fresh.calls == [["new text"]]
+    assert np.allclose(again[:2], first[::-1])
+
+
+def test_generator_does_not_load_the_encoder(monkeypatch):
+    pytest.importorskip("groq")
+    monkeypatch.setenv("GROQ_API_KEY", "gsk_test")
+    monkeypatch.setattr(embeddings, "get_model",
+                        lambda: pytest.fail("encoder loaded at construction"))
+    from question_generator import QuestionGenerator
+    QuestionGenerator()
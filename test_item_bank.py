@@ -0,0 +1,81 @@
+"""
+Tests for mcq_irt.item_bank — the ItemPool must pick what select_question() picks.
+
+Run:  python -m pytest test_item_bank.py -q
+"""
+
+import random
+
+import numpy as np
+
+import mcq_irt.rasch_engine as irt
+from mcq_irt.item_bank import ItemBank, ItemPool
+
+
+def _questions(n: int, seed: int = 0, decimals: int = 6) -> list[dict]:
+    rnd = random.Random(seed)
+    return [{"question_id": f"q{i}", "skill": "DSA" if i % 2 else "SQL",
+             "b_param": round(rnd.uniform(-2, 2), decimals),
+             "correct_option": "a", "question_text": f"Q{i}"} for i in range(n)]
+
+
+def test_matches_scan_on_distinct_b():
+    qs   = _questions(500)
+    pool = ItemPool(qs)
+    rnd  = random.Random(3)
+    for _ in range(200):
+        theta = rnd.uniform(-3, 3)
+        asked = set(rnd.sample([q["question_id"] for q in qs], 50))
+        last  = rnd.choice([None, True, False])
+        want  = irt.select_question(qs, theta, asked, last)
+        cands = [q for q in qs if q["question_id"] not in asked
+                 and (last is not False or q["b_param"] <= theta)]
+        dists = sorted(abs(q["b_param"] - theta) for q in cands)
+        if len(dists) > 1 and dists[1] - dists[0] < 1e-4:
+            continue            # genuine near-tie: the noise decides in both
+        got   = pool.select(theta, pool.new_mask(asked), last)
+        assert got["question_id"] == want["question_id"]
+
+
+def test_step_down_after_wrong_answer():
+    pool = ItemPool(_questions(200))
+    mask = pool.new_mask()
+    q    = pool.select(0.5, mask, last_correct=False)
+    assert q["b_param"] <= 0.5
+    # nothing easier than θ left → falls back to the closest item
+    q = pool.select(-5.0, mask, last_correct=False)
+    assert q["b_param"] == pool.b[0]
+
+
+def test_ties_broken_randomly_within_tied_set():
+    qs   = [{"question_id": f"q{i}", "b_param": 0.0} for i in range(20)]
+    qs  += [{"question_id": "far", "b_param": 1.0}]
+    pool = ItemPool(qs, rng=np.random.default_rng(0))
+    picks = {pool.select(0.0, pool.new_mask())["question_id"] for _ in range(200)}
+    assert len(picks) > 5 and "far" not in picks
+
+
+def test_exhausted_pool_returns_none():
+    pool = ItemPool(_questions(3))
+    mask = pool.new_mask([f"q{i}" for i in range(3)])
+    assert pool.select(0.0, mask) is None
+
+
+def test_vectorized_irt_matches_scalar():
+    pool = ItemPool(_questions(100))
+    p, info = pool.p_correct(0.7), pool.fisher_info(0.7)
+    for i, b in enumerate(pool.b):
+        assert abs(p[i] - irt.p_correct(0.7, b)) < 1e-12
+        assert abs(info[i] - irt.fisher_info(0.7, b)) < 1e-12
+
+
+def test_skill_session_with_item_pool_never_repeats():
+    bank = ItemBank.from_questions(_questions(60))
+    sess = irt.SkillSession("DSA", quiz_length=30)
+    seen = []
+    while not sess.done:
+        q = sess.next_question(bank["DSA"])
+        seen.append(q["question_id"])
+        sess.record_answer(q, "a" if len(seen) % 3 else "b")
+    assert len(seen) == len(set(seen)) == 30
+    assert sess.next_question(bank["DSA"]) is None
@@ -0,0 +1,183 @@
+"""
+Tests for leaderboard.py (summary-table leaderboards).
+
+Needs a reachable PostgreSQL (POSTGRES_* env vars); skipped otherwise.
+Each test works on its own throw-away board (family:suffix) and deletes it.
+
+Run:  python -m pytest test_leaderboard.py -q
+"""
+
+import random
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+import db_pool
+import leaderboard as lb
+from mcq_irt import mcq_database as db
+
+
+def _db_ready() -> bool:
+    try:
+        return lb.init_db()
+    except Exception:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not _db_ready(), reason="PostgreSQL not reachable")
+
+
+@pytest.fixture
+def board(request):
+    name = f"{request.param}:__test_{uuid.uuid4().hex[:8]}"
+    yield name
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        cur.execute("DELETE FROM lb_entries WHERE board = %s", (name,))
+        cur.execute("DELETE FROM lb_buckets WHERE board = %s", (name,))
+    conn.close()
+
+
+def _record_all(board: str, entries):
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        for entry_id, score in entries:
+            lb.record(cur, board, entry_id, score, {"student_name": entry_id})
+    conn.close()
+
+
+def _expected_ranks(entries, shared: bool) -> dict:
+    """RANK() over score DESC (shared) or ROW_NUMBER over score DESC, arrival ASC."""
+    order = sorted(range(len(entries)), key=lambda i: (-entries[i][1], i))
+    ranks = {}
+    for pos, i in enumerate(order, start=1):
+        ranks[entries[i][0]] = (1 + sum(1 for _, s in entries if s > entries[i][1])
+                                if shared else pos)
+    return ranks
+
+
+@pytest.mark.parametrize("board", ["mcq_overall"], indirect=True)
+def test_theta_board_matches_rank_over_every_page(board):
+    rnd = random.Random(0)
+    entries = [(f"s{i}", round(rnd.gauss(0, 1), 2)) for i in range(400)]   # many ties
+    _record_all(board, entries)
+    expected = _expected_ranks(entries, shared=True)
+
+    seen = []
+    for offset in range(0, 400, 37):
+        rows = lb.top(board, 37, offset)
+        seen += [(r["student_name"], r["rank"]) for r in rows]
+    assert len(seen) == 400
+    assert all(expected[name] == rank for name, rank in seen)
+    assert [r for _, r in seen] == sorted(r for _, r in seen)
+
+    for name in ("s0", "s17", "s399"):
+        row = lb.rank_of(board, name)
+        assert row["rank"] == expected[name] and row["total"] == 400
+
+    s = lb.summary(board)
+    scores = [sc for _, sc in entries]
+    assert s["count"] == 400 and s["max"] == max(scores) and s["min"] == min(scores)
+    assert s["avg"] == pytest.approx(sum(scores) / 400)
+
+
+@pytest.mark.parametrize("board", ["test"], indirect=True)
+def test_test_board_breaks_ties_by_arrival(board):
+    rnd = random.Random(1)
+    entries = [(f"t{i}", rnd.randint(0, 10)) for i in range(300)]
+    _record_all(board, entries)
+    expected = _expected_ranks(entries, shared=False)
+    rows = lb.top(board, None)
+    assert [r["rank"] for r in rows] == list(range(1, 301))
+    assert all(expected[r["student_name"]] == r["rank"] for r in rows)
+    assert lb.rank_of(board, "t150")["rank"] == expected["t150"]
+    assert lb.top(board, 5, 298) == rows[298:]
+
+
+@pytest.mark.parametrize("board", ["mcq_overall", "test"], indirect=True)
+def test_neighbours_are_the_matching_slice_of_top(board):
+    rnd = random.Random(3)
+    entries = [(f"n{i}", round(rnd.gauss(0, 1), 1)) for i in range(120)]  # heavy ties
+    _record_all(board, entries)
+    rows = lb.top(board, None)
+    for pos in (0, 1, 57, 118, 119):
+        me = rows[pos]["student_name"]
+        assert lb.neighbours(board, me, 3) == rows[max(0, pos - 3):pos + 4]
+    assert lb.neighbours(board, "missing") == []
+
+
+@pytest.mark.parametrize("board", ["mcq_overall"], indirect=True)
+def test_rerecord_moves_entry_between_buckets(board):
+    _record_all(board, [("a", 1.5), ("b", 0.2), ("c", -0.7)])
+    assert lb.rank_of(board, "c")["rank"] == 3
+    _record_all(board, [("c", 2.4)])                   # retaken — now on top
+    assert [r["student_name"] for r in lb.top(board)] == ["c", "a", "b"]
+    s = lb.summary(board)
+    assert s["count"] == 3 and s["avg"] == pytest.approx((1.5 + 0.2 + 2.4) / 3)
+    assert lb.rank_of(board, "missing") is None
+
+
+@pytest.mark.parametrize("board", ["test"], indirect=True)
+def test_completed_at_is_stored_as_iso_and_read_back_as_datetime(board):
+    ts   = datetime(2026, 3, 1, 9, 30, 15, 250000, tzinfo=timezone.utc)
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        lb.record(cur, board, "a", 7, {"student_name": "a", "completed_at": ts})
+        cur.execute("SELECT payload->>'completed_at', to_jsonb(%s::timestamptz)->>0 "
+                    "FROM lb_entries WHERE board = %s", (ts, board))
+        stored, from_sql = cur.fetchone()
+    conn.close()
+    assert stored == ts.isoformat() and "T" in from_sql       # same format as rebuild()
+    assert datetime.fromisoformat(from_sql) == ts
+    assert lb.top(board)[0]["completed_at"] == ts
+    assert lb.rank_of(board, "a")["completed_at"] == ts
+
+
+@pytest.fixture
+def skill_profiles():
+    """Two throw-away skills (one active question each) with 60 / 0 profiles."""
+    tag    = uuid.uuid4().hex[:8]
+    skills = (f"__lbA_{tag}", f"__lbB_{tag}")
+    rnd    = random.Random(2)
+    rows   = [(str(uuid.uuid4()), f"p{i}", skills[0], round(rnd.gauss(0, 1), 1))
+              for i in range(60)]                           # 0.1 steps → ties
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        for skill in skills:
+            cur.execute("""
+                INSERT INTO mcq_questions (question_id, skill, question_text, option_a,
+                                           option_b, option_c, option_d, correct_option, b_param)
+                VALUES (%s, %s, 'q', 'a', 'b', 'c', 'd', 'a', 0.0)
+            """, (f"q{skill}", skill))
+        for sid, name, skill, theta in rows:
+            cur.execute("""
+                INSERT INTO mcq_skill_profiles (session_id, student_name, student_email, skill,
+                                                theta_final, proficiency_score, proficiency_label)
+                VALUES (%s, %s, 'x@y', %s, %s, 50, 'Intermediate')
+            """, (sid, name, skill, theta))
+    conn.close()
+    yield skills, rows
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        cur.execute("DELETE FROM mcq_skill_profiles WHERE skill = ANY(%s)", (list(skills),))
+        cur.execute("DELETE FROM mcq_questions WHERE skill = ANY(%s)", (list(skills),))
+    conn.close()
+
+
+def test_all_skills_top_k_and_my_rank_in_one_query(skill_profiles):
+    (skill_a, skill_b), rows = skill_profiles
+    rank = {sid: 1 + sum(1 for *_, t in rows if t > theta) for sid, _, _, theta in rows}
+    me   = min(rows, key=lambda r: r[3])                    # bottom of the board
+
+    lb_all = db.get_all_skills_leaderboard(5, me[0])
+    top = lb_all[skill_a]["top"]
+    assert len(top) == 5 and [r["row_num"] for r in top] == [1, 2, 3, 4, 5]
+    assert all(r["skill_rank"] == rank[r["session_id"]] for r in top)
+    assert [r["theta_final"] for r in top] == sorted((t for *_, t in rows), reverse=True)[:5]
+    assert lb_all[skill_a]["me"]["skill_rank"] == rank[me[0]]
+    assert lb_all[skill_b] == {"top": [], "me": None}       # active, no submissions
+
+    everyone = db.get_all_skills_leaderboard(None)[skill_a]
+    assert len(everyone["top"]) == 60 and everyone["me"] is None
+    assert all(r["skill_rank"] == rank[r["session_id"]] for r in everyone["top"])
@@ -0,0 +1,97 @@
+"""
+Tests for llm_cache.py (content-addressed completion cache).
+
+The call-site tests need the groq SDK and run against the local stub LLM
+(benchmarks/stub_llm.py). Each test uses its own cache file under tmp_path.
+
+Run:  python -m pytest test_llm_cache.py -q
+"""
+
+import pytest
+
+import llm_cache
+
+MESSAGES = [{"role": "user", "content": "Explain indexing."}]
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    c = llm_cache.LLMCache(str(tmp_path / "llm.sqlite3"), max_entries=100, max_mb=1)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_cache, "_cache", c)
+    return c
+
+
+def test_key_covers_model_messages_temperature_and_max_tokens():
+    base = llm_cache.cache_key("m", MESSAGES, 0.2, 300)
+    assert base == llm_cache.cache_key("m", [dict(MESSAGES[0])], 0.2, 300)
+    assert len({base,
+                llm_cache.cache_key("m2", MESSAGES, 0.2, 300),
+                llm_cache.cache_key("m", MESSAGES, 0.3, 300),
+                llm_cache.cache_key("m", MESSAGES, 0.2, 301),
+                llm_cache.cache_key("m", [{"role": "user", "content": "Explain joins."}],
+                                    0.2, 300)}) == 5
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    c = llm_cache.LLMCache(str(tmp_path / "lru.sqlite3"), max_entries=10, max_mb=1)
+    for i in range(10):
+        c.put(f"k{i}", "site", "m", f"text {i}")
+    assert c.get("k0") == "text 0"                   # k0 is now the most recent
+    c.put("k10", "site", "m", "text 10")             # 11 > 10 → evict down to 9
+    assert c.stats()["entries"] == 9
+    assert c.get("k0") == "text 0" and c.get("k10") == "text 10"
+    assert c.get("k1") is None and c.get("k2") is None
+
+    big = llm_cache.LLMCache(str(tmp_path / "size.sqlite3"), max_entries=1000, max_mb=0.01)
+    for i in range(20):
+        big.put(f"k{i}", "site", "m", "x" * 1000)
+    assert big.stats()["bytes"] <= 0.01 * 1024 * 1024
+
+
+def test_policy_accept_hook_and_stats(cache):
+    pytest.importorskip("groq")
+    from groq import Groq
+    from benchmarks.stub_llm import StubLLM
+
+    with StubLLM(latency=0.0) as stub:
+        client = Groq()
+        kw = dict(model="m", messages=MESSAGES, max_tokens=100)
+        first = llm_cache.complete(client, "low", temperature=0.2, **kw)
+        assert llm_cache.complete(client, "low", temperature=0.2, **kw) == first
+        assert stub.stats()["requests"] == 1
+
+        llm_cache.complete(client, "hot", temperature=0.7, **kw)
+        llm_cache.complete(client, "hot", temperature=0.7, **kw)
+        assert stub.stats()["requests"] == 3               # not cached without opt-in
+        cache.opt_in.add("hot")
+        llm_cache.complete(client, "hot", temperature=0.7, **kw)
+        llm_cache.complete(client, "hot", temperature=0.7, **kw)
+        assert stub.stats()["requests"] == 4
+
+        rejected = dict(kw, max_tokens=99)
+        llm_cache.complete(client, "low", temperature=0.2, accept=lambda t: False, **rejected)
+        llm_cache.complete(client, "low", temperature=0.2, **rejected)
+        assert stub.stats()["requests"] == 6               # rejected reply was not stored
+
+    s = llm_cache.stats()
+    assert s["sites"]["low"] == {"hits": 1, "misses": 3, "bypassed": 0, "hit_rate": 0.25}
+    assert s["sites"]["hot"]["bypassed"] == 2 and s["sites"]["hot"]["hits"] == 1
+
+
+def test_rerunning_an_evaluation_costs_no_call(cache):
+    pytest.importorskip("groq")
+    from benchmarks.stub_llm import StubLLM
+
+    with StubLLM(latency=0.0) as stub:
+        from answer_evaluator import AnswerEvaluator
+        ev   = AnswerEvaluator()
+        args = ("What is an index?", "A lookup structure that speeds up reads on a column "
+                "at the cost of slower writes and extra storage.",
+                "An index speeds up reads.", "SQL")
+        first = ev.evaluate_answer(*args)
+        again = ev.evaluate_answer(*args)
+        assert stub.stats()["requests"] == 1
+        assert again == first and first["likert"] == 2
+        ev.evaluate_answer(args[0], "No idea.", *args[2:])
+        assert stub.stats()["requests"] == 2
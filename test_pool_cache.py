@@ -0,0 +1,138 @@
+"""
+Tests for mcq_irt.pool_cache.PoolCache (no DB — loaders are plain functions).
+
+Run:  python -m pytest test_pool_cache.py -q
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import mcq_irt.rasch_engine as irt
+from mcq_irt.item_bank import ItemPool, LiveBanks
+from mcq_irt.pool_cache import PoolCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _questions(skill: str, n: int = 10) -> list[dict]:
+    return [{"question_id": f"{skill}{i}", "skill": skill, "b_param": -2.0 + 0.4 * i}
+            for i in range(n)]
+
+
+def _cache(versions=None, ttl=60.0, check=5.0, delay=0.0):
+    loads = []
+
+    def loader(skill):
+        loads.append(skill)
+        time.sleep(delay)
+        return ItemPool(_questions(skill) if skill != "Empty" else [])
+
+    clock = Clock()
+    cache = PoolCache(loader, (lambda: dict(versions)) if versions is not None else None,
+                      ttl=ttl, check_seconds=check, clock=clock)
+    return cache, loads, clock
+
+
+def test_sessions_share_one_read_only_snapshot():
+    cache, loads, _ = _cache()
+    bank_a, bank_b = cache.bank(["SQL", "Python"]), cache.bank(["SQL", "Python"])
+    assert bank_a["SQL"] is bank_b["SQL"] and loads == ["SQL", "Python"]
+    with pytest.raises(ValueError):
+        bank_a["SQL"].b[0] = 9.9
+    pool = bank_a["SQL"]
+    mask_a, mask_b = pool.new_mask(), pool.new_mask()       # per-candidate state
+    pool.mark_asked(mask_a, pool.select(0.0, mask_a)["question_id"])
+    assert mask_a.sum() == len(pool) - 1 and mask_b.all()
+    s = cache.stats()
+    assert (s["hits"], s["misses"], s["loads"], s["entries"]) == (2, 2, 2, 2)
+
+
+def test_ttl_expiry_reloads():
+    cache, loads, clock = _cache(ttl=60.0)
+    first = cache.get("SQL")
+    clock.now = 59.0
+    assert cache.get("SQL") is first
+    clock.now = 60.0
+    assert cache.get("SQL") is not first
+    assert loads == ["SQL", "SQL"] and cache.stats()["expired"] == 1
+
+
+def test_version_bump_invalidates_after_next_poll():
+    versions = {"SQL": 1}
+    cache, loads, clock = _cache(versions, check=5.0)
+    first = cache.get("SQL")
+    cache.get("Python")
+    versions["SQL"] = 2                     # bulk recalibration of SQL
+    clock.now = 4.0
+    assert cache.get("SQL") is first        # not polled yet
+    clock.now = 5.0
+    assert cache.get("SQL") is not first
+    assert loads == ["SQL", "Python", "SQL"]
+    assert cache.stats()["invalidated"] == 1
+
+
+def test_concurrent_misses_load_once_and_empty_pools_are_not_cached():
+    cache, loads, _ = _cache(delay=0.05)
+    got = []
+    threads = [threading.Thread(target=lambda: got.append(cache.get("SQL"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert loads == ["SQL"] and all(p is got[0] for p in got)
+    assert len(cache.get("Empty")) == 0 and len(cache.get("Empty")) == 0
+    assert loads.count("Empty") == 2
+
+
+def test_live_banks_refresh_each_shared_pool_once():
+    cache, _, _ = _cache()
+    live  = LiveBanks(cache)
+    banks = [cache.bank(["SQL"]) for _ in range(3)]
+    for bank in banks:
+        live.add(bank)
+    old = cache.get("SQL")
+    assert live.refresh({"SQL3": (0.25, 9, 4)}) == 1
+    pool = cache.get("SQL")
+    assert pool is not old and all(bank["SQL"] is pool for bank in banks)
+    q = pool.questions[pool.index["SQL3"]]
+    assert (q["b_param"], q["response_count"]) == (0.25, 9)
+    assert np.all(np.diff(pool.b) >= 0) and not pool.b.flags.writeable
+    assert pool.b[pool.index["SQL3"]] == 0.25                # selection sees the new b
+
+
+def test_refresh_leaves_the_shared_snapshot_alone():
+    cache, _, _ = _cache()
+    old  = cache.get("SQL")
+    q3   = old.questions[old.index["SQL3"]]
+    before = (dict(q3), old.b.copy())
+    live = LiveBanks(cache)
+    live.add(cache.bank(["SQL"]))
+    live.refresh({"SQL3": (1.9, 9, 4)})
+    assert (q3, list(old.b)) == (before[0], list(before[1]))
+    new = cache.get("SQL")
+    assert new.questions[-1]["question_id"] == "SQL3"         # re-sorted by the new b
+    assert new.questions[0] is old.questions[0]              # unchanged dicts are shared
+
+
+def test_session_moves_to_the_refreshed_snapshot_without_repeats():
+    cache, _, _ = _cache()
+    live = LiveBanks(cache)
+    bank = cache.bank(["SQL"])
+    live.add(bank)
+    sess = irt.SkillSession("SQL", quiz_length=10)
+    asked = []
+    while not sess.done:
+        q = sess.next_question(bank["SQL"])
+        asked.append(q["question_id"])
+        sess.record_answer({**q, "correct_option": "a", "question_text": "Q"}, "a")
+        live.refresh({"SQL0": (2.0, 1, 1), q["question_id"]: (-2.0, 1, 1)})
+    assert sorted(asked) == sorted(f"SQL{i}" for i in range(10))
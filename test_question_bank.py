@@ -0,0 +1,113 @@
+"""
+Tests for question_bank.py (cross-session question reuse).
+
+Needs a reachable PostgreSQL (POSTGRES_* env vars); skipped otherwise.
+The generator test also needs the groq SDK and runs against the local
+stub LLM (benchmarks/stub_llm.py). Every test uses its own throw-away
+skill name and deletes its bank rows.
+
+Run:  python -m pytest test_question_bank.py -q
+"""
+
+import uuid
+
+import pytest
+
+import db_pool
+import embeddings
+import llm_cache
+import question_bank as qb
+
+
+def _db_ready() -> bool:
+    try:
+        return qb.init_db()
+    except Exception:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not _db_ready(), reason="PostgreSQL not reachable")
+
+
+@pytest.fixture(autouse=True)
+def no_completion_cache(monkeypatch):
+    """Keep stub replies out of the shared .llm_cache.sqlite3 (and call counts exact)."""
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", False)
+
+
+@pytest.fixture(autouse=True)
+def no_encoder(monkeypatch):
+    """No sentence encoder → no validator calls, so request counts are generation calls only."""
+    monkeypatch.setattr(embeddings, "_model", None)
+    monkeypatch.setattr(embeddings, "_load_failed", True)
+
+
+@pytest.fixture
+def skill():
+    name = f"__qb_{uuid.uuid4().hex[:8]}"
+    yield name
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        cur.execute("""
+            DELETE FROM oe_bank_exposure WHERE question_hash IN
+                (SELECT question_hash FROM oe_question_bank WHERE skill_key = %s)
+        """, (name.lower(),))
+        cur.execute("DELETE FROM oe_question_bank WHERE skill_key = %s", (name.lower(),))
+    conn.close()
+
+
+def _questions(skill, n, difficulty="medium", confidence="high"):
+    return [{"skill": skill, "category": "Databases", "difficulty": difficulty,
+             "question": f"What is {skill} idea {i}?", "model_answer": f"Idea {i}.",
+             "hints": ["h"], "type": "conceptual", "b_param": 0.1,
+             "confidence": confidence, "similarity": 0.9} for i in range(n)]
+
+
+def test_exposure_limit_and_confidence_floor(skill):
+    bank = qb.QuestionBank(max_exposure=1, min_confidence="medium")
+    assert bank.add(_questions(skill, 5)) == 5
+    assert bank.add(_questions(skill, 5)) == 0                       # same texts → no duplicates
+    bank.add([{**_questions(skill, 1, confidence="low")[0], "question": f"Low {skill}?"}])
+
+    first = bank.take(skill, "medium", 3, "alice@example.com")
+    assert len(first) == 3 and all(q["source"] == "bank" for q in first)
+    again = bank.take(skill, "medium", 3, "alice@example.com")
+    assert len(again) == 2                                            # only the unseen ones
+    assert not {q["question"] for q in first} & {q["question"] for q in again}
+    assert all(not q["question"].startswith("Low") for q in first + again)
+
+    assert len(bank.take(skill, "medium", 3, "bob@example.com")) == 3
+    assert bank.take(skill, "hard", 3, "bob@example.com") == []
+
+    s = bank.stats()
+    assert s["requested"] == 12 and s["served"] == 8 and s["cells_full"] == 2
+    assert s["hit_ratio"] == round(8 / 12, 3)
+
+
+def test_generator_tops_up_only_what_the_bank_cannot_fill(skill):
+    pytest.importorskip("groq")
+    from benchmarks.stub_llm import StubLLM
+
+    data = {"categories": {"Databases": [{"name": skill}]}}
+    with StubLLM(latency=0.01) as stub:
+        from question_generator import QuestionGenerator
+        gen = QuestionGenerator(qb.QuestionBank(max_exposure=1))
+
+        alice = gen.generate_questions(data, 2, candidate="alice@example.com")
+        assert stub.stats()["requests"] == 3                          # one call per cell
+        assert all(q.get("source", "llm") == "llm" for q in alice)
+
+        stub.reset()
+        bob = gen.generate_questions(data, 2, candidate="bob@example.com")
+        assert stub.stats()["requests"] == 0                          # all served from the bank
+        assert [q["question_id"] for q in bob] == [q["question_id"] for q in alice]
+        assert all(q["source"] == "bank" for q in bob)
+        assert {q["difficulty"] for q in bob} == {"easy", "medium", "hard"}
+
+        stub.reset()
+        gen.generate_questions(data, 2, candidate="alice@example.com")
+        assert stub.stats()["requests"] == 3                          # alice has seen them all
+
+        s = gen.bank.stats()
+        assert s["cells_full"] == 3 and s["hit_ratio"] == round(6 / 18, 3)
+        assert s["llm_calls_saved"] >= 3
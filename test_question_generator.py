@@ -0,0 +1,220 @@
+"""
+Tests for QuestionGenerator against the local stub LLM (benchmarks/stub_llm.py).
+
+Needs the groq SDK (requirements_enhanced.txt); no network or API key.
+The LLM completion cache is switched off for every test.
+
+Run:  python -m pytest test_question_generator.py -q
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("groq")
+
+import llm_cache
+from benchmarks.stub_llm import StubLLM
+from benchmarks.bench_question_gen import skills_data
+
+
+@pytest.fixture(autouse=True)
+def no_completion_cache(monkeypatch):
+    """Keep stub replies out of the shared .llm_cache.sqlite3 (and request counts exact)."""
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", False)
+
+
+@pytest.fixture(scope="module")
+def stub():
+    with StubLLM(latency=0.05) as s:
+        yield s
+
+
+@pytest.fixture(scope="module")
+def gen(stub):
+    from question_generator import QuestionGenerator
+    return QuestionGenerator()
+
+
+def test_parallel_run_keeps_serial_ids_and_order(gen, stub):
+    data   = skills_data(5)
+    resume = "Projects: Chat App; Price Tracker"
+    serial = gen.generate_questions(data, 2, resume, max_workers=1)
+    stub.reset()
+    parallel = gen.generate_questions(data, 2, resume, max_workers=4)
+
+    assert [q["question_id"] for q in parallel] == [q["question_id"] for q in serial]
+    assert [q["question"] for q in parallel] == [q["question"] for q in serial]
+    assert len(parallel) == 5 * 3 * 2 + 2
+    assert parallel[0]["question_id"] == "q_1_ski_e" and parallel[-1]["question_id"] == "q_32_proj"
+    assert 1 < stub.stats()["max_inflight"] <= 4
+
+
+def test_concurrency_limit_is_respected(gen, stub):
+    stub.reset()
+    gen.generate_questions(skills_data(6), 1, max_workers=2)
+    s = stub.stats()
+    assert s["requests"] == 18 and s["max_inflight"] <= 2
+
+
+def test_stream_serves_first_medium_question_before_the_pool_is_done(gen, stub):
+    import mcq_irt.rasch_engine as irt
+
+    data   = skills_data(6)
+    stream = gen.stream_questions(data, 2, max_workers=2)
+    first_cat = stream.categories[0]
+    assert stream.wait(first_cat) and not stream.done
+
+    partial = stream.poll()
+    assert partial and len(partial) < 6 * 3 * 2
+    pool = [q for q in partial if q["category"] == first_cat]
+    assert {q["difficulty"] for q in pool} == {"medium"}
+    assert irt.select_question(pool, 0.0, set(), None) in pool
+
+    while not stream.done:
+        stream.wait(timeout=5)
+        partial += stream.poll()
+    partial += stream.poll()
+    serial = gen.generate_questions(data, 2, max_workers=1)
+    assert sorted(q["question_id"] for q in partial) == sorted(q["question_id"] for q in serial)
+    assert [q["question_id"] for q in stream.result()] == [q["question_id"] for q in serial]
+
+
+def test_multi_band_makes_one_call_per_skill_with_the_same_ids(gen, stub):
+    from question_generator import IRT_BANDS
+
+    data   = skills_data(4)
+    serial = gen.generate_questions(data, 2, max_workers=1)
+    stub.reset()
+    multi  = gen.generate_questions(data, 2, max_workers=2, multi_band=True)
+
+    assert stub.stats()["requests"] == 4
+    assert [q["question_id"] for q in multi] == [q["question_id"] for q in serial]
+    assert [q["difficulty"] for q in multi] == [q["difficulty"] for q in serial]
+    for q in multi:
+        band = IRT_BANDS[q["difficulty"]]
+        assert band["b_min"] <= q["b_param"] <= band["b_max"]
+
+
+def test_multi_band_retries_only_the_malformed_band(gen, stub):
+    stub.reset()
+    stub.malformed = ("hard",)
+    try:
+        qs = gen.generate_questions(skills_data(3), 2, max_workers=3, multi_band=True)
+    finally:
+        stub.malformed = ()
+    assert stub.stats()["requests"] == 3 * 2                # multi-band call + hard-only retry
+    hard = [q for q in qs if q["difficulty"] == "hard"]
+    assert len(qs) == 3 * 3 * 2 and len(hard) == 3 * 2
+    assert all(q["model_answer"] for q in qs)
+
+
+class _Encoder:
+    """Two-dimensional stand-in for the SentenceTransformer: "concept 2" answers point away."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, **kw):
+        self.calls.append(len(texts))
+        return np.array([[0.0, 1.0] if "concept 2 " in t else [1.0, 0.0] for t in texts])
+
+
+def test_pair_similarities_is_the_row_wise_cosine():
+    from question_generator import _pair_similarities
+    emb  = np.array([[1, 0], [3, 4], [0, 2], [2, 0], [4, 3], [0, -1]], dtype=float)
+    sims = _pair_similarities(emb, 3)
+    assert np.allclose(sims, [1.0, 24 / 25, -1.0])
+
+
+def test_validation_encodes_once_per_round_and_regenerates_only_low_items(stub, monkeypatch):
+    import embeddings
+    from question_generator import QuestionGenerator
+    monkeypatch.setattr(embeddings, "_model", enc := _Encoder())
+    monkeypatch.setattr(embeddings, "_lru", embeddings.OrderedDict())
+    gen = QuestionGenerator()
+
+    stub.reset()
+    qs = gen.generate_questions(skills_data(1), 2, max_workers=1)
+    # per cell: 1 generation + 2 validator answers, then 1 regeneration + 1 validator answer
+    assert stub.stats()["requests"] == 3 * 5
+    # the stub repeats answer texts across bands → only the first round encodes
+    # (2 model answers + 1 validator answer); every later round is an LRU hit
+    assert enc.calls == [3]
+    assert len(qs) == 6 and all(q["confidence"] == "high" for q in qs)
+    assert not any("concept 2 " in q["model_answer"] for q in qs)
+
+
+def test_multi_band_regenerated_items_stay_inside_their_band(stub, monkeypatch):
+    import embeddings
+    from question_generator import QuestionGenerator, IRT_BANDS
+    monkeypatch.setattr(embeddings, "_model", _Encoder())
+    monkeypatch.setattr(embeddings, "_lru", embeddings.OrderedDict())
+    gen = QuestionGenerator()
+    single_band = gen._generate_for_skill
+
+    def off_band(*args, **kw):                # retries come back with an out-of-range b
+        return [{**q, "b_param": 5.0} for q in single_band(*args, **kw)]
+
+    monkeypatch.setattr(gen, "_generate_for_skill", off_band)
+    stub.reset()
+    qs = gen.generate_questions(skills_data(1), 2, max_workers=1, multi_band=True)
+    # 1 multi-band call + 6 validator answers, then 1 retry per band + 3 validator answers
+    assert stub.stats()["requests"] == 1 + 6 + 3 + 3
+    assert len(qs) == 6 and not any("concept 2 " in q["model_answer"] for q in qs)
+    for q in qs:
+        band = IRT_BANDS[q["difficulty"]]
+        assert band["b_min"] <= q["b_param"] <= band["b_max"]
+
+
+def test_concurrent_cells_share_encode_calls(stub, monkeypatch):
+    import embeddings
+    from question_generator import QuestionGenerator, EncodeStage
+    monkeypatch.setattr(embeddings, "_model", enc := _Encoder())
+    monkeypatch.setattr(embeddings, "EMBED_CACHE_SIZE", 0)
+    gen = QuestionGenerator()
+    gen.encode_stage = EncodeStage(batch_size=1000, linger=5.0)
+
+    qs = gen.generate_questions(skills_data(4), 2, max_workers=6)
+    s  = gen.encode_stage.stats()
+    assert len(qs) == 4 * 3 * 2
+    # 12 cells × 2 rounds each validate; in lock-step they share encode() calls
+    assert s["requests"] == 24 and s["calls"] == len(enc.calls) < s["requests"]
+    assert s["texts_per_call"] > 2 * 2                    # more than one cell's pairs
+
+
+def test_encode_stage_runs_a_full_batch_without_waiting(monkeypatch):
+    import embeddings
+    from question_generator import EncodeStage
+    monkeypatch.setattr(embeddings, "_model", _Encoder())
+    stage = EncodeStage(batch_size=4, linger=60.0)
+    for _ in range(3):
+        stage.join()                                        # others are still validating
+    t0 = time.perf_counter()
+    assert stage.similarities([("concept 1 a", "b"), ("concept 2 x", "y")]) == [1.0, 0.0]
+    assert time.perf_counter() - t0 < 1.0
+
+
+def test_default_stage_does_not_wait_for_cells_still_fetching_answers(monkeypatch):
+    import embeddings
+    from question_generator import QuestionGenerator, EncodeStage
+    monkeypatch.setattr(embeddings, "_model", _Encoder())
+    stage = EncodeStage(QuestionGenerator.ENCODE_BATCH_SIZE, QuestionGenerator.ENCODE_LINGER)
+    for _ in range(6):
+        stage.join()                                        # five peers busy with the LLM
+    t0 = time.perf_counter()
+    assert stage.similarities([("concept 1 a", "b")]) == [1.0]
+    assert time.perf_counter() - t0 < 0.1
+
+
+def test_encoder_that_fails_to_load_costs_no_validator_calls(stub, monkeypatch):
+    import embeddings
+    from question_generator import QuestionGenerator
+    monkeypatch.setattr(embeddings, "_model", None)
+    monkeypatch.setattr(embeddings, "_load_failed", False)
+    monkeypatch.setattr(embeddings, "EMBED_MODEL", "/nonexistent/encoder")
+    stub.reset()
+    qs = QuestionGenerator().generate_questions(skills_data(2), 2, max_workers=6)
+    assert stub.stats()["requests"] == 2 * 3                  # generation calls only
+    assert all(q["similarity"] == 1.0 for q in qs)
@@ -0,0 +1,248 @@
+"""
+Tests for mcq_irt.rasch_engine.
+
+Run:  python -m pytest test_rasch_engine.py -q
+"""
+
+import math
+import pickle
+import random
+
+import mcq_irt.rasch_engine as irt
+
+
+def _pool(n: int, rnd: random.Random, decimals: int = 4) -> list[dict]:
+    return [{"question_id": f"q{i}", "b_param": round(rnd.uniform(-2, 2), decimals),
+             "correct_option": "a", "question_text": f"Q{i}"} for i in range(n)]
+
+
+def _near_tie(pool, theta, asked, last_correct) -> bool:
+    cands = [q for q in pool if q["question_id"] not in asked]
+    easier = [q for q in cands if q["b_param"] <= theta]
+    if last_correct is False and easier:
+        cands = easier
+    d = sorted(abs(q["b_param"] - theta) for q in cands)
+    return len(d) > 1 and d[1] - d[0] < irt.SortedBIndex.TIE_NOISE
+
+
+# ── SortedBIndex ──────────────────────────────────────────────────────────────
+
+def test_sorted_index_picks_same_items_as_scan():
+    """Property: replaying whole quizzes, the index and the scan agree."""
+    rnd = random.Random(42)
+    for trial in range(100):
+        pool  = _pool(rnd.randint(1, 300), rnd)
+        index = irt.SortedBIndex(pool)
+        theta, last, asked = rnd.uniform(-3, 3), None, set()
+        for _ in range(min(len(pool), 25)):
+            tie  = _near_tie(pool, theta, asked, last)
+            want = irt.select_question(pool, theta, asked, last)
+            got  = index.select(theta, last)
+            if not tie:
+                assert got["question_id"] == want["question_id"], trial
+            asked.add(got["question_id"])
+            index.remove(got["question_id"])
+            last  = rnd.random() < 0.5
+            theta = irt.update_theta(theta, got["b_param"], last)
+        assert len(index) == len(pool) - len(asked)
+
+
+def test_sorted_index_ties_stay_within_tied_set():
+    pool  = [{"question_id": f"t{i}", "b_param": 0.5} for i in range(10)]
+    pool += [{"question_id": "lo", "b_param": -1.0}, {"question_id": "hi", "b_param": 1.7}]
+    picks = {irt.SortedBIndex(pool).select(0.4)["question_id"] for _ in range(300)}
+    assert picks <= {f"t{i}" for i in range(10)}
+    assert len(picks) > 3
+
+
+def test_sorted_index_step_down_and_fallback():
+    pool  = [{"question_id": f"q{i}", "b_param": b} for i, b in enumerate([-1.0, 0.2, 0.9])]
+    index = irt.SortedBIndex(pool)
+    assert index.select(0.8, last_correct=False)["question_id"] == "q1"
+    assert index.select(0.8, last_correct=True)["question_id"] == "q2"
+    assert index.select(-2.0, last_correct=False)["question_id"] == "q0"
+
+
+def test_sorted_index_compacts_and_empties():
+    rnd   = random.Random(5)
+    pool  = _pool(40, rnd)
+    index = irt.SortedBIndex(pool, asked_ids={"q0", "q1"})
+    assert len(index) == 38
+    while True:
+        q = index.select(rnd.uniform(-3, 3))
+        if q is None:
+            break
+        index.remove(q["question_id"])
+    assert len(index) == 0 and len(index.items) < 40
+
+
+def test_skill_session_list_pool_uses_index():
+    rnd  = random.Random(9)
+    pool = _pool(50, rnd)
+    sess = irt.SkillSession("DSA", quiz_length=20)
+    seen = []
+    while not sess.done:
+        q = sess.next_question(pool)
+        seen.append(q["question_id"])
+        sess.record_answer(q, "a" if rnd.random() < 0.6 else "b")
+    assert isinstance(sess._pool_view, irt.SortedBIndex)
+    assert len(set(seen)) == 20
+
+
+def test_list_pool_and_item_pool_share_one_selection_rule():
+    from mcq_irt.item_bank import ItemPool
+    pool = _pool(60, random.Random(13), decimals=6)
+    runs = []
+    for src in (pool, ItemPool(pool)):
+        rnd, sess, seen = random.Random(21), irt.SkillSession("DSA", quiz_length=25), []
+        while not sess.done:
+            q = sess.next_question(src)
+            seen.append(q["question_id"])
+            sess.record_answer(q, "a" if rnd.random() < 0.5 else "b")
+        runs.append(seen)
+    assert runs[0] == runs[1]
+    assert sess._pool_view.pool is src          # a shared ItemPool is not copied
+
+
+# ── Incremental SE(θ) ─────────────────────────────────────────────────────────
+
+def test_skill_session_running_se_matches_se_theta():
+    rnd  = random.Random(11)
+    pool = _pool(80, rnd)
+    sess = irt.SkillSession("DSA", quiz_length=40)
+    while not sess.done:
+        q = sess.next_question(pool)
+        sess.record_answer(q, "a" if rnd.random() < 0.5 else "c")
+        assert sess.theta_se == irt.se_theta(sess.responses)
+
+
+def test_category_tracker_running_se_matches_se_theta():
+    rnd     = random.Random(12)
+    tracker = irt.CategoryTracker("Backend")
+    assert tracker.theta_se == irt.se_theta([]) == 1.0
+    for i in range(60):
+        upd = tracker.record(f"q{i}", rnd.uniform(-2, 2), rnd.random())
+        assert upd["se"] == tracker.theta_se == irt.se_theta(tracker.responses)
+        assert irt.THETA_MIN <= tracker.theta <= irt.THETA_MAX
+    assert len(tracker.asked_ids) == 60
+
+
+# ── ResponseLog ───────────────────────────────────────────────────────────────
+
+def test_response_log_round_trips_records():
+    rnd  = random.Random(13)
+    pool = _pool(30, rnd)
+    for q in pool:
+        q.update(option_a="A", option_b="B", option_c="C", option_d="D",
+                 explanation="because", difficulty_tier="hard")
+    sess, records = irt.SkillSession("SQL", quiz_length=10), []
+    while not sess.done:
+        q = sess.next_question(pool)
+        records.append(sess.record_answer(q, rnd.choice("abcd")))
+
+    assert isinstance(sess.responses, irt.ResponseLog)
+    assert sess.responses.to_dicts() == records == list(sess.responses)
+    assert sess.responses[-1] == records[-1]
+    assert sess.correct_count == sum(r["is_correct"] for r in records)
+
+    clone = pickle.loads(pickle.dumps(sess))
+    assert clone.responses.to_dicts() == records
+
+
+# ── Estimators ────────────────────────────────────────────────────────────────
+
+def test_step_estimator_matches_update_theta():
+    est, theta = irt.make_estimator("step"), irt.THETA_INIT
+    for b, y in [(0.0, 1), (0.5, 1), (1.2, 0), (-0.3, 1)]:
+        theta = irt.update_theta(theta, b, bool(y))
+        assert est.update(b, y) == theta
+
+
+def test_mle_solves_score_equation():
+    est = irt.make_estimator("mle")
+    items = [(-1.0, 1), (-0.5, 1), (0.0, 0), (0.4, 1), (0.9, 0), (1.3, 0)]
+    for b, y in items:
+        est.update(b, y)
+    grad = sum(y - irt.p_correct(est.theta, b) for b, y in items)
+    assert abs(grad) < 1e-4
+    info = sum(irt.fisher_info(est.theta, b) for b, _ in items)
+    assert est.se == irt.se_from_info(info)
+
+
+def test_eap_posterior_mean_and_sd():
+    est = irt.make_estimator("eap")
+    for b, y in [(0.0, 1), (0.5, 1), (1.0, 0)]:
+        est.update(b, y)
+    # brute-force posterior on a much finer grid
+    grid = [irt.THETA_MIN + i * 0.001 for i in range(6001)]
+    post = [math.exp(-0.5 * t * t) * irt.p_correct(t, 0.0) * irt.p_correct(t, 0.5)
+            * (1 - irt.p_correct(t, 1.0)) for t in grid]
+    mean = sum(t * w for t, w in zip(grid, post)) / sum(post)
+    assert abs(est.theta - mean) < 1e-3
+    assert 0 < est.se < 1.0
+
+
+def test_sessions_accept_any_estimator():
+    rnd  = random.Random(21)
+    pool = _pool(200, rnd)
+    for name in irt.ESTIMATORS:
+        sess = irt.SkillSession("DSA", quiz_length=30, estimator=name)
+        while not sess.done:
+            q = sess.next_question(pool)
+            p = irt.p_correct(1.0, q["b_param"])
+            sess.record_answer(q, "a" if rnd.random() < p else "b")
+        assert sess.estimator.name == name
+        assert abs(sess.theta - 1.0) < 1.0 and sess.theta_se < 0.6
+
+        tracker = irt.CategoryTracker("Backend", estimator=name)
+        for i in range(10):
+            tracker.record(f"q{i}", 0.0, 0.8)
+        assert tracker.theta > 0.3
+
+
+def test_unknown_estimator_rejected():
+    try:
+        irt.make_estimator("bayes")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+# ── StoppingRule ──────────────────────────────────────────────────────────────
+
+def test_stopping_rule_reasons():
+    rule = irt.StoppingRule(se_target=0.5, min_items=3, plateau_delta=0.05, plateau_window=2)
+    assert rule.check(2, 0.1, [0.0, 0.0]) is None                 # below min_items
+    assert rule.check(3, 0.45, [0.3, 0.3]) == "se_target"
+    assert rule.check(3, 0.9, [0.01, -0.02]) == "plateau"
+    assert rule.check(3, 0.9, [0.01, 0.2]) is None
+    assert rule.check(10, 0.9, [0.3], max_items=10) == "max_items"
+
+
+def test_skill_session_stops_on_se_target():
+    rnd  = random.Random(31)
+    pool = _pool(200, rnd)
+    rule = irt.StoppingRule(se_target=0.6, min_items=5)
+    sess = irt.SkillSession("DSA", quiz_length=30, estimator="eap", stopping=rule)
+    while not sess.done:
+        q = sess.next_question(pool)
+        sess.record_answer(q, "a" if rnd.random() < 0.5 else "b")
+    assert sess.stop_reason == "se_target"
+    assert 5 <= len(sess.responses) < 30
+    assert sess.summary()["stop_reason"] == "se_target"
+
+
+def test_category_tracker_stops_on_plateau_or_cap():
+    rule    = irt.StoppingRule(min_items=4, plateau_delta=0.05)
+    tracker = irt.CategoryTracker("Backend", stopping=rule, max_items=9)
+    i = 0
+    while not tracker.done:
+        tracker.record(f"q{i}", 0.0, 0.5)      # score ≈ P → θ barely moves
+        i += 1
+    assert tracker.stop_reason == "plateau" and len(tracker.responses) == 4
+
+    capped = irt.CategoryTracker("Frontend", max_items=3)
+    for i in range(3):
+        assert not capped.done
+        capped.record(f"q{i}", 0.0, 1.0)
+    assert capped.stop_reason == "max_items"
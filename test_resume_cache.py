@@ -0,0 +1,112 @@
+"""
+Tests for the resume extraction cache (enhanced_skill_extractor.py +
+open_ended_database.resume_extractions) and project-list reuse in
+QuestionGenerator.
+
+Needs a reachable PostgreSQL (POSTGRES_* env vars) and the groq SDK; runs
+against the local stub LLM (benchmarks/stub_llm.py). The LLM completion
+cache is switched off so only the resume cache can save calls.
+
+Run:  python -m pytest test_resume_cache.py -q
+"""
+
+import uuid
+
+import pytest
+
+pytest.importorskip("groq")
+
+import db_pool
+import embeddings
+import llm_cache
+import open_ended_database as oe_db
+from benchmarks.stub_llm import StubLLM
+
+
+def _db_ready() -> bool:
+    try:
+        return oe_db.init_db()
+    except Exception:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not _db_ready(), reason="PostgreSQL not reachable")
+
+
+@pytest.fixture(autouse=True)
+def no_encoder(monkeypatch):
+    """No sentence encoder → no validator calls, whatever ran before this file."""
+    monkeypatch.setattr(embeddings, "_model", None)
+    monkeypatch.setattr(embeddings, "_load_failed", True)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", False)
+    with StubLLM(latency=0.0) as s:
+        yield s
+
+
+@pytest.fixture
+def resume():
+    text = (f"Jane Doe ({uuid.uuid4().hex})\n• Skills: Python, PostgreSQL, Redis\n"
+            "Projects: Chat App; Price Tracker")
+    yield text
+    from enhanced_skill_extractor import resume_hash
+    conn = db_pool.getconn()
+    with conn, conn.cursor() as cur:
+        cur.execute("DELETE FROM resume_extractions WHERE resume_hash = %s",
+                    (resume_hash(text),))
+    conn.close()
+
+
+def test_reupload_is_served_from_the_cache(stub, resume):
+    from enhanced_skill_extractor import EnhancedSkillExtractor, resume_hash
+    ex = EnhancedSkillExtractor()
+
+    first = ex.extract_all_skills(resume)
+    assert stub.stats()["requests"] == 1
+    assert first["total_skills"] == 4 and len(first["projects"]) == 2
+
+    reupload = "  " + resume.upper().replace("• ", "→  ").replace("\n", " \n\n")
+    assert resume_hash(reupload) == resume_hash(resume) == first["resume_hash"]
+    again = ex.extract_all_skills(reupload)
+    assert stub.stats()["requests"] == 1
+    assert again == first
+
+    ex.extract_all_skills(resume, use_cache=False)
+    assert stub.stats()["requests"] == 2
+
+
+def test_extracted_projects_replace_the_second_extraction_pass(stub, resume):
+    from enhanced_skill_extractor import EnhancedSkillExtractor
+    from question_generator import QuestionGenerator
+
+    skills_data = EnhancedSkillExtractor().extract_all_skills(resume)
+    stub.reset()
+    qs = QuestionGenerator().generate_questions(
+        skills_data, 1, resume_text="", projects=skills_data["projects"])
+    assert stub.stats()["requests"] == 4 * 3 + 2            # cells + project questions only
+    assert [q["question_id"] for q in qs[-2:]] == ["q_13_proj", "q_14_proj"]
+    assert "Chat App" in qs[-2]["question"]
+
+
+def test_failed_extraction_still_gets_project_questions(stub, resume, monkeypatch):
+    from enhanced_skill_extractor import EnhancedSkillExtractor
+    from question_generator import QuestionGenerator
+
+    def api_down(resume_text):
+        raise RuntimeError("API down")
+
+    ex = EnhancedSkillExtractor()
+    monkeypatch.setattr(ex, "_call_llama", api_down)
+    skills_data = ex.extract_all_skills(resume)
+    assert skills_data["projects"] is None and skills_data["total_skills"] > 0
+
+    # same hand-off as main_app / enhanced_app: no project list → send the resume
+    projects = skills_data.get("projects")
+    stub.reset()
+    qs = QuestionGenerator().generate_questions(
+        skills_data, 1, resume_text=resume if projects is None else "", projects=projects)
+    assert [q["type"] for q in qs[-2:]] == ["project", "project"]
+    assert "Chat App" in qs[-2]["question"]
@@ -0,0 +1,41 @@
+"""
+Tests for mcq_irt.simulator.
+
+Run:  python -m pytest test_simulator.py -q
+"""
+
+import mcq_irt.rasch_engine as irt
+from mcq_irt import simulator as sim
+
+
+def test_parallel_run_matches_in_process_run():
+    bank   = sim.synthetic_bank(200)
+    thetas = sim.make_population(300, "normal", seed=1)
+    serial = sim.run_simulation(bank, thetas, quiz_length=10, workers=1, chunk_size=100)
+    pooled = sim.run_simulation(bank, thetas, quiz_length=10, workers=2, chunk_size=100)
+    for key in ("sessions", "bias", "rmse", "length_mean", "exposure_max", "b_rmse"):
+        assert serial[key] == pooled[key], key
+    assert serial["sessions"] == 300
+    assert abs(serial["bias"]) < 0.15
+
+
+def test_knob_overrides_are_scoped_to_the_run():
+    bank   = sim.miscalibrate(sim.load_bank(), b_noise=0.5, seed=2)
+    thetas = sim.make_population(200, "uniform", seed=2)
+    before = (irt.ALPHA, irt.ALPHA_B, irt.CALIB_MIN_RESPONSES)
+    slow   = sim.run_simulation(bank, thetas, alpha=0.05, workers=1, update_bank=False)
+    fast   = sim.run_simulation(bank, thetas, alpha=0.6, workers=1, update_bank=False)
+    assert (irt.ALPHA, irt.ALPHA_B, irt.CALIB_MIN_RESPONSES) == before
+    assert slow["rmse"] != fast["rmse"]
+    assert slow["b_rmse"] is None
+
+
+def test_stopping_and_random_selection():
+    bank   = sim.synthetic_bank(500)
+    thetas = sim.make_population(100, "fixed", mean=1.0)
+    rule   = irt.StoppingRule(se_target=0.6, min_items=5)
+    rep    = sim.run_simulation(bank, thetas, quiz_length=30, estimator="eap",
+                                stopping=rule, selection="random", workers=1)
+    assert rep["length_mean"] < 30
+    assert set(rep["stop_reasons"]) <= {"se_target", "max_items"}
+    assert rep["unused_items"] > 0
@@ -0,0 +1,179 @@
+"""
+Tests for write_behind.WriteBehindQueue.
+Flushers are plain Python functions, so no PostgreSQL server is needed.
+
+Run:  python -m pytest test_write_behind.py -q
+"""
+
+import json
+import threading
+import time
+
+from write_behind import WriteBehindQueue
+
+
+class Sink:
+    """Flusher that records batches and can be switched to 'DB down'."""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.down    = False
+        self.delay   = delay
+        self.lock    = threading.Lock()
+
+    def __call__(self, rows):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.down:
+            return "DB connection failed"
+        with self.lock:
+            self.batches.append(list(rows))
+        return ""
+
+    @property
+    def rows(self):
+        return [r for b in self.batches for r in b]
+
+
+def test_size_trigger_coalesces_into_batches():
+    sink = Sink()
+    q = WriteBehindQueue({"ev": sink}, max_batch=10, flush_interval=5.0, spill_path=None)
+    for i in range(30):
+        q.submit("ev", {"i": i})
+    assert q.flush(timeout=2.0)
+    q.close()
+    assert [r["i"] for r in sink.rows] == list(range(30))
+    assert len(sink.batches) <= 4
+
+
+def test_time_trigger_flushes_small_batch():
+    sink = Sink()
+    q = WriteBehindQueue({"ev": sink}, max_batch=100, flush_interval=0.05, spill_path=None)
+    q.submit("ev", {"i": 1})
+    time.sleep(0.3)
+    assert sink.rows == [{"i": 1}]
+    q.close()
+
+
+def test_kinds_routed_to_their_flushers():
+    a, b = Sink(), Sink()
+    q = WriteBehindQueue({"a": a, "b": b}, flush_interval=0.01, spill_path=None)
+    q.submit("a", {"x": 1})
+    q.submit("b", {"y": 2})
+    q.submit("a", {"x": 3})
+    q.flush()
+    q.close()
+    assert a.rows == [{"x": 1}, {"x": 3}]
+    assert b.rows == [{"y": 2}]
+
+
+def test_close_drains_pending():
+    sink = Sink()
+    q = WriteBehindQueue({"ev": sink}, max_batch=1000, flush_interval=60.0, spill_path=None)
+    for i in range(5):
+        q.submit("ev", {"i": i})
+    q.close()
+    assert len(sink.rows) == 5
+
+
+def test_drop_oldest_bounds_memory():
+    sink = Sink(delay=0.2)
+    q = WriteBehindQueue({"ev": sink}, max_batch=1, flush_interval=0.0,
+                         max_pending=3, policy="drop_oldest", spill_path=None)
+    for i in range(20):
+        q.submit("ev", {"i": i})
+        assert q.stats()["pending"] <= 3
+    q.close()
+    s = q.stats()
+    assert s["dropped"] > 0
+    assert s["written"] + s["dropped"] == 20
+
+
+def test_block_policy_spills_after_timeout(tmp_path):
+    spill = tmp_path / "wb.jsonl"
+    sink  = Sink(delay=0.3)
+    q = WriteBehindQueue({"ev": sink}, max_batch=1, flush_interval=0.0, max_pending=1,
+                         policy="block", put_timeout=0.01, spill_path=str(spill),
+                         replay_interval=3600)
+    for i in range(4):
+        assert q.submit("ev", {"i": i})
+    q.close()
+    s = q.stats()
+    assert s["blocked"] > 0 and s["spilled"] > 0
+    assert s["written"] + s["spilled"] == 4
+
+
+def test_failed_batch_spilled_then_replayed(tmp_path):
+    spill = tmp_path / "wb.jsonl"
+    sink  = Sink()
+    sink.down = True
+    q = WriteBehindQueue({"ev": sink}, flush_interval=0.01, spill_path=str(spill),
+                         replay_interval=0.0)
+    q.submit("ev", {"i": 1})
+    q.submit("ev", {"i": 2})
+    q.flush()
+    assert sink.rows == []
+    assert [json.loads(l)["row"]["i"] for l in spill.read_text().splitlines()] == [1, 2]
+
+    sink.down = False
+    q.submit("ev", {"i": 3})
+    q.flush()
+    q.close()
+    assert sorted(r["i"] for r in sink.rows) == [1, 2, 3]
+    assert not spill.exists()
+    assert q.stats()["replayed"] == 2
+
+
+def test_poison_rows_moved_to_dead_letter(tmp_path):
+    spill = tmp_path / "wb.jsonl"
+    spill.write_text(json.dumps({"kind": "ev", "row": {"i": 0}, "replays": 4}) + "\n")
+    q = WriteBehindQueue({"ev": lambda rows: "bad row"}, flush_interval=0.01,
+                         spill_path=str(spill), replay_interval=0.0)
+    q._replay_spill()
+    q.close()
+    assert not spill.exists()
+    assert json.loads((tmp_path / "wb.jsonl.dead").read_text())["row"] == {"i": 0}
+    assert q.stats()["dead"] == 1
+
+
+def test_one_bad_row_does_not_fail_its_batch(tmp_path):
+    spill = tmp_path / "wb.jsonl"
+    sink  = Sink()
+
+    def flusher(rows):
+        return "bad row" if any(r["i"] == 7 for r in rows) else sink(rows)
+
+    q = WriteBehindQueue({"ev": flusher}, max_batch=20, flush_interval=60.0,
+                         spill_path=str(spill), replay_interval=3600)
+    for i in range(20):
+        q.submit("ev", {"i": i})
+    q.close()
+    assert sorted(r["i"] for r in sink.rows) == [i for i in range(20) if i != 7]
+    assert [json.loads(l)["row"]["i"] for l in spill.read_text().splitlines()] == [7]
+
+    # replay: the good rows of a spilled chunk are written, only the bad one retried
+    spill.write_text("".join(json.dumps({"kind": "ev", "row": {"i": i}, "replays": 0}) + "\n"
+                             for i in (5, 7, 9)))
+    sink.batches.clear()
+    q = WriteBehindQueue({"ev": flusher}, spill_path=str(spill), replay_interval=3600)
+    q._replay_spill()
+    q.close()
+    assert sorted(r["i"] for r in sink.rows) == [5, 9]
+    assert [json.loads(l) for l in spill.read_text().splitlines()] == \
+        [{"kind": "ev", "row": {"i": 7}, "replays": 1}]
+    assert q.stats()["replayed"] == 2
+
+
+def test_interrupted_replay_is_recovered_on_start(tmp_path):
+    spill = tmp_path / "wb.jsonl"
+    (tmp_path / "wb.jsonl.replaying").write_text(
+        json.dumps({"kind": "ev", "row": {"i": 1}, "replays": 0}) + "\n")
+    spill.write_text(json.dumps({"kind": "ev", "row": {"i": 2}, "replays": 0}) + "\n")
+    sink = Sink()
+    q = WriteBehindQueue({"ev": sink}, flush_interval=0.01, spill_path=str(spill))
+    assert not (tmp_path / "wb.jsonl.replaying").exists()
+    q.submit("ev", {"i": 3})
+    q.flush()
+    q.close()
+    assert sorted(r["i"] for r in sink.rows) == [1, 2, 3]
+    assert not spill.exists()
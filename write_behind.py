@@ -0,0 +1,337 @@
+"""
+write_behind.py
+In-process write-behind queue for answer events: submit() returns at once
+and a background thread writes coalesced batches through one flusher per
+event kind.
+
+    writer = WriteBehindQueue({"oe_response": oe_db.save_oe_responses_batch})
+    writer.submit("oe_response", {...row...})
+    writer.flush()        # e.g. before reading results back
+    writer.close()        # also registered with atexit
+
+FLUSH: at MAX_BATCH pending events, FLUSH_INTERVAL seconds after the
+oldest one, and on close() / interpreter exit.
+
+BACKPRESSURE (MAX_PENDING events already queued):
+  "block"        wait up to PUT_TIMEOUT for space, then spill
+  "drop_oldest"  evict the oldest pending event
+  "spill"        the new event goes straight to the spill file
+
+DURABILITY: a flusher returns "" or an error string. A failed batch is
+bisected so only rows that fail on their own go to the JSONL spill file
+(WRITE_BEHIND_SPILL_DIR, default <module dir>/temp); the file is replayed
+after the next good flush and rows failing MAX_REPLAYS times move to
+<spill>.dead.
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+from collections import deque
+
+WRITE_BEHIND_ENABLED = os.environ.get("WRITE_BEHIND", "1") != "0"
+SPILL_DIR            = os.environ.get(
+    "WRITE_BEHIND_SPILL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "temp"))
+
+POLICIES    = ("block", "drop_oldest", "spill")
+MAX_REPLAYS = 5
+
+
+class WriteBehindQueue:
+    """
+    Bounded queue + one background flusher thread.
+
+    flushers: {event_kind: fn(rows: list[dict]) -> str}
+      Each fn writes a whole batch (ideally one statement / transaction)
+      and returns "" on success or an error message.
+    """
+
+    def __init__(self, flushers: dict, name: str = "write_behind",
+                 max_batch: int = 200, flush_interval: float = 0.5,
+                 max_pending: int = 10_000, policy: str = "block",
+                 put_timeout: float = 2.0, spill_path: str | None = "",
+                 replay_interval: float = 30.0):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, got {policy!r}")
+        self.flushers        = dict(flushers)
+        self.name            = name
+        self.max_batch       = max_batch
+        self.flush_interval  = flush_interval
+        self.max_pending     = max_pending
+        self.policy          = policy
+        self.put_timeout     = put_timeout
+        self.replay_interval = replay_interval
+        # "" → default file in SPILL_DIR, None → no spilling (drop on failure)
+        self.spill_path      = (os.path.join(SPILL_DIR, f"{name}.jsonl")
+                                if spill_path == "" else spill_path)
+
+        self._pending     = deque()       # (kind, row, submitted_at)
+        self._cond        = threading.Condition()
+        self._spill_lock  = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._in_flight   = 0
+        self._closed      = False
+        self._recover_replaying()
+        # a spill left by an earlier process is replayed after the first good
+        # flush; anything spilled from now on waits replay_interval
+        self._last_replay = (float("-inf") if self.spill_path and os.path.exists(self.spill_path)
+                             else time.monotonic())
+        self._stats = {
+            "submitted": 0, "written": 0, "batches": 0, "flush_errors": 0,
+            "spilled": 0, "replayed": 0, "dead": 0, "dropped": 0,
+            "blocked": 0, "flush_ms_sum": 0.0, "flush_ms_max": 0.0,
+        }
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ── Producer side ────────────────────────────────────────────────────
+
+    def submit(self, kind: str, row: dict) -> bool:
+        """
+        Queue one event. Returns False only if the event was dropped.
+        Never raises for a full queue — the backpressure policy decides.
+        """
+        if kind not in self.flushers:
+            raise KeyError(f"no flusher registered for event kind {kind!r}")
+
+        with self._cond:
+            if self._closed:
+                return self._spill_or_drop_locked([(kind, row)])
+            self._stats["submitted"] += 1
+
+            if len(self._pending) >= self.max_pending:
+                if self.policy == "drop_oldest":
+                    self._pending.popleft()
+                    self._stats["dropped"] += 1
+                elif self.policy == "spill":
+                    return self._spill_or_drop_locked([(kind, row)])
+                else:   # block
+                    self._stats["blocked"] += 1
+                    deadline = time.monotonic() + self.put_timeout
+                    while len(self._pending) >= self.max_pending and not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return self._spill_or_drop_locked([(kind, row)])
+                        self._cond.notify_all()
+                        self._cond.wait(remaining)
+
+            self._pending.append((kind, row, time.monotonic()))
+            # first event starts the flush_interval clock; a full batch flushes now
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Block until everything submitted so far has been flushed (or spilled)."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify_all()
+            while self._pending or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.05))
+                self._cond.notify_all()
+        return True
+
+    def close(self, timeout: float = 10.0):
+        """Drain the queue and stop the worker. Anything left is spilled."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        with self._cond:
+            leftover = [(k, r) for k, r, _ in self._pending]
+            self._pending.clear()
+            if leftover:
+                self._spill_or_drop_locked(leftover)
+
+    def stats(self) -> dict:
+        with self._cond:
+            s = dict(self._stats)
+            s["pending"] = len(self._pending)
+        flush_sum = s.pop("flush_ms_sum")
+        s["flush_ms_avg"] = round(flush_sum / s["batches"], 3) if s["batches"] else 0.0
+        s["flush_ms_max"] = round(s["flush_ms_max"], 3)
+        return s
+
+    # ── Worker side ──────────────────────────────────────────────────────
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if len(self._pending) >= self.max_batch:
+                        break
+                    if self._pending:
+                        age = time.monotonic() - self._pending[0][2]
+                        if age >= self.flush_interval:
+                            break
+                        self._cond.wait(self.flush_interval - age)
+                    else:
+                        self._cond.wait(self.replay_interval)
+                        if not self._pending and self._spill_due():
+                            break
+                if self._closed and not self._pending:
+                    return
+                batch = [self._pending.popleft()
+                         for _ in range(min(self.max_batch, len(self._pending)))]
+                self._in_flight = len(batch)
+                self._cond.notify_all()     # wake producers blocked on a full queue
+
+            ok = self._write(batch)
+            if ok and self._spill_due():
+                self._replay_spill()
+
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _write(self, batch: list) -> bool:
+        """Flush one batch, grouped by kind in arrival order. Returns True if all wrote."""
+        groups: dict[str, list] = {}
+        for kind, row, _ in batch:
+            groups.setdefault(kind, []).append(row)
+
+        all_ok = True
+        for kind, rows in groups.items():
+            failed, err = self._write_isolating(kind, rows)
+            with self._cond:
+                self._stats["written"] += len(rows) - len(failed)
+            if failed:
+                all_ok = False
+                print(f"[WriteBehind] {kind}: {len(failed)} of {len(rows)} rows failed: {err}")
+                with self._cond:
+                    self._spill_or_drop_locked([(kind, r) for r in failed])
+        return all_ok
+
+    def _write_isolating(self, kind: str, items: list, row=lambda x: x) -> tuple[list, str]:
+        """
+        Write items through the kind's flusher. A failed batch is split in
+        halves and each half retried, so only items that fail on their own
+        are returned, with the last error. row(item) gives the row to write.
+        """
+        err = self._call_flusher(kind, [row(x) for x in items])
+        if not err:
+            return [], ""
+        if len(items) == 1:
+            return list(items), err
+        mid = len(items) // 2
+        bad_lo, err_lo = self._write_isolating(kind, items[:mid], row)
+        bad_hi, err_hi = self._write_isolating(kind, items[mid:], row)
+        return bad_lo + bad_hi, err_hi or err_lo
+
+    def _call_flusher(self, kind: str, rows: list) -> str:
+        t0 = time.perf_counter()
+        try:
+            err = self.flushers[kind](rows) or ""
+        except Exception as e:
+            err = str(e) or e.__class__.__name__
+        ms = (time.perf_counter() - t0) * 1000.0
+        with self._cond:
+            self._stats["batches"]      += 1
+            self._stats["flush_ms_sum"] += ms
+            self._stats["flush_ms_max"]  = max(self._stats["flush_ms_max"], ms)
+            if err:
+                self._stats["flush_errors"] += 1
+        return err
+
+    # ── Spill file ───────────────────────────────────────────────────────
+
+    def _spill_or_drop_locked(self, events: list) -> bool:
+        if not self.spill_path:
+            self._stats["dropped"] += len(events)
+            return False
+        try:
+            self._append_spill(self.spill_path, events)
+            self._stats["spilled"] += len(events)
+            return True
+        except Exception as e:
+            print(f"[WriteBehind] spill failed, dropping {len(events)} events: {e}")
+            self._stats["dropped"] += len(events)
+            return False
+
+    def _append_spill(self, path: str, events: list):
+        with self._spill_lock:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                for ev in events:
+                    kind, row = ev[0], ev[1]
+                    replays   = ev[2] if len(ev) > 2 else 0
+                    f.write(json.dumps({"kind": kind, "row": row, "replays": replays},
+                                       default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _spill_due(self) -> bool:
+        return (bool(self.spill_path) and os.path.exists(self.spill_path)
+                and time.monotonic() - self._last_replay >= self.replay_interval)
+
+    def _recover_replaying(self):
+        """Merge a <spill>.replaying left by a replay that died back into the spill file."""
+        if not self.spill_path:
+            return
+        replay_path = self.spill_path + ".replaying"
+        with self._spill_lock:
+            if not os.path.exists(replay_path):
+                return
+            with open(replay_path, encoding="utf-8") as src, \
+                    open(self.spill_path, "a", encoding="utf-8") as dst:
+                for line in src:
+                    if line.strip():
+                        dst.write(line if line.endswith("\n") else line + "\n")
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.remove(replay_path)
+
+    def _replay_spill(self):
+        """Re-submit spilled events to their flushers, one batch per kind."""
+        if not self._replay_lock.acquire(blocking=False):
+            return                                  # a replay is already running
+        try:
+            self._replay_spill_locked()
+        finally:
+            self._replay_lock.release()
+
+    def _replay_spill_locked(self):
+        self._last_replay = time.monotonic()
+        self._recover_replaying()
+        replay_path = self.spill_path + ".replaying"
+        with self._spill_lock:
+            if not os.path.exists(self.spill_path):
+                return
+            os.replace(self.spill_path, replay_path)
+
+        groups: dict[str, list] = {}
+        with open(replay_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    ev = json.loads(line)
+                    groups.setdefault(ev["kind"], []).append(ev)
+
+        retry, dead = [], []
+        for kind, evs in groups.items():
+            for i in range(0, len(evs), self.max_batch):
+                chunk     = evs[i:i + self.max_batch]
+                failed, _ = self._write_isolating(kind, chunk, row=lambda ev: ev["row"])
+                with self._cond:
+                    self._stats["replayed"] += len(chunk) - len(failed)
+                    self._stats["written"]  += len(chunk) - len(failed)
+                for ev in failed:
+                    n = ev.get("replays", 0) + 1
+                    (dead if n >= MAX_REPLAYS else retry).append((kind, ev["row"], n))
+
+        if retry:
+            self._append_spill(self.spill_path, retry)
+        if dead:
+            self._append_spill(self.spill_path + ".dead", dead)
+            with self._cond:
+                self._stats["dead"] += len(dead)
+        os.remove(replay_path)